@@ -0,0 +1,264 @@
+"""Split long documents into LLM-sized chunks and merge per-chunk results.
+
+Documents longer than one LLM request are split on natural boundaries
+(slide markers, transcript speaker turns, doc headings, then paragraphs),
+each chunk is analyzed separately, and the per-chunk JSON results are
+merged back into the shape a single call would have returned. Line
+numbers reported inside a chunk are shifted back to document lines;
+slide numbers need no remapping because chunks keep their slide markers.
+
+A merge in which some chunks failed keeps the other chunks' findings but
+is marked incomplete: "partial" is set, "failed_chunks" lists the indexes
+of the failed chunks and "error" describes the failures, so the result is
+never mistaken for a full analysis.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+# Slide separators written by GoogleSlidesExtractor, e.g. "--- Slide 5 ---"
+SLIDE_BOUNDARY = re.compile(r'^--- Slide \d+ ---$', re.MULTILINE)
+
+# Transcript turns as rendered by FathomTranscript.full_text: "[00:01:02] Name: ..."
+SPEAKER_TURN = re.compile(r'^\[[^\]\n]*\] [^:\n]+:', re.MULTILINE)
+
+_LINE_REF = re.compile(r'\b(line)\s+(\d+)', re.IGNORECASE)
+
+
+@dataclass
+class Chunk:
+    """A slice of the original document sent to the LLM on its own."""
+    text: str
+    start: int        # Offset of the chunk in the original text
+    first_line: int   # Line number (1-indexed) of the chunk's first line
+
+
+def split_text(text: str, max_chars: int, headings: Iterable[str] = ()) -> list[Chunk]:
+    """Split text into chunks of at most max_chars on natural boundaries.
+
+    Text that already fits is returned as a single chunk, unchanged.
+    """
+    if len(text) <= max_chars:
+        return [Chunk(text=text, start=0, first_line=1)]
+
+    boundaries = _unit_boundaries(text, headings)
+    chunks = []
+    start = fits = 0
+    for end in boundaries[1:] + [len(text)]:
+        if end - start <= max_chars:
+            fits = end
+            continue
+        # Close the current chunk at the last unit boundary that fit
+        if fits > start:
+            chunks.append(_chunk(text, start, fits))
+            start = fits
+        # A single unit larger than a chunk is cut at a line break, or hard
+        # cut if it has none
+        while end - start > max_chars:
+            cut = text.rfind("\n", start + 1, start + max_chars) + 1 or start + max_chars
+            chunks.append(_chunk(text, start, cut))
+            start = cut
+        fits = end
+    if start < len(text):
+        chunks.append(_chunk(text, start, len(text)))
+    return chunks
+
+
+def _unit_boundaries(text: str, headings: Iterable[str]) -> list[int]:
+    """Start offsets of the units a chunk may be cut between."""
+    for pattern in (SLIDE_BOUNDARY, SPEAKER_TURN):
+        starts = [m.start() for m in pattern.finditer(text)]
+        if starts:
+            return sorted({0, *starts})
+
+    heading_lines = {h.strip() for h in headings if h.strip()}
+    if heading_lines:
+        starts = [m.start() for m in re.finditer(r'^.*$', text, re.MULTILINE) if m.group().strip() in heading_lines]
+        if starts:
+            return sorted({0, *starts})
+
+    # Paragraphs
+    return [0] + [m.end() for m in re.finditer(r'\n', text) if m.end() < len(text)]
+
+
+def _chunk(text: str, start: int, end: int) -> Chunk:
+    return Chunk(text=text[start:end], start=start, first_line=text.count("\n", 0, start) + 1)
+
+
+def remap_location(location: Optional[str], chunk: Chunk) -> Optional[str]:
+    """Shift "line N" references in an LLM location back to document lines."""
+    if not location or chunk.first_line == 1:
+        return location
+    return _LINE_REF.sub(lambda m: f"{m.group(1)} {int(m.group(2)) + chunk.first_line - 1}", location)
+
+
+# === MERGING ===
+
+
+def _usable(results: list[dict], chunks: list[Chunk]) -> tuple[list[tuple[dict, Chunk]], Optional[dict]]:
+    """Pair successful results with their chunks; return an error if none succeeded."""
+    pairs = [(r, c) for r, c in zip(results, chunks) if "error" not in r]
+    if not pairs and results:
+        return [], dict(results[0], failed_chunks=list(range(len(results))))
+    return pairs, None
+
+
+def _finish(merged: dict, results: list[dict]) -> dict:
+    """Mark a merged result as cached, or as partial if some chunks failed."""
+    failed = [i for i, r in enumerate(results) if "error" in r]
+    if failed:
+        merged["partial"] = True
+        merged["failed_chunks"] = failed
+        merged["error"] = f"{len(failed)} of {len(results)} chunks failed: {results[failed[0]]['error']}"
+    elif _all_cached(results):
+        merged["cache_hit"] = True
+    return merged
+
+
+def _all_cached(results: list[dict]) -> bool:
+    return bool(results) and all(r.get("cache_hit") for r in results)
+
+
+def _dedupe(values: Iterable[str]) -> list[str]:
+    seen = set()
+    out = []
+    for value in values:
+        key = str(value).strip().lower()
+        if key and key not in seen:
+            seen.add(key)
+            out.append(value)
+    return out
+
+
+def merge_spelling_grammar(results: list[dict], chunks: list[Chunk]) -> dict:
+    """Merge per-chunk spelling/grammar results."""
+    if len(results) == 1:
+        return results[0]
+    pairs, error = _usable(results, chunks)
+    if error:
+        return error
+
+    issues = []
+    seen = set()
+    summary: dict[str, int] = {}
+    for result, chunk in pairs:
+        for item in result.get("issues", []):
+            item = dict(item, location=remap_location(item.get("location"), chunk))
+            key = (item.get("category"), item.get("text"), item.get("suggestion"), item.get("location"))
+            if key not in seen:
+                seen.add(key)
+                issues.append(item)
+        for name, count in result.get("summary", {}).items():
+            if isinstance(count, int):
+                summary[name] = summary.get(name, 0) + count
+
+    return _finish({"issues": issues, "summary": summary}, results)
+
+
+def merge_content(results: list[dict], chunks: list[Chunk]) -> dict:
+    """Merge per-chunk content results.
+
+    A section only counts as missing if no chunk found it.
+    """
+    if len(results) == 1:
+        return results[0]
+    pairs, error = _usable(results, chunks)
+    if error:
+        return error
+
+    issues = []
+    seen = set()
+    found: list[str] = []
+    missing: list[str] = []
+    observations: list[str] = []
+    for result, chunk in pairs:
+        for item in result.get("issues", []):
+            item = dict(item, location=remap_location(item.get("location"), chunk))
+            key = (item.get("category"), str(item.get("title", "")).strip().lower())
+            if key not in seen:
+                seen.add(key)
+                issues.append(item)
+        found.extend(result.get("required_sections_found", []))
+        missing.extend(result.get("required_sections_missing", []))
+        observations.extend(result.get("style_observations", []))
+
+    found = _dedupe(found)
+    found_keys = {f.strip().lower() for f in found}
+    merged = {
+        "issues": issues,
+        "required_sections_found": found,
+        "required_sections_missing": [m for m in _dedupe(missing) if m.strip().lower() not in found_keys],
+        "style_observations": _dedupe(observations),
+    }
+    return _finish(merged, results)
+
+
+# BANNT element -> the flag the prompt uses for "covered"
+_BANNT_FLAGS = {
+    "budget": "discussed",
+    "authority": "identified",
+    "need": "articulated",
+    "next_steps": "scheduled",
+    "timeline": "discussed",
+}
+
+
+def merge_bannt(results: list[dict], chunks: list[Chunk]) -> dict:
+    """Merge per-chunk BANNT results; an element is covered if any chunk covers it."""
+    if len(results) == 1:
+        return results[0]
+    pairs, error = _usable(results, chunks)
+    if error:
+        return error
+
+    merged: dict = {}
+    for element, flag in _BANNT_FLAGS.items():
+        parts = [r.get(element, {}) for r, _ in pairs]
+        combined: dict = {
+            flag: any(p.get(flag, False) for p in parts),
+            "notes": " ".join(_dedupe(p.get("notes", "") for p in parts)),
+        }
+        for part in parts:
+            for key, value in part.items():
+                if isinstance(value, list):
+                    combined[key] = _dedupe(combined.get(key, []) + value)
+                elif key not in combined and value:
+                    combined[key] = value
+        merged[element] = combined
+
+    merged["overall_score"] = sum(1 for element, flag in _BANNT_FLAGS.items() if merged[element][flag])
+    merged["recommendations"] = _dedupe(rec for r, _ in pairs for rec in r.get("recommendations", []))
+    return _finish(merged, results)
+
+
+def merge_client_call(results: list[dict], chunks: list[Chunk]) -> dict:
+    """Merge per-chunk client call results."""
+    if len(results) == 1:
+        return results[0]
+    pairs, error = _usable(results, chunks)
+    if error:
+        return error
+
+    def unique(key: str) -> list[dict]:
+        seen = set()
+        items = []
+        for result, _ in pairs:
+            for item in result.get(key, []):
+                marker = (item.get("type"), str(item.get("description", "")).strip().lower())
+                if marker not in seen:
+                    seen.add(marker)
+                    items.append(item)
+        return items
+
+    sentiments = {r.get("overall_sentiment") for r, _ in pairs if r.get("overall_sentiment")}
+    merged = {
+        "opportunities": unique("opportunities"),
+        "concerns": unique("concerns"),
+        "overall_sentiment": sentiments.pop() if len(sentiments) == 1 else "mixed",
+        "action_items_mentioned": _dedupe(a for r, _ in pairs for a in r.get("action_items_mentioned", [])),
+        "follow_up_needed": any(r.get("follow_up_needed", False) for r, _ in pairs),
+        "summary": " ".join(r.get("summary", "") for r, _ in pairs if r.get("summary")),
+    }
+    return _finish(merged, results)
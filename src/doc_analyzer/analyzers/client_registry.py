@@ -0,0 +1,130 @@
+"""Process-wide registry of long-lived LLM provider clients.
+
+Building a provider creates a new SDK client with its own HTTP connection
+pool, so constructing one per request throws away every TLS connection.
+The registry builds each provider once, backed by keep-alive httpx pools,
+and hands the same instance to every request.
+"""
+
+import threading
+from typing import Optional
+
+import httpx
+
+from ..config import get_settings
+from .llm_analyzer import BaseLLMProvider, LLMProvider, create_provider
+
+
+class ConnectionStats:
+    """Counts requests and newly opened connections for one httpx pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+
+    def record(self, event_name: str) -> None:
+        """Record an httpcore trace event."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.new_connections += 1
+
+    def on_request(self, request: httpx.Request) -> None:
+        """Sync event hook: count the request and attach the tracer."""
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def on_async_request(self, request: httpx.Request) -> None:
+        """Async event hook: count the request and attach the tracer."""
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._atrace
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        self.record(event_name)
+
+    async def _atrace(self, event_name: str, info: dict) -> None:
+        self.record(event_name)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": max(0, self.requests - self.new_connections),
+        }
+
+
+class ClientRegistry:
+    """Long-lived provider clients keyed by provider.
+
+    Each provider key ("openai", "llama-70b", ...) names exactly one model,
+    so the key identifies both the provider and the model.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+    ):
+        settings = get_settings()
+        self.limits = httpx.Limits(
+            max_connections=max_connections or settings.llm_pool_max_connections,
+            max_keepalive_connections=max_keepalive_connections or settings.llm_pool_max_keepalive,
+            keepalive_expiry=keepalive_expiry or settings.llm_pool_keepalive_expiry,
+        )
+        self._lock = threading.Lock()
+        self._providers: dict[str, BaseLLMProvider] = {}
+        self._http_clients: list[httpx.Client] = []
+        self._async_http_clients: list[httpx.AsyncClient] = []
+        self._stats: dict[str, ConnectionStats] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, provider: LLMProvider) -> BaseLLMProvider:
+        """Borrow the shared provider, building it on first use."""
+        with self._lock:
+            if provider in self._providers:
+                self.hits += 1
+                return self._providers[provider]
+            self.misses += 1
+            if provider == "google":
+                # The Gemini SDK manages its own transport
+                instance = create_provider(provider)
+                self._providers[provider] = instance
+                return instance
+
+            stats = ConnectionStats()
+            http_client = httpx.Client(
+                limits=self.limits,
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                event_hooks={"request": [stats.on_request]},
+            )
+            async_http_client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                event_hooks={"request": [stats.on_async_request]},
+            )
+            instance = create_provider(provider, http_client, async_http_client)
+            self._http_clients.append(http_client)
+            self._async_http_clients.append(async_http_client)
+            self._stats[instance.name] = stats
+            self._providers[provider] = instance
+            return instance
+
+    def metrics(self) -> dict:
+        """Pool hit/miss counts and per-provider connection usage."""
+        return {
+            "pool_hits": self.hits,
+            "pool_misses": self.misses,
+            "providers": {name: stats.as_dict() for name, stats in self._stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        """Close every pooled connection."""
+        for client in self._http_clients:
+            client.close()
+        for client in self._async_http_clients:
+            await client.aclose()
+        self._providers.clear()
@@ -0,0 +1,230 @@
+"""Incremental spelling/grammar analysis for edited documents.
+
+A document is split into units (slides, heading sections, or runs of lines)
+and the spelling/grammar issues found in each unit are stored in the LLM
+cache under a hash of that unit's content. On the next run only units whose
+content changed are sent to the LLM; issues for unchanged units are reused,
+so editing one slide of a 60-slide deck costs one slide's worth of tokens.
+
+Content/completeness analysis judges the document as a whole and is not
+incremental; it still benefits from the response cache when nothing changed.
+"""
+
+import json
+import re
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from .chunking import SLIDE_BOUNDARY
+from .llm_cache import LLMCache
+
+# Keeps per-unit issue entries apart from raw response entries in the cache
+_UNIT_NAMESPACE = "\n#incremental-unit-issues"
+
+_SLIDE_REF = re.compile(r'\bslide\s+(\d+)', re.IGNORECASE)
+_LINE_REF = re.compile(r'\bline\s+(\d+)', re.IGNORECASE)
+
+# Outside slides, lines are grouped into units of about _MIN_UNIT_CHARS to
+# _MAX_UNIT_CHARS (a heading always starts a new one). A unit ends after a
+# blank line or a line whose hash marks a boundary, so boundaries follow the
+# text itself: an inserted paragraph changes the unit it lands in, not every
+# unit after it.
+_MIN_UNIT_CHARS = 500
+_MAX_UNIT_CHARS = 3000
+_BOUNDARY_MODULUS = 4
+
+
+@dataclass
+class Unit:
+    """An independently cached piece of a document."""
+    text: str                      # Text sent to the LLM (keeps the slide marker)
+    body: str                      # Content the cache key is computed from
+    label: str                     # Location reported for the unit's issues
+    slide: Optional[int] = None
+    separator: str = ""            # Text between the previous unit and this one in the document
+
+
+def split_units(text: str, headings: Iterable[str] = ()) -> list[Unit]:
+    """Split text into slides, or into heading sections and runs of lines."""
+    slides = list(SLIDE_BOUNDARY.finditer(text))
+    if slides:
+        units = []
+        previous_end = None
+        for i, marker in enumerate(slides):
+            end = slides[i + 1].start() if i + 1 < len(slides) else len(text)
+            number = int(re.search(r'\d+', marker.group()).group())
+            unit_text = text[marker.start():end].rstrip("\n")
+            units.append(Unit(
+                text=unit_text,
+                body=text[marker.end():end].strip(),
+                label=f"Slide {number}",
+                slide=number,
+                separator=text[previous_end:marker.start()] if previous_end is not None else "",
+            ))
+            previous_end = marker.start() + len(unit_text)
+        return units
+
+    heading_lines = {h.strip() for h in headings if h.strip()}
+    lines = text.split("\n")
+    groups = []
+    first = size = 0
+    for i, line in enumerate(lines):
+        if i > first and line.strip() in heading_lines:
+            groups.append((first, i))
+            first, size = i, 0
+        size += len(line) + 1
+        if _ends_unit(line, size):
+            groups.append((first, i + 1))
+            first, size = i + 1, 0
+    if first < len(lines):
+        groups.append((first, len(lines)))
+
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+    units = []
+    previous_end = None
+    for first, last in groups:
+        start, end = line_starts[first], line_starts[last] - 1
+        unit_text = text[start:end]
+        if not unit_text.strip():
+            continue
+        heading = lines[first].strip()
+        if heading in heading_lines:
+            label = f"Section '{heading}'"
+        else:
+            label = f"Line {first + 1}" if last - first == 1 else f"Lines {first + 1}-{last}"
+        units.append(Unit(
+            text=unit_text,
+            body=unit_text.strip(),
+            label=label,
+            separator=text[previous_end:start] if previous_end is not None else "",
+        ))
+        previous_end = end
+    return units
+
+
+def _ends_unit(line: str, size: int) -> bool:
+    """Whether a unit of `size` chars ending with `line` is complete."""
+    if size >= _MAX_UNIT_CHARS:
+        return True
+    if size < _MIN_UNIT_CHARS:
+        return False
+    return not line.strip() or zlib.crc32(line.encode("utf-8")) % _BOUNDARY_MODULUS == 0
+
+
+class IncrementalPlan:
+    """Which units need the LLM, and the issues reused for the rest."""
+
+    def __init__(self, cache: LLMCache, provider: str, prompt: str, units: list[Unit]):
+        self.cache = cache
+        self.provider = provider
+        self.prompt = prompt
+        self.units = units
+        self.keys = [cache.make_key(u.body, provider, prompt + _UNIT_NAMESPACE) for u in units]
+        cached = cache.get_many(self.keys)
+        self.reused: dict[int, list[dict]] = {
+            i: json.loads(cached[key]) for i, key in enumerate(self.keys) if key in cached
+        }
+        self.changed = [i for i in range(len(units)) if i not in self.reused]
+
+        # Changed units keep the separators they have in the document, so
+        # runs of adjacent changed units read exactly as the original text
+        parts = []
+        self._starts: list[int] = []
+        length = 0
+        for n, i in enumerate(self.changed):
+            if n:
+                separator = self.units[i].separator or "\n"
+                parts.append(separator)
+                length += len(separator)
+            self._starts.append(length)
+            parts.append(self.units[i].text)
+            length += len(self.units[i].text)
+        self.changed_text = "".join(parts)
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", self.changed_text)]
+
+    def finish(self, result: dict) -> dict:
+        """Attribute fresh issues to units, store them, and merge with reused issues.
+
+        Nothing is stored when the analysis failed or only partly succeeded,
+        since units of a failed chunk would be cached as clean. Units that an
+        unattributed issue may belong to are not stored either, so the issue
+        is never dropped from a later run.
+        """
+        fresh: dict[int, list[dict]] = {i: [] for i in self.changed}
+        unattributed = []
+        unsure: set[int] = set()
+        for item in result.get("issues", []):
+            owner, candidates = self._owner(item)
+            if owner is None:
+                unattributed.append(item)
+                unsure.update(candidates)
+            else:
+                fresh[owner].append({k: v for k, v in item.items() if k != "location"})
+
+        if "error" not in result:
+            store = {self.keys[i]: json.dumps(issues) for i, issues in fresh.items() if i not in unsure}
+            if store:
+                self.cache.set_many(store, self.provider)
+
+        issues = []
+        for i, unit in enumerate(self.units):
+            for item in self.reused.get(i, fresh.get(i, [])):
+                issues.append(dict(item, location=unit.label))
+        issues.extend(unattributed)
+
+        merged = {k: v for k, v in result.items() if k not in ("issues", "cache_hit")}
+        merged["issues"] = issues
+        merged["units"] = {"total": len(self.units), "reanalyzed": len(self.changed)}
+        if not self.changed:
+            merged["cache_hit"] = True
+        return merged
+
+    def _owner(self, item: dict) -> tuple[Optional[int], list[int]]:
+        """The changed unit an LLM issue belongs to, and the units it could belong to.
+
+        The issue's line (in the changed text) or slide decides between the
+        units whose text contains the flagged text; without either, the
+        text must occur in exactly one changed unit.
+        """
+        needle = str(item.get("text", "")).strip()
+        candidates = [i for i in self.changed if needle and _contains(self.units[i].text, needle)]
+        if not candidates:
+            candidates = list(self.changed)
+        location = str(item.get("location") or "")
+        line = _LINE_REF.search(location)
+        if line:
+            owner = self._unit_at_line(int(line.group(1)))
+            if owner in candidates:
+                return owner, [owner]
+        slide = _SLIDE_REF.search(location)
+        if slide:
+            matching = [i for i in candidates if self.units[i].slide == int(slide.group(1))]
+            if len(matching) == 1:
+                return matching[0], matching
+        if len(candidates) == 1:
+            return candidates[0], candidates
+        return None, candidates
+
+    def _unit_at_line(self, line: int) -> Optional[int]:
+        """The changed unit containing a 1-based line of the changed text."""
+        if not 1 <= line <= len(self._line_starts):
+            return None
+        offset = self._line_starts[line - 1]
+        n = bisect_right(self._starts, offset) - 1
+        if n < 0 or offset >= self._starts[n] + len(self.units[self.changed[n]].text):
+            return None
+        return self.changed[n]
+
+
+def _contains(text: str, needle: str) -> bool:
+    """Whether `needle` occurs in `text`, as whole words at its word-character edges."""
+    pattern = re.escape(needle)
+    if re.match(r'\w', needle):
+        pattern = r'(?<!\w)' + pattern
+    if re.search(r'\w$', needle):
+        pattern += r'(?!\w)'
+    return re.search(pattern, text) is not None
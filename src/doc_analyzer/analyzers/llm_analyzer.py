@@ -1,28 +1,90 @@
 """LLM-based document analysis with multiple provider support."""
 
+import asyncio
+import copy
+import hashlib
 import json
-from typing import Optional, Literal
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Literal, Union
 from abc import ABC, abstractmethod
 
-from openai import OpenAI
-from anthropic import Anthropic
+import httpx
+
+from openai import OpenAI, AsyncOpenAI
+from anthropic import Anthropic, AsyncAnthropic
 import google.generativeai as genai
 
 from ..config import get_settings
 from ..models import Issue, IssueCategory, IssueSeverity
+from .llm_cache import LLMCache
+
+if TYPE_CHECKING:
+    from .client_registry import ClientRegistry
+
+logger = logging.getLogger(__name__)
 
 
 LLMProvider = Literal["openai", "anthropic", "google", "llama-70b", "gemini-flash"]
 
+# Token counts summed into LLMAnalyzer.usage
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
+
 
 class BaseLLMProvider(ABC):
     """Base class for LLM providers."""
 
-    @abstractmethod
     def analyze(self, text: str, prompt: str) -> str:
         """Send text to LLM and get response."""
+        return self.complete(text, prompt)[0]
+
+    async def aanalyze(self, text: str, prompt: str) -> str:
+        """Async variant of analyze."""
+        return (await self.acomplete(text, prompt))[0]
+
+    @abstractmethod
+    def complete(self, text: str, prompt: str) -> tuple[str, dict]:
+        """Send text to LLM and get the response and its token usage.
+
+        Usage is {"input_tokens": ..., "output_tokens": ...}, or empty if
+        the provider did not report it. Providers with prompt caching also
+        report the part of the input read from ("cache_read_tokens") and
+        written to ("cache_write_tokens") their prompt cache.
+        """
         pass
 
+    async def acomplete(self, text: str, prompt: str) -> tuple[str, dict]:
+        """Async variant of complete.
+
+        Providers override this with their SDK's native async client; the
+        default runs the blocking call in a worker thread.
+        """
+        return await asyncio.to_thread(self.complete, text, prompt)
+
+    # Whether submit_batch/poll_batch are implemented
+    supports_batch = False
+    # Whether requests are laid out for provider-side prompt (prefix) caching
+    prompt_caching = False
+    # Whether concurrent calls on one long text wait for the first to write the
+    # provider's prompt cache (see LLMAnalyzer._complete)
+    cache_warmup = False
+
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        """Submit (text, prompt) requests keyed by custom id as one batch job.
+
+        Returns the provider's batch id.
+        """
+        raise NotImplementedError(f"{self.name} has no batch API")
+
+    def poll_batch(self, batch_id: str) -> Optional[dict[str, Union[tuple[str, dict], Exception]]]:
+        """Return a finished batch's results, or None while it is still running.
+
+        Results are keyed by custom id: (response, usage) like complete(),
+        or the exception of a request that failed.
+        """
+        raise NotImplementedError(f"{self.name} has no batch API")
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -33,49 +95,232 @@ class BaseLLMProvider(ABC):
 class OpenAIProvider(BaseLLMProvider):
     """OpenAI GPT provider."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o-mini"):
+    supports_batch = True
+    # Batch statuses that may still produce output
+    BATCH_RUNNING = ("validating", "in_progress", "finalizing", "cancelling")
+    # System message shared by every analysis when the request is laid out
+    # for prompt caching; the analysis instructions follow the document
+    CACHED_SYSTEM_PROMPT = (
+        "You analyze the document the user provides. Follow the instructions "
+        "that come after it and respond with JSON only."
+    )
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gpt-4o-mini",
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+    ):
         settings = get_settings()
-        self.client = OpenAI(api_key=api_key or settings.openai_api_key)
+        base_url = settings.openai_base_url or None
+        self.client = OpenAI(
+            api_key=api_key or settings.openai_api_key, base_url=base_url, http_client=http_client
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=api_key or settings.openai_api_key, base_url=base_url, http_client=async_http_client
+        )
         self.model = model
+        self.prompt_caching = settings.llm_prompt_cache
 
     @property
     def name(self) -> str:
         return f"openai/{self.model}"
 
-    def analyze(self, text: str, prompt: str) -> str:
-        response = self.client.chat.completions.create(
+    def complete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = self.client.chat.completions.create(**self._request(text, prompt))
+        return response.choices[0].message.content, _chat_completion_usage(response)
+
+    async def acomplete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = await self.async_client.chat.completions.create(**self._request(text, prompt))
+        return response.choices[0].message.content, _chat_completion_usage(response)
+
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._batch_body(self._request(text, prompt)),
+            })
+            for custom_id, (text, prompt) in requests.items()
+        ]
+        batch_file = self.client.files.create(
+            file=("requests.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id, endpoint="/v1/chat/completions", completion_window="24h"
+        )
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[dict[str, Union[tuple[str, dict], Exception]]]:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in self.BATCH_RUNNING:
+            return None
+        if batch.status == "failed":
+            raise RuntimeError(f"OpenAI batch {batch_id} failed: {batch.errors}")
+
+        # completed, or expired/cancelled with partial output
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get("response") or {}
+                body = response.get("body") or {}
+                if response.get("status_code") == 200:
+                    usage = body.get("usage") or {}
+                    details = usage.get("prompt_tokens_details") or {}
+                    results[item["custom_id"]] = (
+                        body["choices"][0]["message"]["content"],
+                        {
+                            "input_tokens": usage.get("prompt_tokens"),
+                            "output_tokens": usage.get("completion_tokens"),
+                            "cache_read_tokens": details.get("cached_tokens") or 0,
+                        },
+                    )
+                else:
+                    error = item.get("error") or body.get("error") or {}
+                    message = error.get("message") or f"HTTP {response.get('status_code')}"
+                    results[item["custom_id"]] = RuntimeError(message)
+        return results
+
+    def _request(self, text: str, prompt: str) -> dict:
+        if not self.prompt_caching:
+            return dict(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": prompt},
+                    {"role": "user", "content": text},
+                ],
+                temperature=0.3,
+                response_format={"type": "json_object"},
+            )
+        # OpenAI caches the longest previously seen prompt prefix automatically.
+        # A fixed system message and then the document make up the prefix
+        # every analysis of the same text shares; the per-analysis
+        # instructions come last, and the cache key routes those requests to
+        # the same cache.
+        return dict(
             model=self.model,
             messages=[
-                {"role": "system", "content": prompt},
-                {"role": "user", "content": text},
+                {"role": "system", "content": self.CACHED_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Document to analyze:\n\n{text}"},
+                {"role": "user", "content": prompt},
             ],
             temperature=0.3,
             response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": _prefix_key(text)},
         )
-        return response.choices[0].message.content
+
+    def _batch_body(self, request: dict) -> dict:
+        """A request as a batch line body (extra_body fields are inlined)."""
+        body = dict(request)
+        body.update(body.pop("extra_body", None) or {})
+        return body
 
 
 class AnthropicProvider(BaseLLMProvider):
     """Anthropic Claude provider."""
 
-    def __init__(self, api_key: Optional[str] = None, model: str = "claude-3-haiku-20240307"):
+    supports_batch = True
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "claude-3-haiku-20240307",
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+    ):
         settings = get_settings()
-        self.client = Anthropic(api_key=api_key or settings.anthropic_api_key)
+        base_url = settings.anthropic_base_url or None
+        self.client = Anthropic(
+            api_key=api_key or settings.anthropic_api_key, base_url=base_url, http_client=http_client
+        )
+        self.async_client = AsyncAnthropic(
+            api_key=api_key or settings.anthropic_api_key, base_url=base_url, http_client=async_http_client
+        )
         self.model = model
+        self.prompt_caching = settings.llm_prompt_cache
+        # Anthropic only reads a prefix another request has finished writing
+        self.cache_warmup = settings.llm_prompt_cache and settings.llm_prompt_cache_warmup
 
     @property
     def name(self) -> str:
         return f"anthropic/{self.model}"
 
-    def analyze(self, text: str, prompt: str) -> str:
-        response = self.client.messages.create(
+    def complete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = self.client.messages.create(**self._request(text, prompt))
+        return response.content[0].text, self._usage(response)
+
+    async def acomplete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = await self.async_client.messages.create(**self._request(text, prompt))
+        return response.content[0].text, self._usage(response)
+
+    def submit_batch(self, requests: dict[str, tuple[str, str]]) -> str:
+        batch = self.client.messages.batches.create(requests=[
+            {"custom_id": custom_id, "params": self._request(text, prompt)}
+            for custom_id, (text, prompt) in requests.items()
+        ])
+        return batch.id
+
+    def poll_batch(self, batch_id: str) -> Optional[dict[str, Union[tuple[str, dict], Exception]]]:
+        batch = self.client.messages.batches.retrieve(batch_id)
+        if batch.processing_status != "ended":
+            return None
+        results = {}
+        for item in self.client.messages.batches.results(batch_id):
+            if item.result.type == "succeeded":
+                message = item.result.message
+                results[item.custom_id] = (message.content[0].text, self._usage(message))
+            else:
+                error = getattr(item.result, "error", None)
+                results[item.custom_id] = RuntimeError(f"Batch request {item.result.type}: {error}")
+        return results
+
+    def _usage(self, response) -> dict:
+        # Anthropic's input_tokens excludes cached tokens; report the total
+        # like the other providers, with the cached part broken out
+        usage = response.usage
+        read = getattr(usage, "cache_read_input_tokens", None) or 0
+        write = getattr(usage, "cache_creation_input_tokens", None) or 0
+        return {
+            "input_tokens": usage.input_tokens + read + write,
+            "output_tokens": usage.output_tokens,
+            "cache_read_tokens": read,
+            "cache_write_tokens": write,
+        }
+
+    def _request(self, text: str, prompt: str) -> dict:
+        if not self.prompt_caching:
+            return dict(
+                model=self.model,
+                max_tokens=4096,
+                messages=[
+                    {"role": "user", "content": f"{prompt}\n\n---\n\nDocument to analyze:\n\n{text}"},
+                ],
+            )
+        # The document block ends at a cache breakpoint, so the spelling/grammar
+        # and content analyses of the same text read it from the prompt cache;
+        # only the instructions after it differ between them
+        return dict(
             model=self.model,
             max_tokens=4096,
-            messages=[
-                {"role": "user", "content": f"{prompt}\n\n---\n\nDocument to analyze:\n\n{text}"},
-            ],
+            messages=[{
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": f"Document to analyze:\n\n{text}",
+                        "cache_control": {"type": "ephemeral"},
+                    },
+                    {"type": "text", "text": f"---\n\n{prompt}"},
+                ],
+            }],
         )
-        return response.content[0].text
 
 
 class GoogleProvider(BaseLLMProvider):
@@ -91,15 +336,34 @@ class GoogleProvider(BaseLLMProvider):
     def name(self) -> str:
         return f"google/{self.model_name}"
 
-    def analyze(self, text: str, prompt: str) -> str:
+    def complete(self, text: str, prompt: str) -> tuple[str, dict]:
         response = self.model.generate_content(
             f"{prompt}\n\n---\n\nDocument to analyze:\n\n{text}",
-            generation_config=genai.GenerationConfig(
-                temperature=0.3,
-                response_mime_type="application/json",
-            ),
+            generation_config=self._generation_config(),
+        )
+        return response.text, self._usage(response)
+
+    async def acomplete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = await self.model.generate_content_async(
+            f"{prompt}\n\n---\n\nDocument to analyze:\n\n{text}",
+            generation_config=self._generation_config(),
+        )
+        return response.text, self._usage(response)
+
+    def _usage(self, response) -> dict:
+        metadata = getattr(response, "usage_metadata", None)
+        if metadata is None:
+            return {}
+        return {
+            "input_tokens": metadata.prompt_token_count,
+            "output_tokens": metadata.candidates_token_count,
+        }
+
+    def _generation_config(self) -> "genai.GenerationConfig":
+        return genai.GenerationConfig(
+            temperature=0.3,
+            response_mime_type="application/json",
         )
-        return response.text
 
 
 class OpenRouterProvider(BaseLLMProvider):
@@ -111,7 +375,13 @@ class OpenRouterProvider(BaseLLMProvider):
         "gemini-flash": "google/gemini-2.0-flash-001",  # Paid, reliable, ~$0.10/1M input
     }
 
-    def __init__(self, model_key: str = "llama-70b", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model_key: str = "llama-70b",
+        api_key: Optional[str] = None,
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
+    ):
         settings = get_settings()
         self.api_key = api_key or settings.openrouter_api_key
         if model_key not in self.MODELS:
@@ -121,14 +391,28 @@ class OpenRouterProvider(BaseLLMProvider):
         self.client = OpenAI(
             base_url="https://openrouter.ai/api/v1",
             api_key=self.api_key,
+            http_client=http_client,
+        )
+        self.async_client = AsyncOpenAI(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=self.api_key,
+            http_client=async_http_client,
         )
 
     @property
     def name(self) -> str:
         return f"openrouter/{self.model_key}"
 
-    def analyze(self, text: str, prompt: str) -> str:
-        response = self.client.chat.completions.create(
+    def complete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = self.client.chat.completions.create(**self._request(text, prompt))
+        return response.choices[0].message.content, _chat_completion_usage(response)
+
+    async def acomplete(self, text: str, prompt: str) -> tuple[str, dict]:
+        response = await self.async_client.chat.completions.create(**self._request(text, prompt))
+        return response.choices[0].message.content, _chat_completion_usage(response)
+
+    def _request(self, text: str, prompt: str) -> dict:
+        return dict(
             model=self.model,
             messages=[
                 {"role": "system", "content": prompt},
@@ -136,12 +420,56 @@ class OpenRouterProvider(BaseLLMProvider):
             ],
             temperature=0.3,
         )
-        return response.choices[0].message.content
+
+
+def _chat_completion_usage(response) -> dict:
+    """Token usage of an OpenAI-compatible chat completion, if reported."""
+    if response.usage is None:
+        return {}
+    details = getattr(response.usage, "prompt_tokens_details", None)
+    return {
+        "input_tokens": response.usage.prompt_tokens,
+        "output_tokens": response.usage.completion_tokens,
+        "cache_read_tokens": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+def _prefix_key(text: str) -> str:
+    """Stable key for requests that share a document prefix."""
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def create_provider(
+    provider: LLMProvider,
+    http_client: Optional[httpx.Client] = None,
+    async_http_client: Optional[httpx.AsyncClient] = None,
+) -> BaseLLMProvider:
+    """Create the LLM provider for a provider key.
+
+    The optional httpx clients let callers supply tuned connection pools;
+    the Gemini SDK manages its own transport and ignores them.
+    """
+    clients = {"http_client": http_client, "async_http_client": async_http_client}
+    if provider == "openai":
+        return OpenAIProvider(**clients)
+    elif provider == "anthropic":
+        return AnthropicProvider(**clients)
+    elif provider == "google":
+        return GoogleProvider()
+    elif provider == "llama-70b":
+        return OpenRouterProvider(model_key="llama-70b", **clients)
+    elif provider == "gemini-flash":
+        return OpenRouterProvider(model_key="gemini-flash", **clients)
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
 
 
 class LLMAnalyzer:
     """Multi-provider LLM analyzer for document quality."""
 
+    # Providers only cache prompt prefixes of ~1024+ tokens (2048 for some models)
+    PROMPT_CACHE_MIN_CHARS = 4096
+
     # Prompt for spelling/grammar analysis
     SPELLING_GRAMMAR_PROMPT = """You are a professional document editor. Analyze the following document for spelling, grammar, and spacing issues.
 
@@ -172,6 +500,11 @@ The text may include slide separators like "--- Slide 5 ---" or "[SLIDE BREAK]".
 - Ignore hyphen/underline separator lines when considering spacing."""
 
     # Prompt for content/completeness analysis
+    # Section guidance of CONTENT_PROMPT; content_prompt() replaces it with the
+    # sections the local section matcher left undecided
+    CONTENT_SECTIONS = """For proposals, look for: executive summary, scope, timeline, budget, team, next steps.
+For kickoffs, look for: introductions, project overview, goals, risks, schedule, next steps."""
+
     CONTENT_PROMPT = """You are a business document reviewer. Analyze this document for content quality and completeness.
 
 Return a JSON object with this structure:
@@ -192,8 +525,7 @@ Return a JSON object with this structure:
   "style_observations": ["passive voice instances", "jargon found", "etc"]
 }
 
-For proposals, look for: executive summary, scope, timeline, budget, team, next steps.
-For kickoffs, look for: introductions, project overview, goals, risks, schedule, next steps.
+""" + CONTENT_SECTIONS + """
 Flag passive voice and jargon as low severity (informational only)."""
 
     # Prompt for BANNT analysis (sales calls)
@@ -259,43 +591,267 @@ Return a JSON object with this structure:
   "summary": "brief summary of call"
 }"""
 
-    def __init__(self, provider: LLMProvider = "openai"):
-        self.provider = self._create_provider(provider)
+    def __init__(
+        self,
+        provider: LLMProvider = "openai",
+        cache: Optional[LLMCache] = None,
+        clients: Optional["ClientRegistry"] = None,
+    ):
+        # Borrow a long-lived provider from the registry when one is given
+        self.provider = clients.get(provider) if clients else self._create_provider(provider)
+        self.cache = cache
+        # Tokens spent by this analyzer's LLM calls (cache hits cost nothing)
+        self._usage_lock = threading.Lock()
+        self._usage = dict.fromkeys(("calls", *USAGE_FIELDS), 0)
+        # In-flight first calls per prompt-cacheable text (see _complete)
+        self._prefix_lock = threading.Lock()
+        self._prefixes: dict[str, threading.Event] = {}
+        self._aprefixes: dict[str, asyncio.Event] = {}
+        # Async provider calls not yet finished (see pending_calls)
+        self._pending = 0
 
     def _create_provider(self, provider: LLMProvider) -> BaseLLMProvider:
         """Create the appropriate LLM provider."""
-        if provider == "openai":
-            return OpenAIProvider()
-        elif provider == "anthropic":
-            return AnthropicProvider()
-        elif provider == "google":
-            return GoogleProvider()
-        elif provider == "llama-70b":
-            return OpenRouterProvider(model_key="llama-70b")
-        elif provider == "gemini-flash":
-            return OpenRouterProvider(model_key="gemini-flash")
-        else:
-            raise ValueError(f"Unknown provider: {provider}")
+        return create_provider(provider)
+
+    def fork(self) -> "LLMAnalyzer":
+        """Copy sharing this analyzer's provider client and cache, with its own usage count."""
+        other = copy.copy(self)
+        other._usage_lock = threading.Lock()
+        other._usage = dict.fromkeys(("calls", *USAGE_FIELDS), 0)
+        other._pending = 0
+        return other
 
     def analyze_spelling_grammar(self, text: str) -> dict:
         """Analyze document for spelling and grammar issues."""
-        response = self.provider.analyze(text, self.SPELLING_GRAMMAR_PROMPT)
-        return self._parse_json(response)
-
-    def analyze_content(self, text: str) -> dict:
-        """Analyze document for content quality and completeness."""
-        response = self.provider.analyze(text, self.CONTENT_PROMPT)
-        return self._parse_json(response)
+        return self._analyze(text, self.SPELLING_GRAMMAR_PROMPT)
+
+    async def aanalyze_spelling_grammar(self, text: str) -> dict:
+        """Async variant of analyze_spelling_grammar."""
+        return await self._aanalyze(text, self.SPELLING_GRAMMAR_PROMPT)
+
+    def analyze_content(self, text: str, sections: Optional[list[str]] = None) -> dict:
+        """Analyze document for content quality and completeness.
+
+        `sections` narrows the required-section check (see content_prompt).
+        """
+        return self._analyze(text, self.content_prompt(sections))
+
+    async def aanalyze_content(self, text: str, sections: Optional[list[str]] = None) -> dict:
+        """Async variant of analyze_content."""
+        return await self._aanalyze(text, self.content_prompt(sections))
+
+    def content_prompt(self, sections: Optional[list[str]] = None) -> str:
+        """The content prompt, with the section check narrowed to `sections`.
+
+        None keeps the generic section guidance; a list (possibly empty)
+        asks only about the required sections the local matcher could not
+        decide.
+        """
+        if sections is None:
+            return self.CONTENT_PROMPT
+        if sections:
+            guidance = (
+                f"Required sections to look for: {', '.join(sections)}. "
+                "List each one in required_sections_found or required_sections_missing; "
+                "a section may appear under a different heading."
+            )
+        else:
+            guidance = "Required sections were already checked: leave both required_sections lists empty."
+        return self.CONTENT_PROMPT.replace(self.CONTENT_SECTIONS, guidance)
 
     def analyze_bannt(self, transcript: str) -> dict:
         """Analyze sales call transcript using BANNT framework."""
-        response = self.provider.analyze(transcript, self.BANNT_PROMPT)
-        return self._parse_json(response)
+        return self._analyze(transcript, self.BANNT_PROMPT)
+
+    async def aanalyze_bannt(self, transcript: str) -> dict:
+        """Async variant of analyze_bannt."""
+        return await self._aanalyze(transcript, self.BANNT_PROMPT)
 
     def analyze_client_call(self, transcript: str) -> dict:
         """Analyze client call for opportunities and concerns."""
-        response = self.provider.analyze(transcript, self.CLIENT_CALL_PROMPT)
-        return self._parse_json(response)
+        return self._analyze(transcript, self.CLIENT_CALL_PROMPT)
+
+    async def aanalyze_client_call(self, transcript: str) -> dict:
+        """Async variant of analyze_client_call."""
+        return await self._aanalyze(transcript, self.CLIENT_CALL_PROMPT)
+
+    def _analyze(self, text: str, prompt: str) -> dict:
+        """Run a prompt, serving it from the response cache when possible.
+
+        Results served from the cache are marked with "cache_hit": True.
+        """
+        key, cached = self._cache_lookup(text, prompt)
+        if cached is not None:
+            return cached
+        response, usage = self._complete(text, prompt)
+        self._record_usage(usage)
+        return self._cache_store(key, response)
+
+    async def _aanalyze(self, text: str, prompt: str) -> dict:
+        """Async variant of _analyze."""
+        key, cached = self._cache_lookup(text, prompt)
+        if cached is not None:
+            return cached
+        self._pending += 1
+        try:
+            response, usage = await self._acomplete(text, prompt)
+        finally:
+            self._pending -= 1
+        self._record_usage(usage)
+        return self._cache_store(key, response)
+
+    def _complete(self, text: str, prompt: str) -> tuple[str, dict]:
+        """Call the provider, optionally letting the first call on a text warm the prompt cache.
+
+        Several prompts over the same long text (spelling/grammar and
+        content) share the text as a cached prefix, but on Anthropic only
+        once a first request has written it, so concurrent requests each
+        pay for a cache write. With LLM_PROMPT_CACHE_WARMUP (Anthropic
+        only, off by default) calls on a text wait for the one already in
+        flight, trading latency for cheaper input; otherwise calls are
+        never held back.
+        """
+        prefix = self._prefix_key(text)
+        if prefix is None:
+            return self.provider.complete(text, prompt)
+        with self._prefix_lock:
+            first = self._prefixes.get(prefix)
+            if first is None:
+                self._prefixes[prefix] = threading.Event()
+        if first is not None:
+            first.wait()
+            return self.provider.complete(text, prompt)
+        try:
+            return self.provider.complete(text, prompt)
+        finally:
+            with self._prefix_lock:
+                self._prefixes.pop(prefix).set()
+
+    async def _acomplete(self, text: str, prompt: str) -> tuple[str, dict]:
+        """Async variant of _complete."""
+        prefix = self._prefix_key(text)
+        if prefix is None:
+            return await self.provider.acomplete(text, prompt)
+        first = self._aprefixes.get(prefix)
+        if first is not None:
+            await first.wait()
+            return await self.provider.acomplete(text, prompt)
+        self._aprefixes[prefix] = asyncio.Event()
+        try:
+            return await self.provider.acomplete(text, prompt)
+        finally:
+            self._aprefixes.pop(prefix).set()
+
+    def _prefix_key(self, text: str) -> Optional[str]:
+        """Key of a text whose calls wait for a cache warm-up call, else None."""
+        if not self.provider.cache_warmup or len(text) < self.PROMPT_CACHE_MIN_CHARS:
+            return None
+        return _prefix_key(text)
+
+    def analyze_offline(
+        self,
+        requests: list[tuple[str, str]],
+        poll_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> list[dict]:
+        """Run many (text, prompt) requests through the provider's batch API.
+
+        Batch jobs cost less than synchronous calls but may take hours, so
+        this is for offline work such as audits and backfills. Requests
+        answered by the response cache are not submitted; identical ones
+        are submitted once. The rest go out as one batch job, polled every
+        `poll_interval` seconds until it finishes.
+
+        Returns:
+            The parsed result of each request, in order; failed requests
+            get an {"error": ...} result like an unparsable response
+        """
+        if not self.provider.supports_batch:
+            raise ValueError(f"{self.provider.name} has no batch API (use openai or anthropic)")
+        settings = get_settings()
+        poll_interval = poll_interval if poll_interval is not None else settings.llm_batch_poll_interval
+        timeout = timeout if timeout is not None else settings.llm_batch_timeout_seconds
+
+        results: list[Optional[dict]] = [None] * len(requests)
+        # custom id -> (cache key, indexes of the requests it answers)
+        pending: dict[str, tuple[Optional[str], list[int]]] = {}
+        submit: dict[str, tuple[str, str]] = {}
+        ids: dict[tuple[str, str], str] = {}
+        for index, (text, prompt) in enumerate(requests):
+            key, cached = self._cache_lookup(text, prompt)
+            if cached is not None:
+                results[index] = cached
+                continue
+            custom_id = ids.get((text, prompt))
+            if custom_id is None:
+                custom_id = ids[(text, prompt)] = f"req-{len(submit)}"
+                submit[custom_id] = (text, prompt)
+                pending[custom_id] = (key, [])
+            pending[custom_id][1].append(index)
+
+        if submit:
+            batch_id = self.provider.submit_batch(submit)
+            logger.info(f"Submitted {self.provider.name} batch {batch_id} with {len(submit)} requests")
+            deadline = time.monotonic() + timeout
+            while (finished := self.provider.poll_batch(batch_id)) is None:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Batch {batch_id} did not finish within {timeout:g}s")
+                time.sleep(poll_interval)
+
+            for custom_id, (key, indexes) in pending.items():
+                outcome = finished.get(custom_id)
+                if isinstance(outcome, tuple):
+                    response, usage = outcome
+                    self._record_usage(usage)
+                    result = self._cache_store(key, response)
+                else:
+                    result = {"error": str(outcome or "Missing from batch results")}
+                for index in indexes:
+                    results[index] = dict(result)
+        return results
+
+    @property
+    def usage(self) -> dict:
+        """Calls made and tokens spent so far by this analyzer."""
+        with self._usage_lock:
+            return dict(self._usage)
+
+    @property
+    def pending_calls(self) -> int:
+        """Async provider calls started by this analyzer that have not finished."""
+        return self._pending
+
+    def usage_since(self, before: dict) -> dict:
+        """Calls and tokens spent since an earlier `usage` snapshot."""
+        now = self.usage
+        return {name: now[name] - before.get(name, 0) for name in now}
+
+    def _record_usage(self, usage: dict) -> None:
+        with self._usage_lock:
+            self._usage["calls"] += 1
+            for name in USAGE_FIELDS:
+                self._usage[name] += usage.get(name) or 0
+
+    def _cache_lookup(self, text: str, prompt: str) -> tuple[Optional[str], Optional[dict]]:
+        """Return the cache key and the cached result, if any."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(text, self.provider.name, prompt)
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, None
+        result = self._parse_json(cached)
+        result["cache_hit"] = True
+        return key, result
+
+    def _cache_store(self, key: Optional[str], response: str) -> dict:
+        """Parse a fresh response and cache it if it parsed."""
+        result = self._parse_json(response)
+        # Only cache responses we could parse; a bad response should be retried
+        if key is not None and "error" not in result:
+            self.cache.set(key, self.provider.name, response)
+        return result
 
     def _parse_json(self, response: str) -> dict:
         """Parse JSON from LLM response."""
@@ -0,0 +1,160 @@
+"""Persistent cache of raw LLM responses.
+
+Responses are keyed on the SHA-256 of the text sent, the provider name and a
+hash of the prompt, so re-running an unchanged document skips the network
+call entirely while any edit to the text, provider or prompt misses.
+Entries expire after a TTL and the least recently used entries are evicted
+once the cache grows past its size limit.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from ..config import get_settings
+
+# SQLite's default limit on bound parameters in one statement (older builds)
+_MAX_SQL_PARAMS = 999
+
+
+class LLMCache:
+    """SQLite-backed LLM response cache with TTL and size-based LRU eviction."""
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_bytes: int = 100 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+
+    @staticmethod
+    def make_key(text: str, provider: str, prompt: str) -> str:
+        """Build the cache key for a text/provider/prompt combination."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+        return f"{provider}:{prompt_hash}:{text_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            return response
+
+    def set(self, key: str, provider: str, response: str) -> None:
+        """Store a response, then drop expired and least recently used entries."""
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, provider, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, response, size, now, now),
+            )
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._evict(conn)
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Return the cached responses for several keys, with one connection.
+
+        Keys that miss (or have expired) are absent from the result.
+        """
+        now = time.time()
+        found = {}
+        with self._connect() as conn:
+            for i in range(0, len(keys), _MAX_SQL_PARAMS):
+                batch = keys[i:i + _MAX_SQL_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, response, created_at FROM responses WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, response, created_at in rows:
+                    if now - created_at <= self.ttl_seconds:
+                        found[key] = response
+            conn.executemany("UPDATE responses SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        return found
+
+    def set_many(self, items: dict[str, str], provider: str) -> None:
+        """Store several responses in one transaction, then evict as set() does."""
+        now = time.time()
+        rows = [
+            (key, provider, response, len(response.encode("utf-8")), now, now)
+            for key, response in items.items()
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, provider, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+            self._evict(conn)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Delete least recently used entries until under max_bytes."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            stale.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation; this keeps the cache thread-safe."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+@lru_cache
+def get_llm_cache() -> Optional[LLMCache]:
+    """Get the shared LLM cache, or None if caching is disabled."""
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    return LLMCache(
+        path=settings.llm_cache_path,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_bytes=settings.llm_cache_max_mb * 1024 * 1024,
+    )
@@ -1,24 +1,85 @@
 """Main quality analyzer that coordinates extraction, analysis, and scoring."""
 
+import asyncio
+import copy
+import functools
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Optional, Union
 
+from .chunking import (
+    Chunk, merge_bannt, merge_client_call, merge_content, merge_spelling_grammar, split_text
+)
+from .client_registry import ClientRegistry
+from .incremental import IncrementalPlan, split_units
 from .llm_analyzer import LLMAnalyzer, LLMProvider
+from .llm_cache import get_llm_cache
+from .revision_cache import get_revision_cache
 from .rule_checker import RuleChecker, RuleMatch
+from ..config import get_settings
+from ..document import DocumentModel
 from ..extractors.google_slides import GoogleSlidesExtractor
 from ..extractors.google_docs import GoogleDocsExtractor
 from ..models import (
     AnalysisResult, DocumentType, Issue, IssueCategory,
     IssueSeverity, ScoreBreakdown, BANNTScore
 )
+from ..rulesets import Ruleset, SectionReport, get_ruleset_loader
+
+logger = logging.getLogger(__name__)
+
+
+def _chunk_error(exc: Exception) -> dict:
+    """Turn a failed chunk call into the error result the merge helpers expect."""
+    return {"error": str(exc) or type(exc).__name__}
+
+
+def _chunk_result(future) -> dict:
+    """Wait for one chunk's LLM call, so a failing chunk only fails itself."""
+    try:
+        return future.result()
+    except Exception as exc:
+        return _chunk_error(exc)
 
 
 class QualityAnalyzer:
     """Main document quality analyzer."""
 
-    def __init__(self, provider: LLMProvider = "openai", disabled_rules: Optional[list[str]] = None):
-        self.llm = LLMAnalyzer(provider=provider)
-        self.rule_checker = RuleChecker(disabled_rules=disabled_rules)
+    def __init__(
+        self,
+        provider: LLMProvider = "openai",
+        disabled_rules: Optional[list[str]] = None,
+        use_cache: bool = True,
+        clients: Optional[ClientRegistry] = None,
+        chunk_parallelism: Optional[int] = None,
+        incremental: bool = False,
+    ):
+        settings = get_settings()
+        # Long texts are split into chunks of chunk_chars, analyzed at most
+        # chunk_parallelism LLM calls at a time
+        self.chunk_chars = settings.llm_chunk_chars
+        self.chunk_parallelism = chunk_parallelism or settings.llm_chunk_parallelism
+        self.clients = clients
+        self.llm = LLMAnalyzer(
+            provider=provider,
+            cache=get_llm_cache() if use_cache else None,
+            clients=clients,
+        )
+        # Rulesets are compiled once and picked by document type; each gets
+        # its own rule checker, rebuilt only when the ruleset file changes
+        self.disabled_rules = list(disabled_rules or [])
+        self.rulesets = get_ruleset_loader()
+        self._rule_checkers: dict[str, RuleChecker] = {}
+        # Required sections are matched locally; the LLM content review
+        # only judges the sections the matcher leaves undecided
+        self.content_review = settings.llm_content_review
+        # Unchanged Drive revisions are served without extraction or LLM calls
+        self.revisions = get_revision_cache() if use_cache else None
+        # Incremental mode stores per-unit issues in the LLM cache
+        self.incremental = incremental and self.llm.cache is not None
         self.slides_extractor = GoogleSlidesExtractor()
         self.docs_extractor = GoogleDocsExtractor()
 
@@ -36,49 +97,248 @@ class QualityAnalyzer:
         Returns:
             AnalysisResult with score and issues
         """
-        # Detect document type from URL
-        if "/presentation/" in url:
-            extractor = self.slides_extractor
-            doc_type = doc_type or self._infer_slides_type(url)
-        elif "/document/" in url:
-            extractor = self.docs_extractor
-            doc_type = doc_type or DocumentType.PROPOSAL
-        else:
-            raise ValueError(f"Unsupported URL format: {url}")
+        extractor, doc_type = self._select_extractor(url, doc_type)
+        cached, extracted, revision = self._load(extractor, url, doc_type)
+        if cached:
+            return cached
 
-        # Extract text
-        extractor.authenticate()
-        extracted = extractor.extract_text(url)
-        text = extracted.get("full_text", "")
-        title = extracted.get("title", "Untitled")
+        # The LLM calls for every chunk are independent, so issue them
+        # concurrently and run the deterministic rule checks (fast, reliable)
+        # while they are in flight
+        started, usage = time.perf_counter(), self.llm.usage
+        chunks = self._document_chunks(extracted)
+        plan, sg_chunks = self._spelling_grammar_plan(extracted, chunks)
+        sections = self._match_sections(extracted, doc_type)
+        content_chunks = chunks if self.content_review else []
+        with ThreadPoolExecutor(max_workers=self.chunk_parallelism) as pool:
+            sg_futures = [pool.submit(self.llm.analyze_spelling_grammar, c.text) for c in sg_chunks]
+            content_futures = [
+                pool.submit(self.llm.analyze_content, c.text, sections.undecided) for c in content_chunks
+            ]
+            rule_matches = self._rule_checker(doc_type).check_document(DocumentModel.from_extracted(extracted))
+            sg_result = merge_spelling_grammar([_chunk_result(f) for f in sg_futures], sg_chunks)
+            content_result = merge_content([_chunk_result(f) for f in content_futures], content_chunks) \
+                if content_chunks else {}
+        if plan:
+            sg_result = plan.finish(sg_result)
 
-        # Run deterministic rule checks first (fast, reliable)
-        issues = []
-        rule_matches = self.rule_checker.check_all(text)
-        issues.extend(self._convert_rule_matches(rule_matches))
+        result = self._document_result(
+            url, doc_type, extracted, rule_matches, sg_result, content_result, sections
+        )
+        self._record_cost(result, started, usage)
+        if not result.errors:
+            self._remember(revision, doc_type, result)
+        return result
 
-        # Then run LLM analysis
-        # Spelling/grammar analysis
-        sg_result = self.llm.analyze_spelling_grammar(text[:30000])  # Limit for token cost
-        issues.extend(self._convert_sg_issues(sg_result))
+    async def analyze_url_async(
+        self,
+        url: str,
+        doc_type: Optional[DocumentType] = None
+    ) -> AnalysisResult:
+        """Async variant of analyze_url using the providers' async clients.
 
-        # Content analysis
-        content_result = self.llm.analyze_content(text[:30000])
-        issues.extend(self._convert_content_issues(content_result))
+        Only the blocking Google extraction and the CPU-bound rule checks go
+        to worker threads; the LLM calls are awaited on the event loop.
+        """
+        extractor, doc_type = self._select_extractor(url, doc_type)
+        cached, extracted, revision = await asyncio.to_thread(self._load, extractor, url, doc_type)
+        if cached:
+            return cached
+        rules = asyncio.ensure_future(self._acheck_rules(extracted, doc_type))
+        return await self._aanalyze_extracted(url, doc_type, extracted, revision, rules)
 
-        # Calculate score
-        score = self._calculate_score(issues, sg_result, content_result)
+    async def analyze_url_stream(
+        self,
+        url: str,
+        doc_type: Optional[DocumentType] = None
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Analyze a Google Doc or Slides URL, yielding each stage as it completes.
 
-        return AnalysisResult(
-            document_url=url,
-            document_title=title,
-            document_type=doc_type,
-            analyzed_at=datetime.utcnow(),
-            llm_provider=self.llm.provider_name,
-            score=score,
-            issues=issues,
-            text_length=len(text),
-        )
+        Events, in order of availability:
+            ("metadata", dict): title, type and size, right after extraction
+            ("rules", list[Issue]): deterministic rule issues (milliseconds later)
+            ("spelling_grammar", list[Issue]) and ("content", list[Issue]):
+                each LLM stage, in whichever order they finish
+            ("result", AnalysisResult): the scored result, always last
+
+        A document served from the revision cache yields only its metadata
+        and result.
+        """
+        extractor, doc_type = self._select_extractor(url, doc_type)
+        cached, extracted, revision = await asyncio.to_thread(self._load, extractor, url, doc_type)
+        if cached:
+            yield "metadata", {
+                "document_url": url,
+                "document_title": cached.document_title,
+                "document_type": cached.document_type.value,
+                "text_length": cached.text_length,
+            }
+            yield "result", cached
+            return
+
+        yield "metadata", {
+            "document_url": url,
+            "document_title": extracted.get("title", "Untitled"),
+            "document_type": doc_type.value,
+            "text_length": len(extracted.get("full_text", "")),
+        }
+        rules = asyncio.ensure_future(self._acheck_rules(extracted, doc_type))
+        async for event in self._aanalyze_stages(url, doc_type, extracted, revision, rules):
+            yield event
+
+    async def analyze_url_multi(
+        self,
+        url: str,
+        providers: list[LLMProvider],
+        doc_type: Optional[DocumentType] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[tuple[str, Union[AnalysisResult, Exception]]]:
+        """Analyze a Google Doc or Slides URL with several LLM providers.
+
+        The document is fetched, extracted and rule-checked once; only the
+        LLM stages run per provider, all providers concurrently. Results are
+        yielded as each provider finishes, so a slow provider does not hold
+        back the others. A provider that fails yields its exception instead
+        of a result; extraction errors are raised.
+
+        Args:
+            url: Google Docs/Slides URL
+            providers: LLM providers to compare
+            doc_type: Document type (auto-detected if not provided)
+            timeout: Seconds each provider may take for its LLM stages
+
+        Yields:
+            (provider, AnalysisResult or Exception) in completion order
+        """
+        extractor, doc_type = self._select_extractor(url, doc_type)
+        pending = {}
+        for provider in dict.fromkeys(providers):
+            try:
+                pending[provider] = self._with_provider(provider)
+            except Exception as exc:
+                yield provider, exc
+
+        # Providers that already analyzed this revision need no extraction
+        revision = await asyncio.to_thread(self._revision, extractor, url)
+        for provider, analyzer in list(pending.items()):
+            cached = analyzer._cached_result(revision, doc_type, url)
+            if cached:
+                del pending[provider]
+                yield provider, cached
+        if not pending:
+            return
+
+        extracted = await asyncio.to_thread(self._extract_revision, extractor, url, revision)
+        rules = asyncio.ensure_future(self._acheck_rules(extracted, doc_type))
+
+        async def run(provider: str, analyzer: "QualityAnalyzer"):
+            analysis = analyzer._aanalyze_extracted(url, doc_type, extracted, revision, rules)
+            try:
+                return provider, await asyncio.wait_for(analysis, timeout)
+            except asyncio.TimeoutError:
+                # wait_for cancels the analysis and waits for it, and the
+                # analysis cancels its stages on the way out, so nothing of
+                # this provider's should still be talking to the LLM
+                if analyzer.llm.pending_calls:
+                    logger.warning(
+                        f"{provider} timed out with {analyzer.llm.pending_calls} LLM calls still running"
+                    )
+                return provider, TimeoutError(f"{provider} timed out after {timeout:g}s")
+            except Exception as exc:
+                return provider, exc
+
+        for finished in asyncio.as_completed([run(p, a) for p, a in pending.items()]):
+            yield await finished
+
+    async def analyze_batch(
+        self,
+        urls: list[str],
+        doc_type: Optional[DocumentType] = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[tuple[str, Union[AnalysisResult, Exception]]]:
+        """Analyze many Google Docs/Slides URLs with this analyzer's provider.
+
+        At most `concurrency` documents (default BATCH_CONCURRENCY) are
+        analyzed at once. All documents share the extractors, Google
+        credentials, provider client and caches; each one still reports its
+        own token usage. A document that fails yields its exception without
+        affecting the rest of the batch.
+
+        Yields:
+            (url, AnalysisResult or Exception) in completion order
+        """
+        limit = asyncio.Semaphore(concurrency or get_settings().batch_concurrency)
+
+        async def run(url: str):
+            async with limit:
+                try:
+                    return url, await self._for_document().analyze_url_async(url, doc_type)
+                except Exception as exc:
+                    return url, exc
+
+        for finished in asyncio.as_completed([run(url) for url in dict.fromkeys(urls)]):
+            yield await finished
+
+    def analyze_batch_offline(
+        self,
+        urls: list[str],
+        doc_type: Optional[DocumentType] = None,
+    ) -> list[tuple[str, Union[AnalysisResult, Exception]]]:
+        """Analyze many Google Docs/Slides URLs through the provider's batch API.
+
+        All documents are extracted first (BATCH_CONCURRENCY at a time);
+        then the spelling/grammar and content chunks of every document go
+        to the provider as one batch job, and the results are mapped back
+        to each document when the job finishes. This is much cheaper than
+        synchronous calls but can take hours. Documents served from the
+        revision cache are not submitted, and a document that fails to
+        extract gets its exception without affecting the rest.
+
+        Returns:
+            (url, AnalysisResult or Exception) for each distinct URL, in input order
+        """
+        urls = list(dict.fromkeys(urls))
+
+        def load(url: str):
+            extractor, url_type = self._select_extractor(url, doc_type)
+            return (url_type, *self._load(extractor, url, url_type))
+
+        outcomes: dict[str, Union[AnalysisResult, Exception]] = {}
+        loaded = []
+        requests: list[tuple[str, str]] = []
+        with ThreadPoolExecutor(max_workers=get_settings().batch_concurrency) as pool:
+            futures = {url: pool.submit(load, url) for url in urls}
+            for url, future in futures.items():
+                try:
+                    url_type, cached, extracted, revision = future.result()
+                except Exception as exc:
+                    outcomes[url] = exc
+                    continue
+                if cached:
+                    outcomes[url] = cached
+                    continue
+                chunks = self._document_chunks(extracted)
+                sections = self._match_sections(extracted, url_type)
+                loaded.append((url, url_type, extracted, revision, chunks, sections, len(requests)))
+                requests += [(c.text, self.llm.SPELLING_GRAMMAR_PROMPT) for c in chunks]
+                if self.content_review:
+                    content_prompt = self.llm.content_prompt(sections.undecided)
+                    requests += [(c.text, content_prompt) for c in chunks]
+
+        results = self.llm.analyze_offline(requests) if requests else []
+        for url, url_type, extracted, revision, chunks, sections, offset in loaded:
+            count = len(chunks)
+            sg_result = merge_spelling_grammar(results[offset:offset + count], chunks)
+            content_result = merge_content(results[offset + count:offset + 2 * count], chunks) \
+                if self.content_review else {}
+            rule_matches = self._rule_checker(url_type).check_document(DocumentModel.from_extracted(extracted))
+            result = self._document_result(
+                url, url_type, extracted, rule_matches, sg_result, content_result, sections
+            )
+            if not result.errors:
+                self._remember(revision, url_type, result)
+            outcomes[url] = result
+        return [(url, outcomes[url]) for url in urls]
 
     def analyze_transcript(
         self,
@@ -96,19 +356,354 @@ class QualityAnalyzer:
         Returns:
             AnalysisResult with BANNT score or opportunity/concern analysis
         """
+        started, usage = time.perf_counter(), self.llm.usage
+        chunks = split_text(transcript, self.chunk_chars)
+        analyze = self.llm.analyze_bannt if is_sales_call else self.llm.analyze_client_call
+        with ThreadPoolExecutor(max_workers=self.chunk_parallelism) as pool:
+            futures = [pool.submit(analyze, c.text) for c in chunks]
+            results = [_chunk_result(f) for f in futures]
+        merge = merge_bannt if is_sales_call else merge_client_call
+        result = self._transcript_result(transcript, is_sales_call, title, merge(results, chunks))
+        self._record_cost(result, started, usage)
+        return result
+
+    async def analyze_transcript_async(
+        self,
+        transcript: str,
+        is_sales_call: bool = True,
+        title: str = "Call Transcript"
+    ) -> AnalysisResult:
+        """Async variant of analyze_transcript."""
+        started, usage = time.perf_counter(), self.llm.usage
+        chunks = split_text(transcript, self.chunk_chars)
+        analyze = self.llm.aanalyze_bannt if is_sales_call else self.llm.aanalyze_client_call
+        results = await self._amap_chunks(analyze, chunks, asyncio.Semaphore(self.chunk_parallelism))
+        merge = merge_bannt if is_sales_call else merge_client_call
+        result = self._transcript_result(transcript, is_sales_call, title, merge(results, chunks))
+        self._record_cost(result, started, usage)
+        return result
+
+    async def _aanalyze_extracted(
+        self,
+        url: str,
+        doc_type: DocumentType,
+        extracted: dict,
+        revision: Optional[dict],
+        rules: "asyncio.Future[list[RuleMatch]]",
+    ) -> AnalysisResult:
+        """Run this analyzer's LLM stages on an extracted document and score it.
+
+        The rule checks are passed in as a future so several providers can
+        share one rule pass running alongside their LLM calls.
+        """
+        async for name, value in self._aanalyze_stages(url, doc_type, extracted, revision, rules):
+            if name == "result":
+                return value
+
+    async def _aanalyze_stages(
+        self,
+        url: str,
+        doc_type: DocumentType,
+        extracted: dict,
+        revision: Optional[dict],
+        rules: "asyncio.Future[list[RuleMatch]]",
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Yield the issues of each stage as it completes, then the result."""
+        started, usage = time.perf_counter(), self.llm.usage
+        chunks = self._document_chunks(extracted)
+        plan, sg_chunks = self._spelling_grammar_plan(extracted, chunks)
+        sections = self._match_sections(extracted, doc_type)
+        limit = asyncio.Semaphore(self.chunk_parallelism)
+
+        async def rule_checks():
+            # Other providers may share the rule pass; cancelling this stage
+            # must not cancel it for them
+            return "rules", await asyncio.shield(rules)
+
+        async def spelling_grammar():
+            results = await self._amap_chunks(self.llm.aanalyze_spelling_grammar, sg_chunks, limit)
+            merged = merge_spelling_grammar(results, sg_chunks)
+            return "spelling_grammar", plan.finish(merged) if plan else merged
+
+        async def content():
+            if not self.content_review:
+                return "content", {}
+            analyze = functools.partial(self.llm.aanalyze_content, sections=sections.undecided)
+            results = await self._amap_chunks(analyze, chunks, limit)
+            return "content", merge_content(results, chunks)
+
+        ruleset = self.rulesets.for_type(doc_type)
+        converters = {
+            "rules": self._convert_rule_matches,
+            "spelling_grammar": lambda result: self._convert_sg_issues(result, ruleset),
+            "content": lambda result: self._convert_content_issues(result, sections, ruleset),
+        }
+        # If this analysis is cancelled (a provider timeout, a client
+        # disconnecting from the stream) or a stage fails, stop the stages
+        # still running so their LLM calls do not outlive it
+        tasks = [asyncio.ensure_future(stage()) for stage in (rule_checks, spelling_grammar, content)]
+        stages = {}
+        try:
+            for finished in asyncio.as_completed(tasks):
+                name, value = await finished
+                stages[name] = value
+                yield name, converters[name](value)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        sg_result, content_result = stages["spelling_grammar"], stages["content"]
+        result = self._document_result(
+            url, doc_type, extracted, stages["rules"], sg_result, content_result, sections
+        )
+        self._record_cost(result, started, usage)
+        if not result.errors:
+            self._remember(revision, doc_type, result)
+        yield "result", result
+
+    async def _acheck_rules(self, extracted: dict, doc_type: DocumentType) -> list[RuleMatch]:
+        """Run the CPU-bound rule checks in a worker thread."""
+        checker = self._rule_checker(doc_type)
+        return await asyncio.to_thread(checker.check_document, DocumentModel.from_extracted(extracted))
+
+    def _match_sections(self, extracted: dict, doc_type: DocumentType) -> SectionReport:
+        """Match the document's headings (or slide titles) against the required sections.
+
+        A slide without a title placeholder (titles drawn as text boxes) is
+        represented by its first line.
+        """
+        document = DocumentModel.from_extracted(extracted)
+        if document.blocks and "slides" in extracted:
+            titles: dict[int, list[str]] = {}
+            for block in document.blocks:
+                if block.type == "title":
+                    titles.setdefault(block.slide, []).append(document.text[block.start:block.end])
+            headings = []
+            for slide in extracted["slides"]:
+                if slide["slide_number"] in titles:
+                    headings.extend(titles[slide["slide_number"]])
+                elif slide.get("text"):
+                    headings.append(slide["text"].split("\n", 1)[0])
+        elif document.blocks:
+            headings = document.headings()
+        elif "slides" in extracted:
+            headings = [s["text"].split("\n", 1)[0] for s in extracted["slides"] if s.get("text")]
+        else:
+            headings = [s["text"] for s in extracted.get("sections", [])]
+        matcher = self.rulesets.for_type(doc_type).section_matcher
+        return matcher.match(headings, extracted.get("full_text", ""))
+
+    def _rule_checker(self, doc_type: DocumentType) -> RuleChecker:
+        """The rule checker for a document type's current ruleset."""
+        ruleset = self.rulesets.for_type(doc_type)
+        checker = self._rule_checkers.get(ruleset.name)
+        if checker is None or checker.ruleset is not ruleset:
+            checker = RuleChecker(disabled_rules=self.disabled_rules, ruleset=ruleset)
+            self._rule_checkers[ruleset.name] = checker
+        return checker
+
+    def _with_provider(self, provider: LLMProvider) -> "QualityAnalyzer":
+        """Copy of this analyzer that uses another LLM provider.
+
+        The copy shares the rule checkers, extractors and caches.
+        """
+        other = copy.copy(self)
+        other.llm = LLMAnalyzer(provider=provider, cache=self.llm.cache, clients=self.clients)
+        return other
+
+    def _for_document(self) -> "QualityAnalyzer":
+        """Copy of this analyzer for one of several concurrent analyses.
+
+        The copy shares everything but the LLM usage count, so concurrent
+        documents do not add to each other's token_usage.
+        """
+        other = copy.copy(self)
+        other.llm = self.llm.fork()
+        return other
+
+    def _document_chunks(self, extracted: dict) -> list[Chunk]:
+        """Split extracted text for the LLM, preferring doc headings as cut points."""
+        headings = [section.get("text", "") for section in extracted.get("sections", [])]
+        return split_text(extracted.get("full_text", ""), self.chunk_chars, headings)
+
+    def _spelling_grammar_plan(
+        self, extracted: dict, chunks: list[Chunk]
+    ) -> tuple[Optional[IncrementalPlan], list[Chunk]]:
+        """Decide which text the spelling/grammar stage sends to the LLM.
+
+        In incremental mode only units changed since the last run are sent;
+        otherwise the regular document chunks are.
+        """
+        if not self.incremental:
+            return None, chunks
+        headings = [section.get("text", "") for section in extracted.get("sections", [])]
+        units = split_units(extracted.get("full_text", ""), headings)
+        plan = IncrementalPlan(
+            self.llm.cache, self.llm.provider.name, self.llm.SPELLING_GRAMMAR_PROMPT, units
+        )
+        changed_text = plan.changed_text
+        return plan, split_text(changed_text, self.chunk_chars) if changed_text else []
+
+    async def _amap_chunks(self, analyze, chunks: list[Chunk], limit: asyncio.Semaphore) -> list[dict]:
+        """Run an async LLM analysis over every chunk, at most `limit` at a time."""
+        async def run(chunk: Chunk) -> dict:
+            async with limit:
+                try:
+                    return await analyze(chunk.text)
+                except Exception as exc:
+                    return _chunk_error(exc)
+
+        return await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+    def _select_extractor(self, url: str, doc_type: Optional[DocumentType]):
+        """Pick the extractor for a URL and detect the document type."""
+        if "/presentation/" in url:
+            return self.slides_extractor, doc_type or self._infer_slides_type(url)
+        if "/document/" in url:
+            return self.docs_extractor, doc_type or DocumentType.PROPOSAL
+        raise ValueError(f"Unsupported URL format: {url}")
+
+    def _load(
+        self, extractor, url: str, doc_type: DocumentType
+    ) -> tuple[Optional[AnalysisResult], Optional[dict], Optional[dict]]:
+        """Authenticate and extract text (blocking Google API calls).
+
+        With the revision cache enabled, the file's Drive revision is looked
+        up first: an unchanged revision returns the stored AnalysisResult
+        without fetching the document, and a revision analyzed with other
+        settings reuses the stored extraction.
+
+        Returns:
+            (cached result or None, extracted document, revision info or None)
+        """
+        revision = self._revision(extractor, url)
+        cached = self._cached_result(revision, doc_type, url)
+        if cached:
+            return cached, None, revision
+        return None, self._extract_revision(extractor, url, revision), revision
+
+    def _revision(self, extractor, url: str) -> Optional[dict]:
+        """Authenticate and look up the file's Drive revision, if the cache is on."""
+        extractor.authenticate()
+        return extractor.get_revision(url) if self.revisions else None
+
+    def _cached_result(
+        self, revision: Optional[dict], doc_type: DocumentType, url: str
+    ) -> Optional[AnalysisResult]:
+        """The stored result for this revision and analyzer settings, if any."""
+        if revision is None:
+            return None
+        cached = self.revisions.get_result(
+            revision["file_id"], revision["revision"], self._result_variant(doc_type)
+        )
+        if cached is None:
+            return None
+        return cached.model_copy(update={
+            "document_url": url, "cache_hits": ["revision"], "token_usage": {}, "llm_seconds": None, "fetch": {},
+        })
+
+    def _extract_revision(self, extractor, url: str, revision: Optional[dict]) -> dict:
+        """Extract the document, reusing the stored extraction of this revision."""
+        if revision is None:
+            return extractor.extract_text(url)
+        extracted = self.revisions.get_extraction(revision["file_id"], revision["revision"])
+        if extracted is None:
+            extracted = extractor.extract_text(url)
+            self.revisions.set_extraction(revision["file_id"], revision["revision"], extracted)
+        else:
+            # Nothing was fetched this time
+            extracted.pop("fetch", None)
+        return extracted
+
+    def _remember(
+        self,
+        revision: Optional[dict],
+        doc_type: DocumentType,
+        result: AnalysisResult,
+    ) -> None:
+        """Store a complete document result for its revision.
+
+        Callers only remember results without errors; a stage that failed,
+        even for one chunk, would otherwise be served for the revision
+        until the file changes.
+        """
+        if revision is None or result.errors:
+            return
+        self.revisions.set_result(
+            revision["file_id"], revision["revision"], self._result_variant(doc_type), result
+        )
+
+    def _result_variant(self, doc_type: DocumentType) -> str:
+        """Identify the settings a stored result depends on."""
+        prompts = self.llm.SPELLING_GRAMMAR_PROMPT + self.llm.CONTENT_PROMPT
+        prompt_hash = hashlib.sha256(prompts.encode("utf-8")).hexdigest()[:16]
+        rules = ",".join(sorted(self.disabled_rules))
+        ruleset = self.rulesets.for_type(doc_type)
+        review = "llm" if self.content_review else "local"
+        return f"{self.llm.provider.name}:{doc_type.value}:{prompt_hash}:{rules}:{ruleset.fingerprint}:{review}"
+
+    def _document_result(
+        self,
+        url: str,
+        doc_type: DocumentType,
+        extracted: dict,
+        rule_matches: list[RuleMatch],
+        sg_result: dict,
+        content_result: dict,
+        sections: Optional[SectionReport] = None,
+    ) -> AnalysisResult:
+        """Merge rule and LLM results for a document into an AnalysisResult."""
+        text = extracted.get("full_text", "")
+        ruleset = self.rulesets.for_type(doc_type)
+
+        # Rule issues first, then spelling/grammar, then content
+        issues = []
+        issues.extend(self._convert_rule_matches(rule_matches))
+        issues.extend(self._convert_sg_issues(sg_result, ruleset))
+        issues.extend(self._convert_content_issues(content_result, sections, ruleset))
+
+        # Calculate score
+        score = self._calculate_score(issues, sg_result, content_result, ruleset)
+
+        return AnalysisResult(
+            document_url=url,
+            document_title=extracted.get("title", "Untitled"),
+            document_type=doc_type,
+            analyzed_at=datetime.utcnow(),
+            llm_provider=self.llm.provider_name,
+            score=score,
+            issues=issues,
+            text_length=len(text),
+            cache_hits=self._cache_hits(spelling_grammar=sg_result, content=content_result),
+            units=sg_result.get("units"),
+            fetch=extracted.get("fetch", {}),
+            errors=self._stage_errors(spelling_grammar=sg_result, content=content_result),
+        )
+
+    def _transcript_result(
+        self,
+        transcript: str,
+        is_sales_call: bool,
+        title: str,
+        result: dict,
+    ) -> AnalysisResult:
+        """Convert a BANNT or client call analysis into an AnalysisResult."""
         doc_type = DocumentType.TRANSCRIPT_SALES if is_sales_call else DocumentType.TRANSCRIPT_CLIENT
         issues = []
         bannt_score = None
 
         if is_sales_call:
             # BANNT analysis
-            result = self.llm.analyze_bannt(transcript[:30000])
             bannt_score = self._convert_bannt(result)
             issues.extend(self._bannt_to_issues(result))
+            cache_hits = self._cache_hits(bannt=result)
+            errors = self._stage_errors(bannt=result)
         else:
             # Client call analysis
-            result = self.llm.analyze_client_call(transcript[:30000])
             issues.extend(self._convert_client_call_issues(result))
+            cache_hits = self._cache_hits(client_call=result)
+            errors = self._stage_errors(client_call=result)
 
         return AnalysisResult(
             document_url="transcript",
@@ -119,8 +714,23 @@ class QualityAnalyzer:
             bannt_score=bannt_score,
             issues=issues,
             text_length=len(transcript),
+            cache_hits=cache_hits,
+            errors=errors,
         )
 
+    def _record_cost(self, result: AnalysisResult, started: float, usage: dict) -> None:
+        """Attach the LLM time and tokens spent since `started` to a result."""
+        result.llm_seconds = round(time.perf_counter() - started, 3)
+        result.token_usage = self.llm.usage_since(usage)
+
+    def _cache_hits(self, **stages: dict) -> list[str]:
+        """Names of the LLM stages whose results came from the response cache."""
+        return [name for name, result in stages.items() if result.get("cache_hit")]
+
+    def _stage_errors(self, **stages: dict) -> dict[str, str]:
+        """Errors of the LLM stages that failed, in whole or for some chunks."""
+        return {name: str(result["error"]) for name, result in stages.items() if "error" in result}
+
     def _infer_slides_type(self, url: str) -> DocumentType:
         """Infer document type from slides URL or content."""
         # Simple heuristic based on common patterns
@@ -140,6 +750,7 @@ class QualityAnalyzer:
             "grammar": IssueCategory.GRAMMAR,
             "spacing": IssueCategory.SPACING,
             "formatting": IssueCategory.FORMATTING,
+            "math": IssueCategory.MATH,
         }
         severity_map = {
             "high": IssueSeverity.HIGH,
@@ -159,14 +770,25 @@ class QualityAnalyzer:
                 location=match.location,
                 context=match.context,
                 suggestion=match.suggestion,
+                block_id=match.block_id,
                 affects_score=severity != IssueSeverity.LOW,
             ))
         return issues
 
-    def _convert_sg_issues(self, result: dict) -> list[Issue]:
-        """Convert spelling/grammar results to Issue objects."""
+    def _convert_sg_issues(self, result: dict, ruleset: Optional[Ruleset] = None) -> list[Issue]:
+        """Convert spelling/grammar results to Issue objects.
+
+        With a ruleset, issues of checks it disables and spelling issues for
+        terms in its dictionary are dropped.
+        """
         issues = []
         for item in result.get("issues", []):
+            if ruleset is not None:
+                check = item.get("category", "spelling")
+                if not ruleset.check_enabled(check):
+                    continue
+                if check == "spelling" and ruleset.is_allowed_term(item.get("text", "")):
+                    continue
             category = {
                 "spelling": IssueCategory.SPELLING,
                 "grammar": IssueCategory.GRAMMAR,
@@ -190,12 +812,31 @@ class QualityAnalyzer:
             ))
         return issues
 
-    def _convert_content_issues(self, result: dict) -> list[Issue]:
-        """Convert content analysis results to Issue objects."""
+    def _convert_content_issues(
+        self,
+        result: dict,
+        sections: Optional[SectionReport] = None,
+        ruleset: Optional[Ruleset] = None,
+    ) -> list[Issue]:
+        """Convert content analysis results to Issue objects.
+
+        With a local section report, a section is missing if the matcher
+        ruled it out, or left it undecided and the LLM reported it missing.
+        Without an LLM verdict (content review off, or failed) undecided
+        sections are reported as possibly missing, without affecting the
+        score.
+        """
         issues = []
 
         # Missing sections
-        for section in result.get("required_sections_missing", []):
+        missing = result.get("required_sections_missing", [])
+        unjudged = []
+        if sections is not None and ruleset is not None:
+            resolved = {ruleset.section_matcher.resolve(name) for name in missing}
+            missing = sections.missing + [s for s in sections.undecided if s in resolved]
+            if not result or ("error" in result and not result.get("partial")):
+                unjudged = sections.undecided
+        for section in missing:
             issues.append(Issue(
                 category=IssueCategory.MISSING_CONTENT,
                 severity=IssueSeverity.HIGH,
@@ -204,6 +845,15 @@ class QualityAnalyzer:
                 suggestion=f"Add a section for {section}",
                 affects_score=True,
             ))
+        for section in unjudged:
+            issues.append(Issue(
+                category=IssueCategory.MISSING_CONTENT,
+                severity=IssueSeverity.LOW,
+                title=f"Possibly missing section: {section}",
+                description=f"No heading clearly matches required section '{section}'; check that it is covered",
+                suggestion=f"Give {section} its own heading",
+                affects_score=False,
+            ))
 
         # Other issues from LLM
         for item in result.get("issues", []):
@@ -337,7 +987,8 @@ class QualityAnalyzer:
         self,
         issues: list[Issue],
         sg_result: dict,
-        content_result: dict
+        content_result: dict,
+        ruleset: Optional[Ruleset] = None,
     ) -> ScoreBreakdown:
         """Calculate document score based on issues."""
         # Count issues by category
@@ -351,19 +1002,31 @@ class QualityAnalyzer:
             if i.category == IssueCategory.MISSING_CONTENT
             and i.affects_score
         )
+        math_issues = sum(1 for i in issues if i.category == IssueCategory.MATH and i.affects_score)
 
-        # Scoring logic (deduct points per issue, min 0)
+        # Scoring logic (deduct points per issue, min 0); the ruleset can
+        # change the points per issue
+        scoring = ruleset.scoring if ruleset is not None else {}
         # Spelling/grammar: start at 100, lose 5 per issue
-        sg_score = max(0, 100 - (spelling_grammar_issues * 5))
+        sg_score = max(0, 100 - (spelling_grammar_issues * scoring.get("points_per_spelling_error", 5)))
 
         # Required content: start at 100, lose 15 per missing section
-        content_score = max(0, 100 - (missing_content_issues * 15))
+        content_score = max(0, 100 - (missing_content_issues * scoring.get("points_per_missing_section", 15)))
+
+        # Math: start at 100, lose 10 per wrong total or line item
+        math_score = max(0, 100 - (math_issues * scoring.get("points_per_math_error", 10)))
 
-        # Math: not yet implemented, default to 100
-        math_score = 100
+        # A failed (or partly failed) LLM stage leaves its category scored on
+        # the chunks that succeeded, so it is marked incomplete
+        incomplete = []
+        if "error" in sg_result:
+            incomplete.append("spelling_grammar")
+        if "error" in content_result:
+            incomplete.append("required_content")
 
         return ScoreBreakdown(
             spelling_grammar=sg_score,
             required_content=content_score,
             math_accuracy=math_score,
+            incomplete=incomplete,
         )
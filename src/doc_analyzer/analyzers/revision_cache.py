@@ -0,0 +1,114 @@
+"""Revision-keyed cache of extracted documents and analysis results.
+
+Asking Drive for a file's revision is a tiny metadata call, while
+documents().get / presentations().get return the whole document JSON.
+When the revision has not changed since the last analysis, the extracted
+text and the finished AnalysisResult are served from this cache with no
+Docs/Slides fetch and no LLM calls.
+
+One row is kept per file (and per analysis variant), so a new revision
+simply replaces the previous one and the cache stays bounded by the
+number of documents analyzed.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Optional
+
+from ..config import get_settings
+from ..models import AnalysisResult
+
+
+class RevisionCache:
+    """SQLite-backed extraction and result cache keyed by Drive revision."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS extractions (
+                    file_id TEXT PRIMARY KEY,
+                    revision TEXT NOT NULL,
+                    extracted TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    file_id TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    revision TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (file_id, variant)
+                )"""
+            )
+
+    def get_extraction(self, file_id: str, revision: str) -> Optional[dict]:
+        """Return the extracted document if it was stored for this revision."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT extracted FROM extractions WHERE file_id = ? AND revision = ?",
+                (file_id, revision),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_extraction(self, file_id: str, revision: str, extracted: dict) -> None:
+        """Store the extracted document, replacing any older revision."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO extractions (file_id, revision, extracted, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (file_id, revision, json.dumps(extracted), time.time()),
+            )
+
+    def get_result(self, file_id: str, revision: str, variant: str) -> Optional[AnalysisResult]:
+        """Return the analysis of this revision, if one was stored for the variant."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result FROM results WHERE file_id = ? AND variant = ? AND revision = ?",
+                (file_id, variant, revision),
+            ).fetchone()
+        return AnalysisResult.model_validate_json(row[0]) if row else None
+
+    def set_result(self, file_id: str, revision: str, variant: str, result: AnalysisResult) -> None:
+        """Store the analysis of a revision, replacing any older one."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (file_id, variant, revision, result, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (file_id, variant, revision, result.model_dump_json(), time.time()),
+            )
+
+    def clear(self) -> None:
+        """Remove every cached extraction and result."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM extractions")
+            conn.execute("DELETE FROM results")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation; this keeps the cache thread-safe."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+@lru_cache
+def get_revision_cache() -> Optional[RevisionCache]:
+    """Get the shared revision cache, or None if it is disabled."""
+    settings = get_settings()
+    if not settings.revision_cache_enabled:
+        return None
+    return RevisionCache(path=settings.revision_cache_path)
@@ -5,8 +5,55 @@ Each rule has a unique ID for easy filtering/disabling of false positives.
 """
 
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Optional
+
+from ..document import DocumentModel
+from .table_math import (
+    CELL_SEPARATOR, MathError, Table, column_total_errors, parse_tables, row_total_errors, stated_total_errors
+)
+
+if TYPE_CHECKING:
+    from ..rulesets import Ruleset
+
+
+# Regex rules are compiled once at import time and shared by every checker.
+_PATTERNS = {
+    "double-spaces": re.compile(r' {2,}'),
+    "repeated-words": re.compile(r'\b(\w+)\s+\1\b', re.IGNORECASE),
+    "missing-space-after-punct": re.compile(r'([.,;:!?])([A-Za-z])'),
+    "space-before-punct": re.compile(r'(\w)\s+([.,;:!?])'),
+    "multiple-blank-lines": re.compile(r'\n{3,}'),
+    "double-hyphen-emdash": re.compile(r'(\w)\s*--\s*(\w)'),
+}
+
+# Literal substring every match of a rule must contain. A substring test is
+# much cheaper than a regex scan, so rules whose trigger is absent are skipped.
+_TRIGGERS = {
+    "double-spaces": "  ",
+    "multiple-blank-lines": "\n\n\n",
+    "double-hyphen-emdash": "--",
+    "table-column-totals": CELL_SEPARATOR,
+    "table-row-totals": CELL_SEPARATOR,
+    "budget-total-mismatch": CELL_SEPARATOR,
+}
+
+# Ruleset check ("checks" in rulesets/*.json) that switches each rule off;
+# rules of a category the ruleset does not mention always run
+_RULE_CHECKS = {
+    "double-spaces": "spacing",
+    "repeated-words": "grammar",
+    "missing-space-after-punct": "spacing",
+    "space-before-punct": "spacing",
+    "table-column-totals": "math_in_tables",
+    "table-row-totals": "math_in_tables",
+    "budget-total-mismatch": "budget_totals",
+}
+
+# Slide separators written by GoogleSlidesExtractor, e.g. "--- Slide 5 ---"
+_SLIDE_MARKER = re.compile(r'^--- Slide (\d+) ---$', re.MULTILINE)
 
 
 @dataclass
@@ -14,12 +61,77 @@ class RuleMatch:
     """A match from a deterministic rule check."""
     rule_id: str           # Unique ID for filtering, e.g., "double-spaces"
     rule_name: str         # Human-readable name
-    category: str          # spelling, grammar, spacing, formatting
+    category: str          # spelling, grammar, spacing, formatting, math
     severity: str          # high, medium, low
     text: str              # The problematic text
     suggestion: str        # Suggested fix
     location: str          # Where in the document
     context: str           # Surrounding text for clarity
+    block_id: Optional[str] = None   # Docs paragraph / Slides element ID, when the text has blocks
+    offset: Optional[int] = None     # Character offset of the match (positional rules only)
+
+
+class LineIndex:
+    """Per-document offset index shared by every rule.
+
+    Newline offsets (and slide marker offsets for Slides text) are collected
+    once, so mapping a match position to a line or slide is a bisect instead
+    of a rescan of the document prefix. With a document model, positions
+    resolve to its blocks (slide element or paragraph) instead.
+    """
+
+    def __init__(self, text: str, document: Optional[DocumentModel] = None):
+        self.text = text
+        self.document = document if document is not None and document.blocks else None
+        self.length = len(text)
+        self.newlines = [m.start() for m in re.finditer('\n', text)]
+        self.slide_starts = []
+        self.slide_numbers = []
+        for m in _SLIDE_MARKER.finditer(text):
+            self.slide_starts.append(m.start())
+            self.slide_numbers.append(int(m.group(1)))
+
+    def line_number(self, position: int) -> int:
+        """Get line number (1-indexed) for a character position."""
+        return bisect_left(self.newlines, position) + 1
+
+    def slide_number(self, position: int) -> Optional[int]:
+        """Get the slide number containing a position, if the text has slides."""
+        i = bisect_right(self.slide_starts, position) - 1
+        return self.slide_numbers[i] if i >= 0 else None
+
+    def location(self, position: int) -> str:
+        """Human-readable location: "Slide 3, line 2" for Slides, else "Line 12".
+
+        Slide line numbers count from the line after the slide marker.
+        """
+        i = bisect_right(self.slide_starts, position) - 1
+        line = self.line_number(position)
+        if i < 0:
+            return f"Line {line}"
+        return f"Slide {self.slide_numbers[i]}, line {line - self.line_number(self.slide_starts[i])}"
+
+    def where(self, position: int) -> dict:
+        """Location fields of a RuleMatch at `position`."""
+        if self.document is not None:
+            i = self.document.block_at(position)
+            if i is not None:
+                block_id = self.document.blocks[i].id
+                return {"location": self.document.location(position), "block_id": block_id, "offset": position}
+        return {"location": self.location(position), "block_id": None, "offset": position}
+
+    @cached_property
+    def tables(self) -> list[Table]:
+        """Tables in the text, parsed on first use and shared by the math rules."""
+        return parse_tables(self.text)
+
+    def context(self, start: int, end: int, context_chars: int = 30) -> str:
+        """Get surrounding context for a match."""
+        ctx_start = max(0, start - context_chars)
+        ctx_end = min(self.length, end + context_chars)
+        prefix = "..." if ctx_start > 0 else ""
+        suffix = "..." if ctx_end < self.length else ""
+        return f"{prefix}{self.text[ctx_start:ctx_end]}{suffix}"
 
 
 class RuleChecker:
@@ -29,64 +141,79 @@ class RuleChecker:
     easily identified and rules can be selectively disabled.
     """
 
-    def __init__(self, disabled_rules: Optional[list[str]] = None):
-        """Initialize with optional list of disabled rule IDs."""
-        self.disabled_rules = set(disabled_rules or [])
-
-    def check_all(self, text: str) -> list[RuleMatch]:
-        """Run all enabled checks and return matches."""
-        matches = []
-
+    # Every rule in reporting order. check_all() output is grouped by rule in
+    # this order, then by position within each rule.
+    RULES = [
         # High value checks
-        if "double-spaces" not in self.disabled_rules:
-            matches.extend(self._check_double_spaces(text))
-        if "repeated-words" not in self.disabled_rules:
-            matches.extend(self._check_repeated_words(text))
-        if "missing-space-after-punct" not in self.disabled_rules:
-            matches.extend(self._check_missing_space_after_punct(text))
-        if "space-before-punct" not in self.disabled_rules:
-            matches.extend(self._check_space_before_punct(text))
-        if "unclosed-brackets" not in self.disabled_rules:
-            matches.extend(self._check_unclosed_brackets(text))
-        if "trailing-whitespace" not in self.disabled_rules:
-            matches.extend(self._check_trailing_whitespace(text))
-
+        ("double-spaces", "_check_double_spaces"),
+        ("repeated-words", "_check_repeated_words"),
+        ("missing-space-after-punct", "_check_missing_space_after_punct"),
+        ("space-before-punct", "_check_space_before_punct"),
+        ("unclosed-brackets", "_check_unclosed_brackets"),
+        ("trailing-whitespace", "_check_trailing_whitespace"),
         # Medium value checks
-        if "multiple-blank-lines" not in self.disabled_rules:
-            matches.extend(self._check_multiple_blank_lines(text))
-        if "inconsistent-quotes" not in self.disabled_rules:
-            matches.extend(self._check_inconsistent_quotes(text))
-        if "tab-characters" not in self.disabled_rules:
-            matches.extend(self._check_tab_characters(text))
-        if "double-hyphen-emdash" not in self.disabled_rules:
-            matches.extend(self._check_double_hyphen_emdash(text))
-
+        ("multiple-blank-lines", "_check_multiple_blank_lines"),
+        ("inconsistent-quotes", "_check_inconsistent_quotes"),
+        ("tab-characters", "_check_tab_characters"),
+        ("double-hyphen-emdash", "_check_double_hyphen_emdash"),
         # Lower priority checks
-        if "hidden-characters" not in self.disabled_rules:
-            matches.extend(self._check_hidden_characters(text))
-        if "straight-vs-curly-quotes" not in self.disabled_rules:
-            matches.extend(self._check_straight_vs_curly_quotes(text))
+        ("hidden-characters", "_check_hidden_characters"),
+        ("straight-vs-curly-quotes", "_check_straight_vs_curly_quotes"),
+        # Arithmetic in tables and budget totals
+        ("table-column-totals", "_check_table_column_totals"),
+        ("table-row-totals", "_check_table_row_totals"),
+        ("budget-total-mismatch", "_check_budget_total_mismatch"),
+    ]
+
+    def __init__(self, disabled_rules: Optional[list[str]] = None, ruleset: Optional["Ruleset"] = None):
+        """Initialize with optional list of disabled rule IDs.
+
+        A ruleset adds its own disabled rules and turns off the rules whose
+        check it disables (e.g. "spacing": false).
+        """
+        self.ruleset = ruleset
+        self.disabled_rules = set(disabled_rules or [])
+        if ruleset is not None:
+            self.disabled_rules |= ruleset.disabled_rules
+            self.disabled_rules |= {
+                rule_id for rule_id, check in _RULE_CHECKS.items() if not ruleset.check_enabled(check)
+            }
+        # Resolve the enabled checks once so check_all() does no per-call lookups
+        self._checks = [
+            (rule_id, getattr(self, method))
+            for rule_id, method in self.RULES
+            if rule_id not in self.disabled_rules
+        ]
 
-        return matches
+    def check_all(self, text: str) -> list[RuleMatch]:
+        """Run all enabled checks on plain text and return matches."""
+        return self.check_document(DocumentModel(text))
 
-    def _get_line_number(self, text: str, position: int) -> int:
-        """Get line number (1-indexed) for a character position."""
-        return text[:position].count('\n') + 1
+    def check_document(self, document: DocumentModel) -> list[RuleMatch]:
+        """Run all enabled checks on an extracted document and return matches.
 
-    def _get_context(self, text: str, start: int, end: int, context_chars: int = 30) -> str:
-        """Get surrounding context for a match."""
-        ctx_start = max(0, start - context_chars)
-        ctx_end = min(len(text), end + context_chars)
-        prefix = "..." if ctx_start > 0 else ""
-        suffix = "..." if ctx_end < len(text) else ""
-        return f"{prefix}{text[ctx_start:ctx_end]}{suffix}"
+        Matches are located by block; those only in the layout between
+        blocks (slide markers, separators) are dropped.
+        """
+        text = document.text
+        matches = []
+        index = LineIndex(text, document)
+        for rule_id, check in self._checks:
+            # Skip the full regex scan when the rule cannot possibly match
+            trigger = _TRIGGERS.get(rule_id)
+            if trigger is not None and trigger not in text:
+                continue
+            matches.extend(check(text, index))
+        if index.document is not None:
+            matches = [m for m in matches if m.offset is None or m.block_id is not None]
+        return matches
 
     # === HIGH VALUE CHECKS ===
 
-    def _check_double_spaces(self, text: str) -> list[RuleMatch]:
+    def _check_double_spaces(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find double (or more) consecutive spaces."""
         matches = []
-        for m in re.finditer(r' {2,}', text):
+        for m in _PATTERNS["double-spaces"].finditer(text):
             # Skip if it's at a line boundary (indentation)
             if m.start() == 0 or text[m.start()-1] == '\n':
                 continue
@@ -97,16 +224,16 @@ class RuleChecker:
                 severity="medium",
                 text=repr(m.group()),
                 suggestion="Replace with single space",
-                location=f"Line {self._get_line_number(text, m.start())}, position {m.start()}",
-                context=self._get_context(text, m.start(), m.end()),
+                **index.where(m.start()),
+                context=index.context(m.start(), m.end()),
             ))
         return matches
 
-    def _check_repeated_words(self, text: str) -> list[RuleMatch]:
+    def _check_repeated_words(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find repeated consecutive words like 'the the'."""
         matches = []
         # Case-insensitive match for repeated words
-        for m in re.finditer(r'\b(\w+)\s+\1\b', text, re.IGNORECASE):
+        for m in _PATTERNS["repeated-words"].finditer(text):
             # Skip common intentional repetitions
             word = m.group(1).lower()
             if word in {'that', 'had', 'very', 'really', 'blah'}:
@@ -118,16 +245,16 @@ class RuleChecker:
                 severity="high",
                 text=m.group(),
                 suggestion=f"Remove duplicate '{m.group(1)}'",
-                location=f"Line {self._get_line_number(text, m.start())}",
-                context=self._get_context(text, m.start(), m.end()),
+                **index.where(m.start()),
+                context=index.context(m.start(), m.end()),
             ))
         return matches
 
-    def _check_missing_space_after_punct(self, text: str) -> list[RuleMatch]:
+    def _check_missing_space_after_punct(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find missing space after punctuation like 'Hello,world'."""
         matches = []
         # Match punctuation followed immediately by a letter (not in URLs, numbers, etc.)
-        for m in re.finditer(r'([.,;:!?])([A-Za-z])', text):
+        for m in _PATTERNS["missing-space-after-punct"].finditer(text):
             # Skip if it looks like a URL, file extension, or abbreviation
             before = text[max(0, m.start()-10):m.start()]
             if any(x in before.lower() for x in ['http', 'www.', 'ftp', '.com', '.org']):
@@ -142,15 +269,15 @@ class RuleChecker:
                 severity="medium",
                 text=m.group(),
                 suggestion=f"{m.group(1)} {m.group(2)}",
-                location=f"Line {self._get_line_number(text, m.start())}",
-                context=self._get_context(text, m.start(), m.end()),
+                **index.where(m.start()),
+                context=index.context(m.start(), m.end()),
             ))
         return matches
 
-    def _check_space_before_punct(self, text: str) -> list[RuleMatch]:
+    def _check_space_before_punct(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find space before punctuation like 'Hello ,'."""
         matches = []
-        for m in re.finditer(r'(\w)\s+([.,;:!?])', text):
+        for m in _PATTERNS["space-before-punct"].finditer(text):
             matches.append(RuleMatch(
                 rule_id="space-before-punct",
                 rule_name="Space Before Punctuation",
@@ -158,12 +285,12 @@ class RuleChecker:
                 severity="medium",
                 text=m.group(),
                 suggestion=f"{m.group(1)}{m.group(2)}",
-                location=f"Line {self._get_line_number(text, m.start())}",
-                context=self._get_context(text, m.start(), m.end()),
+                **index.where(m.start()),
+                context=index.context(m.start(), m.end()),
             ))
         return matches
 
-    def _check_unclosed_brackets(self, text: str) -> list[RuleMatch]:
+    def _check_unclosed_brackets(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Check for mismatched brackets and parentheses."""
         matches = []
         pairs = [('(', ')'), ('[', ']'), ('{', '}')]
@@ -198,7 +325,7 @@ class RuleChecker:
                     ))
         return matches
 
-    def _check_trailing_whitespace(self, text: str) -> list[RuleMatch]:
+    def _check_trailing_whitespace(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find lines ending with whitespace."""
         matches = []
         lines = text.split('\n')
@@ -224,10 +351,10 @@ class RuleChecker:
 
     # === MEDIUM VALUE CHECKS ===
 
-    def _check_multiple_blank_lines(self, text: str) -> list[RuleMatch]:
+    def _check_multiple_blank_lines(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find excessive blank lines (3+ consecutive)."""
         matches = []
-        for m in re.finditer(r'\n{3,}', text):
+        for m in _PATTERNS["multiple-blank-lines"].finditer(text):
             num_blanks = len(m.group()) - 1
             matches.append(RuleMatch(
                 rule_id="multiple-blank-lines",
@@ -236,12 +363,12 @@ class RuleChecker:
                 severity="low",
                 text=f"{num_blanks} consecutive blank lines",
                 suggestion="Reduce to single blank line",
-                location=f"Line {self._get_line_number(text, m.start())}",
+                **index.where(m.start()),
                 context="Excessive vertical spacing",
             ))
         return matches
 
-    def _check_inconsistent_quotes(self, text: str) -> list[RuleMatch]:
+    def _check_inconsistent_quotes(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Check for mix of straight and curly quotes."""
         matches = []
         straight_double = text.count('"')
@@ -276,7 +403,7 @@ class RuleChecker:
                 ))
         return matches
 
-    def _check_tab_characters(self, text: str) -> list[RuleMatch]:
+    def _check_tab_characters(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find tab characters (often from copy-paste)."""
         matches = []
         tab_count = text.count('\t')
@@ -294,10 +421,10 @@ class RuleChecker:
             ))
         return matches
 
-    def _check_double_hyphen_emdash(self, text: str) -> list[RuleMatch]:
+    def _check_double_hyphen_emdash(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find -- that should probably be em-dash (—)."""
         matches = []
-        for m in re.finditer(r'(\w)\s*--\s*(\w)', text):
+        for m in _PATTERNS["double-hyphen-emdash"].finditer(text):
             matches.append(RuleMatch(
                 rule_id="double-hyphen-emdash",
                 rule_name="Double Hyphen Instead of Em-Dash",
@@ -305,14 +432,14 @@ class RuleChecker:
                 severity="low",
                 text=m.group(),
                 suggestion=f"{m.group(1)}—{m.group(2)}",
-                location=f"Line {self._get_line_number(text, m.start())}",
-                context=self._get_context(text, m.start(), m.end()),
+                **index.where(m.start()),
+                context=index.context(m.start(), m.end()),
             ))
         return matches
 
     # === LOWER PRIORITY CHECKS ===
 
-    def _check_hidden_characters(self, text: str) -> list[RuleMatch]:
+    def _check_hidden_characters(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Find zero-width and other hidden characters."""
         matches = []
         hidden_chars = {
@@ -344,7 +471,7 @@ class RuleChecker:
             ))
         return matches
 
-    def _check_straight_vs_curly_quotes(self, text: str) -> list[RuleMatch]:
+    def _check_straight_vs_curly_quotes(self, text: str, index: LineIndex) -> list[RuleMatch]:
         """Flag if document uses only straight quotes (might want curly for publishing)."""
         matches = []
         straight_quotes = text.count('"') + text.count("'")
@@ -364,6 +491,59 @@ class RuleChecker:
             ))
         return matches
 
+    # === ARITHMETIC CHECKS ===
+
+    def _check_table_column_totals(self, text: str, index: LineIndex) -> list[RuleMatch]:
+        """Find total and subtotal rows that do not add up."""
+        return [
+            self._math_match(error, index, "table-column-totals", "Incorrect Table Total")
+            for table in index.tables for error in column_total_errors(table)
+        ]
+
+    def _check_table_row_totals(self, text: str, index: LineIndex) -> list[RuleMatch]:
+        """Find line items whose amount is not hours (or units) x rate."""
+        return [
+            self._math_match(error, index, "table-row-totals", "Incorrect Line Item Amount")
+            for table in index.tables for error in row_total_errors(table)
+        ]
+
+    def _check_budget_total_mismatch(self, text: str, index: LineIndex) -> list[RuleMatch]:
+        """Find budget totals in the text that match no table total."""
+        matches = []
+        for offset, stated, grand in stated_total_errors(text, index.tables):
+            written = stated.format(stated.amount)
+            matches.append(RuleMatch(
+                rule_id="budget-total-mismatch",
+                rule_name="Budget Total Mismatch",
+                category="math",
+                severity="medium",
+                text=f"Stated total {written} does not match any table total",
+                suggestion=f"Check the total; the budget table totals {grand.format(grand.amount)}",
+                **index.where(offset),
+                context=index.context(offset, offset + len(written)),
+            ))
+        return matches
+
+    def _math_match(self, error: MathError, index: LineIndex, rule_id: str, rule_name: str) -> RuleMatch:
+        """Report a wrong number in a table, with the recomputed value."""
+        stated = error.stated.format(error.stated.amount)
+        expected = error.stated.format(error.expected)
+        row_text = CELL_SEPARATOR.join(error.row.cells)
+        where = index.where(error.row.offset)
+        if where["block_id"] is None:
+            where["location"] += f" (table {error.table.number})"
+        return RuleMatch(
+            rule_id=rule_id,
+            rule_name=rule_name,
+            category="math",
+            severity="high",
+            text=f"{error.row.label or 'Row'} / {error.table.column_name(error.column)}: "
+                 f"{stated}, but {error.detail} gives {expected}",
+            suggestion=f"Change {stated} to {expected}",
+            **where,
+            context=row_text,
+        )
+
 
 def rule_match_to_dict(match: RuleMatch) -> dict:
     """Convert RuleMatch to dict for JSON serialization."""
@@ -376,5 +556,6 @@ def rule_match_to_dict(match: RuleMatch) -> dict:
         "suggestion": match.suggestion,
         "location": match.location,
         "context": match.context,
+        "block_id": match.block_id,
         "source": "rule",  # Distinguish from LLM-detected issues
     }
@@ -0,0 +1,294 @@
+"""Deterministic arithmetic checks for tables and budget totals.
+
+Both extractors write each table row as one line of cells separated by
+" | " (Docs tables and Slides table cells alike), so tables are parsed back
+out of the document text. Cells are read as currency amounts, percentages,
+hours or plain numbers with Decimal, so recomputed totals are exact. A
+stated value only counts as wrong when it differs from the recomputed one
+by more than its own rounding ("$45k" is accurate to the thousand).
+"""
+
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+CELL_SEPARATOR = " | "
+
+_VALUE = re.compile(
+    r"^(?P<open>\()?\s*(?P<sign>[-−])?\s*(?P<currency>[$€£])?\s*(?P<sign2>[-−])?\s*"
+    r"(?P<number>\d[\d,]*(?:\.\d+)?|\.\d+)\s*(?P<multiplier>[kKmM]\b)?\s*"
+    r"(?P<unit>%|hrs?\b|hours?\b|h\b)?\s*(?P<per_hour>(?:/\s*(?:hr|hour|h)|per\s+hour)\b)?\s*"
+    r"(?:USD|EUR|GBP)?\s*(?P<close>\))?$",
+    re.IGNORECASE,
+)
+_MULTIPLIERS = {"k": Decimal(1000), "m": Decimal(1000000)}
+
+_TOTAL_LABEL = re.compile(r"\b(?:sub-?)?totals?\b|\bsum\b", re.IGNORECASE)
+_SUBTOTAL_LABEL = re.compile(r"\bsub-?totals?\b", re.IGNORECASE)
+
+# Column headers of the hours x rate = amount pattern; rate columns are never summed
+_QUANTITY_HEADER = re.compile(r"\b(?:hours?|hrs|qty|quantity|units|days)\b", re.IGNORECASE)
+_RATE_HEADER = re.compile(r"\brate\b|\bper\b|/\s*(?:hr|hour|day|unit)\b|\bunit (?:price|cost)\b", re.IGNORECASE)
+_AMOUNT_HEADER = re.compile(r"\b(?:amount|total|cost|fee|fees|subtotal|extended|price)\b", re.IGNORECASE)
+
+# A total stated in prose: "Total investment: $45,000", "a total of $45k"
+_STATED_TOTAL = re.compile(
+    r"\btotal\b[^\n|$€£]{0,60}?(?P<amount>[$€£]\s?\d[\d,]*(?:\.\d+)?(?:\s?[kKmM]\b)?)", re.IGNORECASE
+)
+
+
+@dataclass(frozen=True)
+class Value:
+    """A number read from a table cell or sentence."""
+    amount: Decimal
+    quantum: Decimal       # Precision it was written with, e.g. 0.01 for "$12.50", 1000 for "$45k"
+    kind: str              # currency, percent, hours or number
+    currency: str = ""
+    per_hour: bool = False
+
+    def format(self, amount: Decimal) -> str:
+        """Write `amount` the way this value was written."""
+        places = max(0, -self.quantum.as_tuple().exponent) if self.quantum < 1 else 0
+        number = f"{abs(amount):,.{places}f}"
+        sign = "-" if amount < 0 else ""
+        if self.kind == "percent":
+            return f"{sign}{number}%"
+        return f"{sign}{self.currency}{number}"
+
+
+def parse_value(text: str) -> Optional[Value]:
+    """Parse a cell such as "$1,250.00", "(500)", "15%", "40 hrs" or "$150/hr"."""
+    match = _VALUE.match(text.strip())
+    if match is None or bool(match.group("open")) != bool(match.group("close")):
+        return None
+    number = match.group("number").replace(",", "")
+    try:
+        amount = Decimal(number)
+    except InvalidOperation:
+        return None
+    quantum = Decimal(1).scaleb(amount.as_tuple().exponent)
+    multiplier = match.group("multiplier")
+    if multiplier:
+        amount *= _MULTIPLIERS[multiplier.lower()]
+        quantum *= _MULTIPLIERS[multiplier.lower()]
+    if match.group("open") or match.group("sign") or match.group("sign2"):
+        amount = -amount
+    unit = (match.group("unit") or "").lower()
+    if unit == "%":
+        kind = "percent"
+    elif unit:
+        kind = "hours"
+    elif match.group("currency"):
+        kind = "currency"
+    else:
+        kind = "number"
+    return Value(amount, quantum, kind, match.group("currency") or "", bool(match.group("per_hour")))
+
+
+@dataclass
+class Row:
+    """One table row and where it starts in the document text."""
+    cells: list[str]
+    offset: int
+    values: list[Optional[Value]] = field(init=False)
+    label: str = field(init=False)
+
+    def __post_init__(self):
+        self.values = [parse_value(cell) for cell in self.cells]
+        self.label = next((c for c, v in zip(self.cells, self.values) if v is None and c.strip()), "")
+
+    @property
+    def is_total(self) -> bool:
+        return bool(_TOTAL_LABEL.search(self.label))
+
+    @property
+    def is_subtotal(self) -> bool:
+        return bool(_SUBTOTAL_LABEL.search(self.label))
+
+    def value(self, column: int) -> Optional[Value]:
+        return self.values[column] if column < len(self.values) else None
+
+
+@dataclass
+class Table:
+    """A table found in the document text (1-based `number` in document order)."""
+    number: int
+    rows: list[Row]
+
+    @property
+    def header(self) -> Optional[Row]:
+        """The first row, if it is a header (no numbers in it)."""
+        first = self.rows[0]
+        return first if not any(first.values) and not first.is_total else None
+
+    @property
+    def body(self) -> list[Row]:
+        return self.rows[1:] if self.header else self.rows
+
+    def column_name(self, column: int) -> str:
+        header = self.header
+        if header is not None and column < len(header.cells) and header.cells[column].strip():
+            return header.cells[column].strip()
+        return f"column {column + 1}"
+
+    def find_column(self, pattern: re.Pattern, exclude: tuple[Optional[int], ...] = ()) -> Optional[int]:
+        """Index of the first header cell matching `pattern`."""
+        header = self.header
+        if header is None:
+            return None
+        for i, cell in enumerate(header.cells):
+            if i not in exclude and pattern.search(cell):
+                return i
+        return None
+
+
+@dataclass
+class MathError:
+    """A stated number that does not match the one recomputed from the table."""
+    table: Table
+    row: Row
+    column: int
+    stated: Value
+    expected: Decimal
+    detail: str            # What was recomputed, e.g. "sum of 12 rows"
+
+
+def parse_tables(text: str) -> list[Table]:
+    """Find the tables in document text: runs of two or more " | " rows."""
+    tables: list[Table] = []
+    run: list[Row] = []
+    offset = 0
+    for line in text.split("\n"):
+        if CELL_SEPARATOR in line:
+            # Empty cells leave "a |  | b", so split on the bare bar
+            run.append(Row([cell.strip() for cell in line.split("|")], offset))
+        else:
+            if len(run) >= 2:
+                tables.append(Table(len(tables) + 1, run))
+            run = []
+        offset += len(line) + 1
+    if len(run) >= 2:
+        tables.append(Table(len(tables) + 1, run))
+    return tables
+
+
+def column_total_errors(table: Table) -> list[MathError]:
+    """Total and subtotal rows whose numbers are not the sum of the rows above them.
+
+    A subtotal covers the rows since the previous subtotal or total; a
+    total covers the subtotals and any rows after the last of them (or all
+    rows since the previous total when there are no subtotals).
+    """
+    errors = []
+    rate_column = table.find_column(_RATE_HEADER)
+    width = max(len(row.cells) for row in table.rows)
+    for column in range(width):
+        if column == rate_column:
+            continue
+        segment: list[Value] = []
+        subtotals: list[Value] = []
+        for row in table.body:
+            value = row.value(column)
+            if not row.is_total:
+                if value is not None:
+                    segment.append(value)
+                continue
+            terms = segment if row.is_subtotal else subtotals + segment
+            if value is not None and terms and _comparable(value, terms):
+                expected = sum((t.amount for t in terms), Decimal(0))
+                # Percentages are usually rounded shares, so their rounding adds up
+                slack = sum((t.quantum for t in terms), Decimal(0)) if value.kind == "percent" else Decimal(0)
+                if abs(expected - value.amount) > (value.quantum + slack) / 2:
+                    detail = f"sum of {len(terms)} {'subtotals and rows' if subtotals and not row.is_subtotal else 'rows'}"
+                    errors.append(MathError(table, row, column, value, expected, detail))
+            if row.is_subtotal:
+                subtotals.append(value or Value(sum((t.amount for t in segment), Decimal(0)), Decimal(0), "number"))
+            else:
+                subtotals = []
+            segment = []
+    return errors
+
+
+def row_total_errors(table: Table) -> list[MathError]:
+    """Rows whose amount is not quantity (hours, units) x rate.
+
+    Columns are found by header ("Hours", "Rate", "Amount"), or without a
+    header from explicit units: a cell in hours, a rate "/hr" and the
+    currency amount after it.
+    """
+    errors = []
+    quantity_column = table.find_column(_QUANTITY_HEADER)
+    rate_column = table.find_column(_RATE_HEADER, exclude=(quantity_column,))
+    amount_column = table.find_column(_AMOUNT_HEADER, exclude=(quantity_column, rate_column))
+    for row in table.body:
+        if row.is_total:
+            continue
+        quantity = _pick(row, quantity_column, lambda v: v.kind == "hours")
+        rate = _pick(row, rate_column, lambda v: v.per_hour)
+        if quantity is None or rate is None or quantity[1].kind == "percent":
+            continue
+        amount = _pick(
+            row, amount_column,
+            lambda v: v.kind == "currency" and not v.per_hour,
+            start=rate[0] + 1,
+        )
+        if amount is None or amount[0] in (quantity[0], rate[0]):
+            continue
+        expected = quantity[1].amount * rate[1].amount
+        stated = amount[1]
+        if abs(expected - stated.amount) > stated.quantum / 2:
+            detail = f"{_plain(quantity[1].amount)} x {rate[1].format(rate[1].amount)}"
+            errors.append(MathError(table, row, amount[0], stated, expected, detail))
+    return errors
+
+
+def stated_total_errors(text: str, tables: list[Table]) -> list[tuple[int, Value, Value]]:
+    """Budget totals stated in prose that match no total row of any table.
+
+    Returns (offset in text, stated value, the table's grand total) for each.
+    Nothing is reported when the document has no table with a currency total.
+    """
+    totals = [
+        value
+        for table in tables for row in table.body if row.is_total
+        for value in row.values if value is not None and value.kind == "currency"
+    ]
+    if not totals:
+        return []
+    grand = max(totals, key=lambda v: v.amount)
+    errors = []
+    for match in _STATED_TOTAL.finditer(text):
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        line_end = text.find("\n", match.start())
+        if CELL_SEPARATOR in text[line_start:line_end if line_end >= 0 else len(text)]:
+            continue
+        stated = parse_value(match.group("amount"))
+        if stated is None:
+            continue
+        if all(abs(stated.amount - total.amount) > max(stated.quantum, total.quantum) / 2 for total in totals):
+            errors.append((match.start("amount"), stated, grand))
+    return errors
+
+
+def _comparable(total: Value, terms: list[Value]) -> bool:
+    """Percentages are only summed with percentages."""
+    return all((t.kind == "percent") == (total.kind == "percent") for t in terms)
+
+
+def _pick(row: Row, column: Optional[int], fallback, start: int = 0) -> Optional[tuple[int, Value]]:
+    """The value in `column`, else the first value from `start` passing `fallback`."""
+    if column is not None:
+        value = row.value(column)
+        return (column, value) if value is not None else None
+    for i in range(start, len(row.values)):
+        value = row.values[i]
+        if value is not None and fallback(value):
+            return i, value
+    return None
+
+
+def _plain(amount: Decimal) -> str:
+    """A number without trailing zeros ("40", "7.5")."""
+    text = f"{amount:f}"
+    return text.rstrip("0").rstrip(".") if "." in text else text
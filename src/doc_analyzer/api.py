@@ -1,26 +1,56 @@
 """FastAPI webapp for the Document Quality Analyzer."""
 
+import json
 import logging
+import time
+from contextlib import asynccontextmanager
 from typing import Optional, Literal
 from datetime import datetime
 
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.concurrency import run_in_threadpool
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel, HttpUrl
 
+from .analyzers.client_registry import ClientRegistry
 from .analyzers.quality_analyzer import QualityAnalyzer
+from .config import get_settings
 from .integrations.fathom import FathomClient
 from .integrations.slack import SlackNotifier
+from .jobs import JobHandler, WorkerPool, get_job_store
 from .models import AnalysisResult, DocumentType, Issue
+from .rulesets import get_ruleset_loader
 
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared API clients and job workers at startup; stop them on shutdown."""
+    settings = get_settings()
+    # Resolve and compile every ruleset up front so a broken one fails startup
+    get_ruleset_loader().load_all()
+    app.state.clients = ClientRegistry()
+    app.state.fathom = FathomClient()
+    app.state.jobs = get_job_store()
+    app.state.workers = WorkerPool(
+        app.state.jobs,
+        job_handlers(app.state.clients, app.state.fathom),
+        concurrency=settings.job_workers,
+        poll_interval=settings.job_poll_interval,
+    )
+    app.state.workers.start()
+    yield
+    await app.state.workers.stop()
+    await app.state.clients.aclose()
+    await app.state.fathom.aclose()
+
+
 app = FastAPI(
     title="Document Quality Analyzer",
     version="0.1.0",
     description="Paste a Google Doc/Slides URL to analyze quality, score it, and optionally post to Slack.",
+    lifespan=lifespan,
 )
 
 
@@ -31,6 +61,13 @@ class AnalyzeRequest(BaseModel):
     provider: Literal["openai", "anthropic", "google", "llama-70b", "gemini-flash"] = "openai"
     type: Optional[DocumentType] = None
     slack: bool = False
+    incremental: bool = False
+
+
+class AnalyzeJobRequest(AnalyzeRequest):
+    """Request payload for /api/jobs/analyze."""
+
+    priority: int = 0  # Higher runs first
 
 
 class AnalyzeResponse(BaseModel):
@@ -40,6 +77,24 @@ class AnalyzeResponse(BaseModel):
     slack: Optional[dict] = None
 
 
+class CompareRequest(BaseModel):
+    """Request payload for /api/compare."""
+
+    url: HttpUrl
+    providers: list[Literal["openai", "anthropic", "google", "llama-70b", "gemini-flash"]] = ["openai"]
+    type: Optional[DocumentType] = None
+    slack: bool = False  # Posts the first provider's result
+
+
+class BatchAnalyzeRequest(BaseModel):
+    """Request payload for /api/analyze/batch."""
+
+    urls: list[HttpUrl]
+    provider: Literal["openai", "anthropic", "google", "llama-70b", "gemini-flash"] = "openai"
+    type: Optional[DocumentType] = None
+    concurrency: Optional[int] = None  # Capped at BATCH_CONCURRENCY
+
+
 class AnalyzeFathomRequest(BaseModel):
     """Request payload for /api/analyze-fathom."""
 
@@ -49,6 +104,27 @@ class AnalyzeFathomRequest(BaseModel):
     slack: bool = False
 
 
+class AnalyzeFathomJobRequest(AnalyzeFathomRequest):
+    """Request payload for /api/jobs/analyze-fathom."""
+
+    priority: int = 0  # Higher runs first
+
+
+class JobResponse(BaseModel):
+    """Status of a background job; result holds the analysis once it succeeded."""
+
+    id: str
+    kind: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    priority: int
+    attempts: int
+    max_attempts: int
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
 class AnalyzeFathomResponse(BaseModel):
     """Response payload for /api/analyze-fathom."""
 
@@ -137,6 +213,7 @@ def _serialize_issue(issue: Issue) -> dict:
         "location": issue.location,
         "context": issue.context,
         "suggestion": issue.suggestion,
+        "block_id": issue.block_id,
         "affects_score": issue.affects_score,
     }
 
@@ -156,16 +233,18 @@ def _serialize_result(result: AnalysisResult) -> dict:
         "bannt_score": bannt,
         "issues": [_serialize_issue(i) for i in result.issues],
         "text_length": result.text_length,
+        "cache_hits": result.cache_hits,
+        "units": result.units,
+        "token_usage": result.token_usage,
+        "llm_seconds": result.llm_seconds,
+        "fetch": result.fetch,
+        "errors": result.errors,
     }
 
 
-def _fetch_fathom_transcript(recording_id: str) -> dict:
-    """Fetch a Fathom transcript and return a JSON-serializable dict."""
-    client = FathomClient()
-    # Fathom client is async; run in a sync context via asyncio in threadpool.
-    import asyncio
-
-    transcript = asyncio.run(client.get_transcript(recording_id))
+async def _fetch_fathom_transcript(fathom: FathomClient, recording_id: str) -> tuple[dict, str, str, str]:
+    """Fetch a Fathom transcript; return JSON-serializable metadata, text, title and link."""
+    transcript = await fathom.get_transcript(recording_id)
     return {
         "recording_id": transcript.recording_id,
         "title": transcript.title,
@@ -184,15 +263,23 @@ async def health() -> dict:
     return {"status": "ok"}
 
 
-@app.post("/api/analyze", response_model=AnalyzeResponse)
-async def analyze(request: AnalyzeRequest):
-    """Analyze a Google Doc/Slides URL and optionally post to Slack or add comments."""
-    analyzer = QualityAnalyzer(provider=request.provider)
+@app.get("/api/metrics")
+async def metrics() -> dict:
+    """LLM client pool hits, connection reuse and job queue depth."""
+    return {
+        "llm_clients": app.state.clients.metrics(),
+        "jobs": await run_in_threadpool(app.state.jobs.counts),
+    }
 
-    try:
-        result = await run_in_threadpool(analyzer.analyze_url, str(request.url), request.type)
-    except Exception as exc:  # pragma: no cover - defensive user facing error
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+async def _analyze_document(request: AnalyzeRequest, clients: ClientRegistry) -> dict:
+    """Analyze a document and optionally post it to Slack (shared by endpoint and jobs)."""
+    analyzer = QualityAnalyzer(
+        provider=request.provider,
+        clients=clients,
+        incremental=request.incremental,
+    )
+    result = await analyzer.analyze_url_async(str(request.url), request.type)
 
     slack_result = None
     if request.slack:
@@ -205,25 +292,21 @@ async def analyze(request: AnalyzeRequest):
     }
 
 
-@app.post("/api/analyze-fathom", response_model=AnalyzeFathomResponse)
-async def analyze_fathom(request: AnalyzeFathomRequest):
-    """Fetch a Fathom transcript by recording_id and analyze it."""
-    analyzer = QualityAnalyzer(provider=request.provider)
-
-    try:
-        fathom_meta, transcript_text, title, url = await run_in_threadpool(
-            _fetch_fathom_transcript, request.recording_id
-        )
-        result = await run_in_threadpool(
-            analyzer.analyze_transcript,
-            transcript_text,
-            request.is_sales_call,
-            title,
-        )
-        # Make the result link point to the Fathom recording/share URL when available.
-        result.document_url = url
-    except Exception as exc:  # pragma: no cover - defensive user facing error
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
+async def _analyze_fathom_recording(
+    request: AnalyzeFathomRequest,
+    clients: ClientRegistry,
+    fathom: FathomClient,
+) -> dict:
+    """Fetch and analyze a Fathom transcript (shared by endpoint and jobs)."""
+    analyzer = QualityAnalyzer(provider=request.provider, clients=clients)
+    fathom_meta, transcript_text, title, url = await _fetch_fathom_transcript(fathom, request.recording_id)
+    result = await analyzer.analyze_transcript_async(
+        transcript_text,
+        request.is_sales_call,
+        title,
+    )
+    # Make the result link point to the Fathom recording/share URL when available.
+    result.document_url = url
 
     slack_result = None
     if request.slack:
@@ -237,10 +320,207 @@ async def analyze_fathom(request: AnalyzeFathomRequest):
     }
 
 
+def job_handlers(clients: ClientRegistry, fathom: FathomClient) -> dict[str, JobHandler]:
+    """Background job kinds and the coroutines that run them."""
+    async def analyze_job(payload: dict) -> dict:
+        return await _analyze_document(AnalyzeRequest(**payload), clients)
+
+    async def analyze_fathom_job(payload: dict) -> dict:
+        return await _analyze_fathom_recording(AnalyzeFathomRequest(**payload), clients, fathom)
+
+    async def fathom_notify_job(payload: dict) -> dict:
+        return await run_in_threadpool(_post_fathom_webhook_to_slack, FathomWebhookPayload(**payload))
+
+    async def fathom_webhook_job(payload: dict) -> dict:
+        return await _analyze_fathom_webhook(FathomWebhookPayload(**payload), clients)
+
+    return {
+        "analyze": analyze_job,
+        "analyze_fathom": analyze_fathom_job,
+        "fathom_notify": fathom_notify_job,
+        "fathom_webhook": fathom_webhook_job,
+    }
+
+
+@app.post("/api/analyze", response_model=AnalyzeResponse)
+async def analyze(request: AnalyzeRequest):
+    """Analyze a Google Doc/Slides URL and optionally post to Slack or add comments."""
+    try:
+        return await _analyze_document(request, app.state.clients)
+    except Exception as exc:  # pragma: no cover - defensive user facing error
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@app.post("/api/analyze/stream")
+async def analyze_stream(request: AnalyzeRequest) -> StreamingResponse:
+    """Analyze a Google Doc/Slides URL, streaming each stage as it completes.
+
+    The response is newline-delimited JSON, one {"event": ..., "data": ...}
+    object per line: "metadata" right after extraction, "rules" (rule-check
+    issues), "spelling_grammar" and "content" as each LLM stage finishes,
+    then "result" (the full analysis) and, if requested, "slack".
+    A failure after streaming started is sent as an "error" event.
+    """
+    analyzer = QualityAnalyzer(
+        provider=request.provider,
+        clients=app.state.clients,
+        incremental=request.incremental,
+    )
+    events = analyzer.analyze_url_stream(str(request.url), request.type)
+
+    # Pull the first event before responding so extraction errors become a 400
+    try:
+        first = await anext(events)
+    except Exception as exc:  # pragma: no cover - defensive user facing error
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    def line(event: str, data) -> str:
+        return json.dumps({"event": event, "data": data}) + "\n"
+
+    async def lines():
+        pending = first
+        try:
+            while pending is not None:
+                event, data = pending
+                if event == "result":
+                    yield line(event, _serialize_result(data))
+                    if request.slack:
+                        notifier = SlackNotifier()
+                        yield line("slack", await run_in_threadpool(notifier.post_analysis, data))
+                elif event == "metadata":
+                    yield line(event, data)
+                else:
+                    yield line(event, [_serialize_issue(i) for i in data])
+                pending = await anext(events, None)
+        except Exception as exc:  # pragma: no cover - defensive user facing error
+            logger.exception("Streaming analysis failed")
+            yield line("error", {"detail": str(exc)})
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/analyze/batch")
+async def analyze_batch(request: BatchAnalyzeRequest) -> StreamingResponse:
+    """Analyze many Google Docs/Slides URLs with one provider, streaming results.
+
+    Documents are analyzed concurrently, at most BATCH_CONCURRENCY at a
+    time, and a failing document does not stop the others. The response is
+    newline-delimited JSON with one line per document as it finishes,
+    {"url": ..., "analysis": {...}} or {"url": ..., "error": "..."}, and a
+    final {"summary": {...}} line with counts and docs/minute.
+    """
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="Provide at least one URL")
+    limit = get_settings().batch_concurrency
+    concurrency = max(1, min(request.concurrency or limit, limit))
+    analyzer = QualityAnalyzer(provider=request.provider, clients=app.state.clients)
+    results = analyzer.analyze_batch([str(url) for url in request.urls], request.type, concurrency)
+
+    async def lines():
+        succeeded = failed = 0
+        started = time.perf_counter()
+        async for url, result in results:
+            if isinstance(result, Exception):
+                failed += 1
+                line = {"url": url, "error": str(result) or type(result).__name__}
+            else:
+                succeeded += 1
+                line = {"url": url, "analysis": _serialize_result(result)}
+            yield json.dumps(line) + "\n"
+        elapsed = time.perf_counter() - started
+        yield json.dumps({"summary": {
+            "documents": succeeded + failed,
+            "succeeded": succeeded,
+            "failed": failed,
+            "seconds": round(elapsed, 3),
+            "docs_per_minute": round((succeeded + failed) / (elapsed / 60), 2) if elapsed > 0 else None,
+        }}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/compare")
+async def compare(request: CompareRequest) -> StreamingResponse:
+    """Analyze a Google Doc/Slides URL with several providers, streaming results.
+
+    The document is extracted and rule-checked once for all providers. The
+    response is newline-delimited JSON with one line per provider, written
+    as soon as that provider finishes:
+    {"provider": ..., "analysis": {...}, "slack": ...} or {"provider": ..., "error": "..."}.
+    """
+    if not request.providers:
+        raise HTTPException(status_code=400, detail="Select at least one provider")
+    analyzer = QualityAnalyzer(provider=request.providers[0], clients=app.state.clients)
+    results = analyzer.analyze_url_multi(str(request.url), request.providers, request.type)
+
+    # Pull the first result before responding so extraction errors become a 400
+    try:
+        first = await anext(results)
+    except Exception as exc:  # pragma: no cover - defensive user facing error
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    async def lines():
+        pending = first
+        while pending is not None:
+            provider, result = pending
+            if isinstance(result, Exception):
+                line = {"provider": provider, "error": str(result)}
+            else:
+                line = {"provider": provider, "analysis": _serialize_result(result), "slack": None}
+                if request.slack and provider == request.providers[0]:
+                    notifier = SlackNotifier()
+                    line["slack"] = await run_in_threadpool(notifier.post_analysis, result)
+            yield json.dumps(line) + "\n"
+            pending = await anext(results, None)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/analyze-fathom", response_model=AnalyzeFathomResponse)
+async def analyze_fathom(request: AnalyzeFathomRequest):
+    """Fetch a Fathom transcript by recording_id and analyze it."""
+    try:
+        return await _analyze_fathom_recording(request, app.state.clients, app.state.fathom)
+    except Exception as exc:  # pragma: no cover - defensive user facing error
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+def _enqueue(kind: str, request: BaseModel, priority: int) -> dict:
+    """Store a job and wake the in-process workers."""
+    payload = request.model_dump(mode="json", exclude={"priority"})
+    job = app.state.jobs.enqueue(
+        kind, payload, priority=priority, max_attempts=get_settings().job_max_attempts
+    )
+    app.state.workers.notify()
+    return job.as_dict()
+
+
+@app.post("/api/jobs/analyze", response_model=JobResponse, status_code=202)
+async def enqueue_analyze(request: AnalyzeJobRequest):
+    """Queue a document analysis; poll GET /api/jobs/{id} for the result."""
+    return await run_in_threadpool(_enqueue, "analyze", request, request.priority)
+
+
+@app.post("/api/jobs/analyze-fathom", response_model=JobResponse, status_code=202)
+async def enqueue_analyze_fathom(request: AnalyzeFathomJobRequest):
+    """Queue a Fathom transcript analysis; poll GET /api/jobs/{id} for the result."""
+    return await run_in_threadpool(_enqueue, "analyze_fathom", request, request.priority)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Status of a background job, with its result once it succeeded."""
+    job = await run_in_threadpool(app.state.jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job.as_dict()
+
+
 def _post_fathom_webhook_to_slack(payload: FathomWebhookPayload) -> dict:
     """Post a simple notification about a new Fathom recording to Slack.
 
-    This is the POC version - just posts meeting info, no analysis yet.
+    Posts meeting info only; the transcript analysis is posted separately
+    by the fathom_webhook job.
     """
     notifier = SlackNotifier()
 
@@ -333,19 +613,68 @@ def _post_fathom_webhook_to_slack(payload: FathomWebhookPayload) -> dict:
         return {"success": False, "error": str(e)}
 
 
+async def _analyze_fathom_webhook(payload: FathomWebhookPayload, clients: ClientRegistry) -> dict:
+    """Analyze the transcript a Fathom webhook carried and post it to Slack.
+
+    The webhook payload already includes the transcript, so nothing is
+    fetched from Fathom. External calls are scored as sales calls (BANNT),
+    internal ones as client calls.
+    """
+    transcript_text = payload.get_full_transcript_text()
+    if not transcript_text:
+        logger.info(f"Fathom webhook for recording {payload.recording_id} has no transcript; skipping analysis")
+        return {"recording_id": payload.recording_id, "analysis": None, "slack": None}
+
+    is_sales_call = payload.calendar_invitees_domains_type == "one_or_more_external"
+    analyzer = QualityAnalyzer(provider=get_settings().fathom_webhook_provider, clients=clients)
+    result = await analyzer.analyze_transcript_async(transcript_text, is_sales_call, payload.title)
+    result.document_url = payload.share_url or payload.url or f"fathom:{payload.recording_id}"
+
+    notifier = SlackNotifier()
+    slack_result = await run_in_threadpool(notifier.post_analysis, result)
+    return {
+        "recording_id": payload.recording_id,
+        "analysis": _serialize_result(result),
+        "slack": slack_result,
+    }
+
+
 @app.post("/webhook/fathom")
-async def fathom_webhook(payload: FathomWebhookPayload, background_tasks: BackgroundTasks):
+async def fathom_webhook(payload: FathomWebhookPayload):
     """Receive webhook from Fathom when a new recording is ready.
 
-    Posts meeting info to Slack. Returns 200 immediately to acknowledge receipt,
-    then processes in background.
+    Queues two jobs, one posting the meeting to Slack and one analyzing the
+    inline transcript, then returns 200 immediately. They are retried
+    independently, so a failed analysis never re-posts the notification.
+    Deliveries are deduplicated by recording_id, so a retried webhook does
+    not analyze the call twice.
     """
     logger.info(f"Received Fathom webhook for recording {payload.recording_id}: {payload.title}")
 
-    # Process in background so we return 200 quickly
-    background_tasks.add_task(_post_fathom_webhook_to_slack, payload)
+    def enqueue() -> tuple:
+        data = payload.model_dump(mode="json")
+        attempts = get_settings().job_max_attempts
+        notify = app.state.jobs.enqueue(
+            "fathom_notify", data, priority=1, max_attempts=attempts,
+            dedupe_key=f"fathom-notify:{payload.recording_id}",
+        )
+        analysis = app.state.jobs.enqueue(
+            "fathom_webhook", data, max_attempts=attempts,
+            dedupe_key=f"fathom:{payload.recording_id}",
+        )
+        return notify, analysis
 
-    return {"received": True, "recording_id": payload.recording_id}
+    notify, analysis = await run_in_threadpool(enqueue)
+    if not analysis.duplicate:
+        app.state.workers.notify()
+
+    return {
+        "received": True,
+        "recording_id": payload.recording_id,
+        "job_id": analysis.id,
+        "notify_job_id": notify.id,
+        "duplicate": analysis.duplicate,
+    }
 
 
 HTML_PAGE = """
@@ -504,6 +833,74 @@ HTML_PAGE = """
       `;
     }
 
+    // Read a newline-delimited JSON response, calling onItem for each line
+    async function readNdjson(res, onItem) {
+      const reader = res.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\\n');
+        buffer = lines.pop();
+        lines.filter(l => l.trim()).forEach(l => onItem(JSON.parse(l)));
+      }
+      if (buffer.trim()) onItem(JSON.parse(buffer));
+    }
+
+    async function postJson(path, payload) {
+      const res = await fetch(path, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(payload),
+      });
+      if (!res.ok) {
+        const data = await res.json();
+        throw new Error(typeof data.detail === 'string' ? data.detail : JSON.stringify(data.detail) || 'Request failed');
+      }
+      return res;
+    }
+
+    // Single provider: render each stage as the server streams it
+    async function runStreamed(provider, payload) {
+      const title = provider.charAt(0).toUpperCase() + provider.slice(1);
+      const stages = { spelling_grammar: null, content: null };
+      let ruleChecksHtml = '';
+      let header = `<h4>${title}</h4>`;
+      let card = null;
+      const render = () => {
+        const llmIssues = [].concat(stages.spelling_grammar || [], stages.content || []);
+        const pending = Object.entries(stages).filter(([, v]) => v === null).map(([k]) => k.replace('_', '/'));
+        const progress = `
+          <div class="result-card loading provider-${provider}">
+            ${header}
+            <p class="muted">🤖 LLM found ${llmIssues.length} issues so far${pending.length ? ` — waiting for ${pending.join(', ')}...` : ''}</p>
+            ${llmIssues.slice(0, 10).map(i => `<div class="issue"><strong>${i.category}:</strong> ${i.title}${i.location ? ` <span style="color:#888;font-size:11px;">— ${i.location}</span>` : ''}</div>`).join('')}
+          </div>`;
+        result.innerHTML = ruleChecksHtml + '<div class="results-grid">' + (card || progress) + '</div>';
+      };
+      render();
+
+      const res = await postJson('api/analyze/stream', { ...payload, provider });
+      await readNdjson(res, ({ event, data }) => {
+        if (event === 'metadata') {
+          header = `<h4>${title} <span class="pill">${data.document_type}</span></h4><p class="muted">${data.document_title} • ${data.text_length.toLocaleString()} chars</p>`;
+          status.textContent = 'Document extracted, running checks...';
+        } else if (event === 'rules') {
+          ruleChecksHtml = renderRuleChecks(data);
+        } else if (event in stages) {
+          stages[event] = data;
+        } else if (event === 'result') {
+          if (!ruleChecksHtml) ruleChecksHtml = renderRuleChecks(data.issues || []);
+          card = renderResultCard(provider, { analysis: data }, null, true);
+        } else if (event === 'error') {
+          card = renderResultCard(provider, null, data.detail, true);
+        }
+        render();
+      });
+    }
+
     function renderResultCard(provider, data, error, isFirst) {
       if (error) {
         return `
@@ -570,45 +967,55 @@ HTML_PAGE = """
       const docType = document.getElementById('type').value;
       const slack = document.getElementById('slack').checked;
 
-      // Show loading cards
-      result.innerHTML = '<div class="results-grid">' +
-        providers.map(p => `<div class="result-card loading provider-${p}"><h4>${p.charAt(0).toUpperCase() + p.slice(1)}</h4><p class="muted">Loading...</p></div>`).join('') +
-        '</div>';
-
-      // Run all providers in parallel
-      const results = await Promise.allSettled(providers.map(async (provider) => {
-        const payload = { url, provider, slack: slack && provider === providers[0] };
-        if (docType) payload.type = docType;
-
-        const res = await fetch('api/analyze', {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify(payload),
-        });
-        const data = await res.json();
-        if (!res.ok) throw new Error(typeof data.detail === 'string' ? data.detail : JSON.stringify(data.detail) || 'Request failed');
-        return { provider, data };
-      }));
-
-      // Render results
-      // Get rule checks from first successful result (they're the same for all)
-      let ruleChecksHtml = '';
-      const firstSuccess = results.find(r => r.status === 'fulfilled');
-      if (firstSuccess) {
-        ruleChecksHtml = renderRuleChecks(firstSuccess.value.data.analysis.issues || []);
+      const payload = { url, providers, slack };
+      if (docType) payload.type = docType;
+
+      if (providers.length === 1) {
+        try {
+          await runStreamed(providers[0], payload);
+          status.textContent = '';
+        } catch (err) {
+          console.error(err);
+          status.textContent = err.message;
+        } finally {
+          btn.disabled = false;
+        }
+        return;
       }
 
-      const cards = results.map((r, i) => {
-        if (r.status === 'fulfilled') {
-          return renderResultCard(r.value.provider, r.value.data, null, i === 0);
+      // One request for all providers: the document is extracted once and
+      // each provider's result is streamed back (one JSON line) as it finishes
+      const cards = Object.fromEntries(providers.map(p => [p, null]));
+      let ruleChecksHtml = '';
+      const render = () => {
+        result.innerHTML = ruleChecksHtml + '<div class="results-grid">' +
+          providers.map(p => cards[p] || `<div class="result-card loading provider-${p}"><h4>${p.charAt(0).toUpperCase() + p.slice(1)}</h4><p class="muted">Loading...</p></div>`).join('') +
+          '</div>';
+      };
+      const handleItem = (item) => {
+        const i = providers.indexOf(item.provider);
+        if (item.error) {
+          cards[item.provider] = renderResultCard(item.provider, null, item.error, i === 0);
         } else {
-          return renderResultCard(providers[i], null, r.reason.message, i === 0);
+          // Rule checks are the same for every provider; show them once
+          if (!ruleChecksHtml) ruleChecksHtml = renderRuleChecks(item.analysis.issues || []);
+          cards[item.provider] = renderResultCard(item.provider, item, null, i === 0);
         }
-      }).join('');
+        render();
+      };
+
+      render();
 
-      result.innerHTML = ruleChecksHtml + '<div class="results-grid">' + cards + '</div>';
-      status.textContent = '';
-      btn.disabled = false;
+      try {
+        const res = await postJson('api/compare', payload);
+        await readNdjson(res, handleItem);
+        status.textContent = '';
+      } catch (err) {
+        console.error(err);
+        status.textContent = err.message;
+      } finally {
+        btn.disabled = false;
+      }
     });
 
     fathomForm.addEventListener('submit', async (e) => {
@@ -637,11 +1044,12 @@ HTML_PAGE = """
 
         const score = data.analysis.score ? data.analysis.score.overall : '—';
         const issueCount = data.analysis.issues.length;
+        const incomplete = Object.keys(data.analysis.errors || {}).length ? ' • Incomplete analysis' : '';
         const slack = data.slack?.url ? `<a href="${data.slack.url}" target="_blank">View Slack message</a>` : (payload.slack ? 'Posted to Slack' : 'Slack not requested');
 
         result.innerHTML = `
           <h3>${data.analysis.document_title} <span class="pill">${data.analysis.document_type}</span></h3>
-          <p class="muted">Provider: ${data.analysis.llm_provider} • Score: ${score}/100 • Issues: ${issueCount}</p>
+          <p class="muted">Provider: ${data.analysis.llm_provider} • Score: ${score}/100 • Issues: ${issueCount}${incomplete}</p>
           <p class="muted">${slack}</p>
           <pre>${JSON.stringify({ analysis: data.analysis, fathom: data.fathom }, null, 2)}</pre>
         `;
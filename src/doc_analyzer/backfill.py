@@ -0,0 +1,247 @@
+"""Bulk analysis of historical Fathom recordings.
+
+`doc-analyzer fathom backfill --since DATE` pages through every recording
+created after DATE and analyzes the transcripts with bounded concurrency.
+Results go to a local SQLite store. After each page of recordings is fully
+processed, the cursor of the following page is checkpointed, so an
+interrupted run resumes from where it stopped. Recordings already analyzed
+(for the same provider and call type) are skipped, so re-running a finished
+backfill only analyzes new recordings and retries failed ones.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+
+from .analyzers.client_registry import ClientRegistry
+from .analyzers.quality_analyzer import QualityAnalyzer
+from .config import get_settings
+from .integrations.fathom import FathomClient
+from .models import AnalysisResult, FathomMeeting
+
+logger = logging.getLogger(__name__)
+
+DONE = "done"
+FAILED = "failed"
+
+
+class BackfillStore:
+    """SQLite store of backfilled analyses and run checkpoints."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS recordings (
+                    recording_id TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    score INTEGER,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (recording_id, variant)
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS checkpoints (
+                    run_key TEXT PRIMARY KEY,
+                    cursor TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+
+    def analyzed(self, recording_ids: list[str], variant: str) -> set[str]:
+        """The recordings among `recording_ids` already analyzed for this variant."""
+        if not recording_ids:
+            return set()
+        placeholders = ", ".join("?" * len(recording_ids))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT recording_id FROM recordings WHERE variant = ? AND status = ? "
+                f"AND recording_id IN ({placeholders})",
+                (variant, DONE, *recording_ids),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def save_result(self, meeting: FathomMeeting, variant: str, result: AnalysisResult) -> None:
+        """Store a finished analysis."""
+        score = result.bannt_score.score if result.bannt_score else result.score.overall if result.score else None
+        self._save(meeting, variant, DONE, score, result.model_dump_json(), None)
+
+    def save_failure(self, meeting: FathomMeeting, variant: str, error: str) -> None:
+        """Record a failed analysis; it is retried by the next run that reaches it."""
+        self._save(meeting, variant, FAILED, None, None, error)
+
+    def get_checkpoint(self, run_key: str) -> Optional[str]:
+        """The cursor an interrupted run should resume from, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT cursor FROM checkpoints WHERE run_key = ?", (run_key,)).fetchone()
+        return row[0] if row else None
+
+    def set_checkpoint(self, run_key: str, cursor: Optional[str]) -> None:
+        """Record the next page to process; None marks the run finished."""
+        with self._connect() as conn:
+            if cursor is None:
+                conn.execute("DELETE FROM checkpoints WHERE run_key = ?", (run_key,))
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (run_key, cursor, updated_at) VALUES (?, ?, ?)",
+                    (run_key, cursor, time.time()),
+                )
+
+    def counts(self, variant: Optional[str] = None) -> dict[str, int]:
+        """Number of stored recordings per status."""
+        query = "SELECT status, COUNT(*) FROM recordings"
+        params: tuple = ()
+        if variant is not None:
+            query += " WHERE variant = ?"
+            params = (variant,)
+        with self._connect() as conn:
+            rows = conn.execute(query + " GROUP BY status", params).fetchall()
+        return dict(rows)
+
+    def _save(
+        self,
+        meeting: FathomMeeting,
+        variant: str,
+        status: str,
+        score: Optional[int],
+        result: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO recordings (recording_id, variant, title, created_at, status, "
+                "score, result, error, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (meeting.id, variant, meeting.title, meeting.created_at.isoformat(), status,
+                 score, result, error, time.time()),
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation; this keeps the store thread-safe."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+@dataclass
+class BackfillStats:
+    """Progress of a backfill run."""
+    listed: int = 0
+    skipped: int = 0
+    analyzed: int = 0
+    failed: int = 0
+    resumed: bool = False
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def per_minute(self) -> float:
+        """Recordings analyzed per minute of wall time."""
+        minutes = (time.perf_counter() - self.started) / 60
+        return self.analyzed / minutes if minutes > 0 else 0.0
+
+
+# Called after each recording with the meeting and its result (or the exception it raised)
+ProgressCallback = Callable[[FathomMeeting, "AnalysisResult | Exception"], None]
+
+
+async def backfill(
+    fathom: FathomClient,
+    store: BackfillStore,
+    since: datetime,
+    provider: str = "openai",
+    is_sales_call: bool = True,
+    concurrency: int = 4,
+    clients: Optional[ClientRegistry] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> BackfillStats:
+    """Analyze every Fathom recording created after `since`.
+
+    At most `concurrency` recordings are fetched and analyzed at once, and
+    the next page of recordings is only listed once there is room for it.
+    """
+    variant = f"{provider}:{'sales' if is_sales_call else 'client'}"
+    run_key = f"{since.isoformat()}:{variant}"
+    stats = BackfillStats()
+    cursor = await asyncio.to_thread(store.get_checkpoint, run_key)
+    stats.resumed = cursor is not None
+
+    limit = asyncio.Semaphore(concurrency)
+    # Pages whose recordings are still being analyzed, oldest first, with the cursor after each
+    pages: deque[tuple[list[asyncio.Task], Optional[str]]] = deque()
+
+    async def analyze(meeting: FathomMeeting) -> None:
+        async with limit:
+            try:
+                transcript = await fathom.get_transcript(meeting.id)
+                analyzer = QualityAnalyzer(provider=provider, clients=clients)
+                result = await analyzer.analyze_transcript_async(
+                    transcript.full_text,
+                    is_sales_call,
+                    transcript.title or "Fathom Transcript",
+                )
+                result.document_url = transcript.share_url or transcript.url or f"fathom:{meeting.id}"
+            except Exception as exc:
+                logger.warning(f"Backfill of recording {meeting.id} failed: {exc}")
+                await asyncio.to_thread(store.save_failure, meeting, variant, str(exc) or type(exc).__name__)
+                stats.failed += 1
+                outcome = exc
+            else:
+                await asyncio.to_thread(store.save_result, meeting, variant, result)
+                stats.analyzed += 1
+                outcome = result
+        if on_progress:
+            on_progress(meeting, outcome)
+
+    async def checkpoint_finished_pages() -> None:
+        while pages and all(task.done() for task in pages[0][0]):
+            _, next_cursor = pages.popleft()
+            await asyncio.to_thread(store.set_checkpoint, run_key, next_cursor)
+
+    def in_flight() -> set[asyncio.Task]:
+        return {task for tasks, _ in pages for task in tasks if not task.done()}
+
+    try:
+        async for meetings, next_cursor in fathom.iter_meeting_pages(created_after=since, cursor=cursor):
+            stats.listed += len(meetings)
+            done = await asyncio.to_thread(store.analyzed, [m.id for m in meetings], variant)
+            stats.skipped += len(done)
+            tasks = [asyncio.create_task(analyze(m)) for m in meetings if m.id not in done]
+            pages.append((tasks, next_cursor))
+            await checkpoint_finished_pages()
+            # Backpressure: list the next page only when the workers are nearly idle
+            while len(in_flight()) > concurrency:
+                await asyncio.wait(in_flight(), return_when=asyncio.FIRST_COMPLETED)
+                await checkpoint_finished_pages()
+        await checkpoint_finished_pages()
+        while pages:
+            await asyncio.wait(pages[0][0])
+            await checkpoint_finished_pages()
+    finally:
+        for tasks, _ in pages:
+            for task in tasks:
+                task.cancel()
+    return stats
+
+
+def get_backfill_store(path: Optional[str] = None) -> BackfillStore:
+    """Create the backfill store (FATHOM_BACKFILL_PATH unless `path` is given)."""
+    return BackfillStore(path or get_settings().fathom_backfill_path)
@@ -0,0 +1,247 @@
+"""Local stand-in for the OpenAI and Anthropic batch APIs.
+
+Runs the subset of both providers' batch endpoints that the batch mode
+uses (`doc-analyzer batch --offline`), so it can be exercised without API
+keys, cost or a 24-hour wait:
+
+    uv run doc-analyzer batch-server --port 8765 --delay 5
+    OPENAI_BASE_URL=http://localhost:8765/v1 uv run doc-analyzer batch urls.txt --offline
+    ANTHROPIC_BASE_URL=http://localhost:8765 uv run doc-analyzer batch urls.txt --offline -p anthropic
+
+Batches finish `delay` seconds after they are created. Every request is
+answered with the same canned JSON response (no issues found), and token
+usage is estimated from the request size. State is kept in memory.
+"""
+
+import json
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, Optional
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+# Valid for both the spelling/grammar and the content prompt
+CANNED_RESPONSE = json.dumps({"issues": [], "required_sections_found": [], "required_sections_missing": []})
+
+
+def _tokens(value: Any) -> int:
+    """Rough token count (4 characters per token)."""
+    return max(1, len(json.dumps(value)) // 4)
+
+
+def _form_fields(content_type: str, body: bytes) -> dict[str, tuple[Optional[str], bytes]]:
+    """Fields of a multipart/form-data body: name -> (filename, content).
+
+    Parsed with the standard library's MIME parser, so the file upload
+    endpoint does not need python-multipart.
+    """
+    if not content_type.startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if name:
+            fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+    return fields
+
+
+def create_app(delay: float = 5.0, response: str = CANNED_RESPONSE) -> FastAPI:
+    """Build the stand-in batch server; batches finish `delay` seconds after creation."""
+    app = FastAPI(title="Local batch API stand-in")
+    files: dict[str, dict] = {}
+    batches: dict[str, dict] = {}
+
+    def finished(batch: dict) -> bool:
+        return time.time() >= batch["created_at"] + delay
+
+    # --- OpenAI: Files + Batches ---
+
+    def add_file(content: str, filename: str, purpose: str) -> dict:
+        file_id = f"file-{uuid.uuid4().hex}"
+        files[file_id] = {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(content.encode()),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+            "content": content,
+        }
+        return files[file_id]
+
+    def public(file: dict) -> dict:
+        return {name: value for name, value in file.items() if name != "content"}
+
+    def openai_batch(batch: dict) -> dict:
+        if finished(batch) and batch["output_file_id"] is None:
+            lines = []
+            for line in files[batch["input_file_id"]]["content"].splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                body = item["body"]
+                lines.append(json.dumps({
+                    "id": f"batch_req_{uuid.uuid4().hex}",
+                    "custom_id": item["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "request_id": uuid.uuid4().hex,
+                        "body": {
+                            "id": f"chatcmpl-{uuid.uuid4().hex}",
+                            "object": "chat.completion",
+                            "model": body.get("model"),
+                            "choices": [{
+                                "index": 0,
+                                "message": {"role": "assistant", "content": response},
+                                "finish_reason": "stop",
+                            }],
+                            "usage": {
+                                "prompt_tokens": _tokens(body.get("messages")),
+                                "completion_tokens": _tokens(response),
+                                "total_tokens": _tokens(body.get("messages")) + _tokens(response),
+                            },
+                        },
+                    },
+                    "error": None,
+                }))
+            batch["output_file_id"] = add_file("\n".join(lines) + "\n", "output.jsonl", "batch_output")["id"]
+            batch["request_counts"] = {"total": len(lines), "completed": len(lines), "failed": 0}
+            batch["completed_at"] = int(time.time())
+        return {
+            "id": batch["id"],
+            "object": "batch",
+            "endpoint": batch["endpoint"],
+            "input_file_id": batch["input_file_id"],
+            "completion_window": batch["completion_window"],
+            "status": "completed" if batch["output_file_id"] else "in_progress",
+            "output_file_id": batch["output_file_id"],
+            "error_file_id": None,
+            "created_at": int(batch["created_at"]),
+            "completed_at": batch.get("completed_at"),
+            "request_counts": batch.get("request_counts"),
+        }
+
+    @app.post("/v1/files")
+    async def create_file(request: Request) -> dict:
+        fields = _form_fields(request.headers.get("content-type", ""), await request.body())
+        if "file" not in fields or "purpose" not in fields:
+            raise HTTPException(status_code=422, detail="Expected 'file' and 'purpose' form fields")
+        filename, content = fields["file"]
+        return public(add_file(content.decode(), filename or "upload.jsonl", fields["purpose"][1].decode()))
+
+    @app.get("/v1/files/{file_id}/content", response_class=PlainTextResponse)
+    async def file_content(file_id: str) -> str:
+        if file_id not in files:
+            raise HTTPException(status_code=404, detail="No such file")
+        return files[file_id]["content"]
+
+    @app.post("/v1/batches")
+    async def create_batch(request: Request) -> dict:
+        body = await request.json()
+        if body.get("input_file_id") not in files:
+            raise HTTPException(status_code=400, detail="Unknown input_file_id")
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        batches[batch_id] = {
+            "id": batch_id,
+            "provider": "openai",
+            "endpoint": body.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": body["input_file_id"],
+            "completion_window": body.get("completion_window", "24h"),
+            "output_file_id": None,
+            "created_at": time.time(),
+        }
+        return openai_batch(batches[batch_id])
+
+    @app.get("/v1/batches/{batch_id}")
+    async def get_batch(batch_id: str) -> dict:
+        batch = batches.get(batch_id)
+        if batch is None or batch["provider"] != "openai":
+            raise HTTPException(status_code=404, detail="No such batch")
+        return openai_batch(batch)
+
+    # --- Anthropic: Message Batches ---
+
+    def timestamp(seconds: Optional[float]) -> Optional[str]:
+        if seconds is None:
+            return None
+        return datetime.fromtimestamp(seconds, timezone.utc).isoformat().replace("+00:00", "Z")
+
+    def anthropic_batch(batch: dict, base_url: str) -> dict:
+        done = finished(batch)
+        count = len(batch["requests"])
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if done else "in_progress",
+            "request_counts": {
+                "processing": 0 if done else count,
+                "succeeded": count if done else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": timestamp(batch["created_at"]),
+            "expires_at": timestamp(batch["created_at"] + timedelta(days=1).total_seconds()),
+            "ended_at": timestamp(batch["created_at"] + delay) if done else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{base_url}v1/messages/batches/{batch['id']}/results" if done else None,
+        }
+
+    @app.post("/v1/messages/batches")
+    async def create_message_batch(request: Request) -> dict:
+        body = await request.json()
+        batch_id = f"msgbatch_{uuid.uuid4().hex}"
+        batches[batch_id] = {
+            "id": batch_id,
+            "provider": "anthropic",
+            "requests": body.get("requests", []),
+            "created_at": time.time(),
+        }
+        return anthropic_batch(batches[batch_id], str(request.base_url))
+
+    @app.get("/v1/messages/batches/{batch_id}")
+    async def get_message_batch(batch_id: str, request: Request) -> dict:
+        batch = batches.get(batch_id)
+        if batch is None or batch["provider"] != "anthropic":
+            raise HTTPException(status_code=404, detail="No such batch")
+        return anthropic_batch(batch, str(request.base_url))
+
+    @app.get("/v1/messages/batches/{batch_id}/results", response_class=PlainTextResponse)
+    async def message_batch_results(batch_id: str) -> str:
+        batch = batches.get(batch_id)
+        if batch is None or batch["provider"] != "anthropic" or not finished(batch):
+            raise HTTPException(status_code=404, detail="No results for batch")
+        lines = []
+        for item in batch["requests"]:
+            params = item.get("params", {})
+            lines.append(json.dumps({
+                "custom_id": item["custom_id"],
+                "result": {
+                    "type": "succeeded",
+                    "message": {
+                        "id": f"msg_{uuid.uuid4().hex}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": params.get("model", ""),
+                        "content": [{"type": "text", "text": response}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": {
+                            "input_tokens": _tokens(params.get("messages")),
+                            "output_tokens": _tokens(response),
+                        },
+                    },
+                },
+            }))
+        return "\n".join(lines) + "\n"
+
+    return app
@@ -2,7 +2,11 @@
 
 import argparse
 import asyncio
+import json
 import sys
+import time
+from datetime import datetime, timezone
+from typing import get_args
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -12,11 +16,14 @@ from .analyzers.quality_analyzer import QualityAnalyzer
 from .analyzers.llm_analyzer import LLMProvider
 from .integrations.fathom import FathomClient
 from .integrations.slack import SlackNotifier
-from .models import IssueSeverity
+from .models import DocumentType, IssueSeverity
 
 
 console = Console()
 
+# Every provider the LLM analyzer supports
+PROVIDERS = list(get_args(LLMProvider))
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -48,10 +55,91 @@ def main():
         action="store_true",
         help="Add comments to the document"
     )
+    analyze_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached documents and LLM responses and analyze from scratch"
+    )
+    analyze_parser.add_argument(
+        "--incremental", "-i",
+        action="store_true",
+        help="Only re-check slides/sections changed since the last run"
+    )
 
-    # compare command (compare all 3 providers)
-    compare_parser = subparsers.add_parser("compare", help="Compare all 3 LLM providers")
+    # compare command (extract once, run providers concurrently)
+    compare_parser = subparsers.add_parser("compare", help="Compare LLM providers on the same document")
     compare_parser.add_argument("url", help="Google Docs/Slides URL")
+    compare_parser.add_argument(
+        "--providers", "-p",
+        nargs="+",
+        choices=PROVIDERS,
+        default=["openai", "anthropic", "google"],
+        help="LLM providers to compare"
+    )
+    compare_parser.add_argument(
+        "--type", "-t",
+        choices=["proposal", "kickoff"],
+        help="Document type (auto-detected if not specified)"
+    )
+    compare_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=180.0,
+        help="Seconds each provider may take before it is reported as failed"
+    )
+    compare_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached documents and LLM responses and analyze from scratch"
+    )
+
+    # batch command (many documents, one JSONL line each)
+    batch_parser = subparsers.add_parser("batch", help="Analyze many documents listed in a file")
+    batch_parser.add_argument("file", help="File with one Google Docs/Slides URL per line, or '-' for stdin")
+    batch_parser.add_argument(
+        "--provider", "-p",
+        choices=PROVIDERS,
+        default="openai",
+        help="LLM provider to use"
+    )
+    batch_parser.add_argument(
+        "--type", "-t",
+        choices=["proposal", "kickoff"],
+        help="Document type for every URL (auto-detected if not specified)"
+    )
+    batch_parser.add_argument(
+        "--concurrency", "-n",
+        type=int,
+        help="Documents analyzed at once (default: BATCH_CONCURRENCY)"
+    )
+    batch_parser.add_argument(
+        "--output", "-o",
+        default="batch-results.jsonl",
+        help="JSONL file to write, one line per document"
+    )
+    batch_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached documents and LLM responses and analyze from scratch"
+    )
+    batch_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Send all LLM requests as one provider batch job (cheaper, can take hours; openai/anthropic)"
+    )
+
+    # batch-server command (local stand-in for the provider batch APIs)
+    batch_server_parser = subparsers.add_parser(
+        "batch-server", help="Run a local stand-in for the OpenAI/Anthropic batch APIs"
+    )
+    batch_server_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    batch_server_parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    batch_server_parser.add_argument(
+        "--delay",
+        type=float,
+        default=5.0,
+        help="Seconds before a submitted batch is reported finished"
+    )
 
     # transcript command
     transcript_parser = subparsers.add_parser("transcript", help="Analyze a call transcript")
@@ -94,6 +182,44 @@ def main():
         help="Post results to Slack",
     )
 
+    fathom_backfill = fathom_sub.add_parser(
+        "backfill", help="Analyze all Fathom recordings since a date (resumable)"
+    )
+    fathom_backfill.add_argument(
+        "--since",
+        required=True,
+        type=parse_since,
+        help="Analyze recordings created on/after this date (YYYY-MM-DD or ISO timestamp, UTC if no offset)",
+    )
+    fathom_backfill.add_argument(
+        "--sales",
+        action="store_true",
+        help="Analyze as sales calls (BANNT scoring). Default is client calls if omitted.",
+    )
+    fathom_backfill.add_argument(
+        "--provider", "-p",
+        choices=PROVIDERS,
+        default="openai",
+        help="LLM provider to use",
+    )
+    fathom_backfill.add_argument(
+        "--concurrency", "-n",
+        type=int,
+        help="Recordings analyzed at once (default: FATHOM_BACKFILL_CONCURRENCY)",
+    )
+    fathom_backfill.add_argument(
+        "--store",
+        help="SQLite file for results and checkpoints (default: FATHOM_BACKFILL_PATH)",
+    )
+
+    # worker command (runs queued background jobs)
+    worker_parser = subparsers.add_parser("worker", help="Run background analysis jobs from the job queue")
+    worker_parser.add_argument(
+        "--concurrency", "-n",
+        type=int,
+        help="Jobs run at once (default: JOB_WORKERS, at least 1)"
+    )
+
     args = parser.parse_args()
 
     if not args.command:
@@ -104,10 +230,16 @@ def main():
         analyze_document(args)
     elif args.command == "compare":
         compare_providers(args)
+    elif args.command == "batch":
+        asyncio.run(analyze_batch(args))
+    elif args.command == "batch-server":
+        run_batch_server(args)
     elif args.command == "transcript":
         analyze_transcript(args)
     elif args.command == "fathom":
         fathom_command(args)
+    elif args.command == "worker":
+        asyncio.run(run_worker(args))
 
 
 def analyze_document(args):
@@ -117,7 +249,11 @@ def analyze_document(args):
     console.print(f"Provider: {args.provider}\n")
 
     try:
-        analyzer = QualityAnalyzer(provider=args.provider)
+        analyzer = QualityAnalyzer(
+            provider=args.provider,
+            use_cache=not args.no_cache,
+            incremental=args.incremental,
+        )
         result = analyzer.analyze_url(args.url)
 
         # Display results
@@ -144,24 +280,113 @@ def analyze_document(args):
 
 
 def compare_providers(args):
-    """Compare all 3 LLM providers on the same document."""
+    """Compare LLM providers on the same document.
+
+    The document is extracted and rule-checked once; the providers run
+    concurrently, each with its own timeout.
+    """
     console.print(f"\n[bold blue]Comparing LLM providers...[/bold blue]")
-    console.print(f"URL: {args.url}\n")
-
-    results = {}
-    for provider in ["openai", "anthropic", "google"]:
-        console.print(f"[dim]Analyzing with {provider}...[/dim]")
-        try:
-            analyzer = QualityAnalyzer(provider=provider)
-            results[provider] = analyzer.analyze_url(args.url)
-        except Exception as e:
-            console.print(f"[red]{provider} failed: {e}[/red]")
-            results[provider] = None
+    console.print(f"URL: {args.url}")
+    console.print(f"Providers: {', '.join(args.providers)}\n")
+
+    results = asyncio.run(compare_providers_async(args))
 
     # Display comparison
     display_comparison(results)
 
 
+async def compare_providers_async(args) -> dict:
+    """Run every provider on the document, reporting each as it finishes."""
+    providers = list(dict.fromkeys(args.providers))
+    results = {provider: None for provider in providers}
+    analyzer = QualityAnalyzer(provider=providers[0], use_cache=not args.no_cache)
+    doc_type = DocumentType(args.type) if args.type else None
+
+    async for provider, result in analyzer.analyze_url_multi(args.url, providers, doc_type, args.timeout):
+        if isinstance(result, Exception):
+            console.print(f"[red]{provider} failed: {result}[/red]")
+        else:
+            console.print(f"[dim]{provider} finished[/dim]")
+            results[provider] = result
+    return results
+
+
+async def analyze_batch(args):
+    """Analyze every URL in a file, writing one JSONL line per document."""
+    from .analyzers.client_registry import ClientRegistry
+
+    source = sys.stdin if args.file == "-" else open(args.file)
+    with source:
+        urls = [line.strip() for line in source if line.strip() and not line.lstrip().startswith("#")]
+    doc_type = DocumentType(args.type) if args.type else None
+
+    console.print(f"\n[bold blue]Analyzing {len(urls)} documents...[/bold blue]")
+    console.print(f"Provider: {args.provider}{' (batch API)' if args.offline else ''}")
+    console.print(f"Output: {args.output}\n")
+
+    clients = ClientRegistry()
+    counts = {"succeeded": 0, "failed": 0}
+    started = time.perf_counter()
+    try:
+        analyzer = QualityAnalyzer(provider=args.provider, use_cache=not args.no_cache, clients=clients)
+        with open(args.output, "w") as out:
+            if args.offline:
+                console.print("[dim]Submitted as one provider batch job; this can take a while...[/dim]")
+                results = await asyncio.to_thread(analyzer.analyze_batch_offline, urls, doc_type)
+                for url, result in results:
+                    write_batch_record(out, url, args.provider, result, counts)
+            else:
+                async for url, result in analyzer.analyze_batch(urls, doc_type, args.concurrency):
+                    write_batch_record(out, url, args.provider, result, counts)
+    finally:
+        await clients.aclose()
+
+    elapsed = time.perf_counter() - started
+    total = counts["succeeded"] + counts["failed"]
+    per_minute = total / (elapsed / 60) if elapsed > 0 else 0.0
+    console.print(
+        f"\n[bold]{counts['succeeded']} analyzed, {counts['failed']} failed in {elapsed:.1f}s "
+        f"({per_minute:.1f} docs/minute)[/bold]"
+    )
+    if args.offline:
+        usage = analyzer.llm.usage
+        console.print(
+            f"[dim]Batch tokens: {usage['input_tokens']:,} in ({usage['cache_read_tokens']:,} cached) "
+            f"/ {usage['output_tokens']:,} out[/dim]"
+        )
+
+
+def write_batch_record(out, url: str, provider: str, result, counts: dict) -> None:
+    """Write one document's batch result as a JSONL line and report it."""
+    if isinstance(result, Exception):
+        counts["failed"] += 1
+        record = {"url": url, "provider": provider, "error": str(result) or type(result).__name__}
+        console.print(f"[red]✗ {url}: {record['error']}[/red]")
+    else:
+        counts["succeeded"] += 1
+        record = {"url": url, "provider": provider, "analysis": result.model_dump(mode="json")}
+        overall = result.score.overall if result.score else "-"
+        incomplete = ", incomplete" if result.errors else ""
+        console.print(f"[green]✓[/green] {result.document_title} [dim]({overall}/100{incomplete})[/dim]")
+    out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def run_batch_server(args):
+    """Serve the local stand-in for the OpenAI/Anthropic batch APIs."""
+    import uvicorn
+
+    from .batch_server import create_app
+
+    console.print(
+        f"[bold blue]Batch API stand-in on http://{args.host}:{args.port}[/bold blue] "
+        f"(batches finish after {args.delay:g}s)\n"
+        f"  OPENAI_BASE_URL=http://{args.host}:{args.port}/v1\n"
+        f"  ANTHROPIC_BASE_URL=http://{args.host}:{args.port}"
+    )
+    uvicorn.run(create_app(delay=args.delay), host=args.host, port=args.port)
+
+
 def analyze_transcript(args):
     """Analyze a call transcript."""
     # Read transcript
@@ -193,20 +418,31 @@ def analyze_transcript(args):
 def fathom_command(args):
     """Handle Fathom-related commands."""
     if not args.fathom_command:
-        console.print("[red]Missing Fathom subcommand (use 'list' or 'analyze')[/red]")
+        console.print("[red]Missing Fathom subcommand (use 'list', 'analyze' or 'backfill')[/red]")
         return
 
     if args.fathom_command == "list":
         asyncio.run(fathom_list_meetings(args))
     elif args.fathom_command == "analyze":
         asyncio.run(fathom_analyze_recording(args))
+    elif args.fathom_command == "backfill":
+        asyncio.run(fathom_backfill(args))
+
+
+def parse_since(value: str) -> datetime:
+    """Parse a --since date; dates without a UTC offset are taken as UTC."""
+    try:
+        since = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date: {value!r} (expected YYYY-MM-DD)")
+    return since if since.tzinfo else since.replace(tzinfo=timezone.utc)
 
 
 async def fathom_list_meetings(args):
     """List recent Fathom meetings."""
     console.print("\n[bold blue]Fetching Fathom meetings...[/bold blue]\n")
-    client = FathomClient()
-    meetings = await client.list_meetings(limit=args.limit)
+    async with FathomClient() as client:
+        meetings = await client.list_meetings(limit=args.limit)
 
     table = Table(title=f"Fathom Meetings (latest {len(meetings)})")
     table.add_column("Recording ID", style="cyan", no_wrap=True)
@@ -224,8 +460,8 @@ async def fathom_list_meetings(args):
 async def fathom_analyze_recording(args):
     """Fetch a transcript from Fathom and analyze it."""
     console.print("\n[bold blue]Fetching Fathom transcript...[/bold blue]")
-    client = FathomClient()
-    transcript = await client.get_transcript(args.recording_id)
+    async with FathomClient() as client:
+        transcript = await client.get_transcript(args.recording_id)
 
     is_sales = bool(args.sales)
     call_type = "Sales (BANNT)" if is_sales else "Client Call"
@@ -255,13 +491,103 @@ async def fathom_analyze_recording(args):
             console.print(f"[red]Slack error: {slack_result.get('error')}[/red]")
 
 
+async def fathom_backfill(args):
+    """Analyze every Fathom recording since a date, resuming an interrupted run."""
+    from .analyzers.client_registry import ClientRegistry
+    from .backfill import backfill, get_backfill_store
+    from .config import get_settings
+
+    settings = get_settings()
+    concurrency = args.concurrency or max(settings.fathom_backfill_concurrency, 1)
+    store = get_backfill_store(args.store)
+    call_type = "Sales (BANNT)" if args.sales else "Client Call"
+    console.print(f"\n[bold blue]Backfilling Fathom recordings since {args.since.date()}...[/bold blue]")
+    console.print(f"Type: {call_type}")
+    console.print(f"Provider: {args.provider}")
+    console.print(f"Store: {store.path} ({concurrency} at a time)\n")
+
+    def progress(meeting, outcome):
+        if isinstance(outcome, Exception):
+            console.print(f"[red]✗ {meeting.title} ({meeting.id}): {outcome}[/red]")
+        else:
+            score = outcome.bannt_score.score if outcome.bannt_score else None
+            shown = f"BANNT {score}/5" if score is not None else f"{len(outcome.issues)} issues"
+            console.print(f"[green]✓[/green] {meeting.title} [dim]({meeting.id}, {shown})[/dim]")
+
+    clients = ClientRegistry()
+    try:
+        async with FathomClient() as fathom:
+            stats = await backfill(
+                fathom,
+                store,
+                since=args.since,
+                provider=args.provider,
+                is_sales_call=args.sales,
+                concurrency=concurrency,
+                clients=clients,
+                on_progress=progress,
+            )
+    finally:
+        await clients.aclose()
+
+    table = Table(title="Backfill Summary")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Resumed from checkpoint", "yes" if stats.resumed else "no")
+    table.add_row("Recordings listed", str(stats.listed))
+    table.add_row("Already analyzed (skipped)", str(stats.skipped))
+    table.add_row("Analyzed", str(stats.analyzed))
+    table.add_row("Failed", str(stats.failed))
+    table.add_row("Recordings / minute", f"{stats.per_minute:.1f}")
+    console.print()
+    console.print(table)
+
+
+async def run_worker(args):
+    """Run job workers until interrupted, sharing the web app's job database."""
+    from .analyzers.client_registry import ClientRegistry
+    from .api import job_handlers
+    from .config import get_settings
+    from .jobs import WorkerPool, get_job_store
+
+    settings = get_settings()
+    concurrency = args.concurrency or max(settings.job_workers, 1)
+    clients = ClientRegistry()
+    fathom = FathomClient()
+    pool = WorkerPool(
+        get_job_store(),
+        job_handlers(clients, fathom),
+        concurrency=concurrency,
+        poll_interval=settings.job_poll_interval,
+    )
+    console.print(f"[bold blue]Running {concurrency} job worker(s) on {settings.job_store_path}[/bold blue]")
+    try:
+        await pool.run_forever()
+    finally:
+        await clients.aclose()
+        await fathom.aclose()
+
+
 def display_result(result):
     """Display analysis result."""
     # Header
     console.print(Panel(
         f"[bold]{result.document_title}[/bold]\n"
         f"Type: {result.document_type.value}\n"
-        f"Analyzed by: {result.llm_provider}",
+        f"Analyzed by: {result.llm_provider}"
+        + (f"\nCached: {', '.join(result.cache_hits)}" if result.cache_hits else "")
+        + (f"\nRe-checked: {result.units['reanalyzed']}/{result.units['total']} units" if result.units else "")
+        + (
+            f"\nTokens: {result.token_usage.get('input_tokens', 0):,} in "
+            f"({result.token_usage.get('cache_read_tokens', 0):,} from prompt cache) / "
+            f"{result.token_usage.get('output_tokens', 0):,} out"
+            if result.token_usage.get("calls") else ""
+        )
+        + (
+            f"\nFetched: {result.fetch['payload_bytes'] / 1024:,.0f} KB in {result.fetch['fetch_seconds']:.2f}s "
+            f"(parse {result.fetch['parse_seconds']:.3f}s)"
+            if result.fetch else ""
+        ),
         title="Document Analysis"
     ))
 
@@ -269,16 +595,23 @@ def display_result(result):
     if result.score:
         score = result.score.overall
         color = "green" if score >= 80 else "yellow" if score >= 60 else "red"
-        console.print(f"\n[bold]Score: [{color}]{score}/100[/{color}][/bold]")
+        console.print(f"\n[bold]Score: [{color}]{score}/100[/{color}][/bold]"
+                      + (" [yellow](incomplete)[/yellow]" if result.score.incomplete else ""))
 
         table = Table(title="Score Breakdown")
         table.add_column("Category")
         table.add_column("Score", justify="right")
-        table.add_row("Spelling/Grammar", f"{result.score.spelling_grammar}/100")
-        table.add_row("Required Content", f"{result.score.required_content}/100")
+        incomplete = result.score.incomplete
+        table.add_row("Spelling/Grammar", f"{result.score.spelling_grammar}/100"
+                      + (" (incomplete)" if "spelling_grammar" in incomplete else ""))
+        table.add_row("Required Content", f"{result.score.required_content}/100"
+                      + (" (incomplete)" if "required_content" in incomplete else ""))
         table.add_row("Math Accuracy", f"{result.score.math_accuracy}/100")
         console.print(table)
 
+    for stage, error in result.errors.items():
+        console.print(f"[yellow]⚠ {stage} analysis incomplete: {error}[/yellow]")
+
     # BANNT Score
     if result.bannt_score:
         bannt = result.bannt_score
@@ -361,6 +694,28 @@ def display_comparison(results):
             sg_issues.append("-")
     table.add_row("Spelling/Grammar", *sg_issues)
 
+    # LLM latency and tokens (a cached result cost nothing)
+    latencies = []
+    tokens = []
+    for provider, result in results.items():
+        if not result:
+            latencies.append("-")
+            tokens.append("-")
+        elif "revision" in result.cache_hits:
+            latencies.append("cached")
+            tokens.append("cached")
+        else:
+            latencies.append(f"{result.llm_seconds:.1f}s" if result.llm_seconds is not None else "-")
+            usage = result.token_usage
+            cached = usage.get("cache_read_tokens", 0)
+            tokens.append(
+                f"{usage.get('input_tokens', 0):,} in"
+                + (f" ({cached:,} cached)" if cached else "")
+                + f" / {usage.get('output_tokens', 0):,} out"
+            )
+    table.add_row("LLM Latency", *latencies)
+    table.add_row("Tokens", *tokens)
+
     console.print(table)
 
 
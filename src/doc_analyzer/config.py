@@ -11,12 +11,62 @@ class Settings(BaseSettings):
     # Fathom API
     fathom_api_key: str = Field(default="", description="Fathom API key for transcript access")
     fathom_api_base: str = Field(default="https://api.fathom.ai/external/v1", description="Fathom API base URL")
+    fathom_webhook_provider: str = Field(default="openai", description="LLM provider for transcripts analyzed from webhooks")
+    fathom_backfill_path: str = Field(default=".cache/fathom_backfill.sqlite3", description="SQLite file for `fathom backfill` results and checkpoints")
+    fathom_backfill_concurrency: int = Field(default=4, description="Recordings analyzed at once by `fathom backfill`")
 
     # LLM Providers
     openai_api_key: str = Field(default="", description="OpenAI API key")
     anthropic_api_key: str = Field(default="", description="Anthropic API key")
     google_api_key: str = Field(default="", description="Google Gemini API key")
     openrouter_api_key: str = Field(default="", description="OpenRouter API key for multi-model access")
+    openai_base_url: str = Field(default="", description="Override the OpenAI API base URL (e.g. http://localhost:8765/v1 for `doc-analyzer batch-server`)")
+    anthropic_base_url: str = Field(default="", description="Override the Anthropic API base URL (e.g. http://localhost:8765 for `doc-analyzer batch-server`)")
+
+    # Provider batch APIs (`doc-analyzer batch --offline`)
+    llm_batch_poll_interval: float = Field(default=30.0, description="Seconds between batch job status checks")
+    llm_batch_timeout_seconds: float = Field(default=24 * 3600, description="Give up on a batch job not finished within this time")
+
+    # Provider-side prompt caching (OpenAI/Anthropic): the document is sent as a shared,
+    # cacheable prefix. Analyses of the same text still run concurrently; OpenAI caches
+    # prefixes on its own, and Anthropic can optionally hold later calls back until the
+    # first has written its cache
+    llm_prompt_cache: bool = Field(default=True, description="Lay out requests for provider prompt caching")
+    llm_prompt_cache_warmup: bool = Field(default=False, description="Anthropic: run later analyses of a long text after the first, so they read its cache (slower)")
+
+    # Required sections are matched locally against headings; the LLM content review only
+    # judges the sections the matcher cannot decide, and can be turned off entirely
+    llm_content_review: bool = Field(default=True, description="Run the LLM content review (style, completeness) alongside the local section check")
+
+    # LLM response cache
+    llm_cache_enabled: bool = Field(default=True, description="Reuse cached LLM responses for unchanged text")
+    llm_cache_path: str = Field(default=".cache/llm_responses.sqlite3", description="SQLite file for the LLM response cache")
+    llm_cache_ttl_seconds: int = Field(default=7 * 24 * 3600, description="Seconds before a cached LLM response expires")
+    llm_cache_max_mb: int = Field(default=100, description="Cache size limit; least recently used entries are evicted past it")
+
+    # Drive revision cache: unchanged documents skip extraction and LLM calls
+    revision_cache_enabled: bool = Field(default=True, description="Reuse extractions and results for unchanged Drive revisions")
+    revision_cache_path: str = Field(default=".cache/revisions.sqlite3", description="SQLite file for the revision cache")
+
+    # Long documents are analyzed in chunks instead of being truncated
+    llm_chunk_chars: int = Field(default=30000, description="Max characters sent to the LLM per chunk")
+    llm_chunk_parallelism: int = Field(default=4, description="Max concurrent LLM calls per analysis")
+
+    # Batch analysis (`doc-analyzer batch`, POST /api/analyze/batch)
+    batch_concurrency: int = Field(default=4, description="Documents analyzed at once per LLM provider in a batch")
+
+    # LLM connection pools (shared by all requests in the web app)
+    llm_pool_max_connections: int = Field(default=20, description="Max open connections per LLM provider")
+    llm_pool_max_keepalive: int = Field(default=10, description="Idle keep-alive connections kept per LLM provider")
+    llm_pool_keepalive_expiry: float = Field(default=60.0, description="Seconds an idle LLM connection is kept open")
+
+    # Background jobs (SQLite queue shared by the web app and `doc-analyzer worker`)
+    job_store_path: str = Field(default=".cache/jobs.sqlite3", description="SQLite file for the job queue")
+    job_workers: int = Field(default=2, description="Workers run inside the web process; 0 leaves jobs to `doc-analyzer worker`")
+    job_max_attempts: int = Field(default=3, description="Attempts per job before it is marked failed")
+    job_retry_backoff_seconds: float = Field(default=30.0, description="Delay before the first retry; doubles on each attempt")
+    job_lease_seconds: float = Field(default=900.0, description="Lease renewed by the running worker; a job whose worker stops renewing it is retried")
+    job_poll_interval: float = Field(default=1.0, description="Seconds an idle worker waits before checking for jobs")
 
     # Slack
     slack_bot_token: str = Field(default="", description="Slack bot OAuth token")
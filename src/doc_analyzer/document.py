@@ -0,0 +1,132 @@
+"""Structured model of an extracted document.
+
+The extractors write a document as one text buffer (`full_text`, which is
+what the LLM sees) plus a compact list of blocks: each paragraph, heading,
+table or slide text box with its Docs/Slides ID and its start/end offsets
+in the buffer. Anything between blocks (newlines, Slides' "--- Slide N ---"
+markers) is layout, not content. Offsets resolve to the block that contains
+them by binary search, so an issue found anywhere in the text can be
+reported by slide/paragraph instead of by character position.
+
+In the extracted dict the blocks are stored as lists,
+`[type, id, start, end, slide]`, to keep cached extractions small.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Optional
+
+# How block types are named in issue locations
+_TYPE_LABELS = {
+    "title": "title",
+    "subtitle": "subtitle",
+    "text": "text box",
+    "table": "table",
+    "heading": "heading",
+    "paragraph": "paragraph",
+}
+
+
+@dataclass(frozen=True)
+class Block:
+    """A span of the text buffer that is one element of the source document."""
+    type: str                     # heading, paragraph, table (Docs); title, subtitle, text, table (Slides)
+    id: str                       # Docs heading ID or "p<startIndex>"; Slides page element objectId
+    start: int
+    end: int
+    slide: Optional[int] = None   # 1-based slide number (Slides only)
+
+
+class DocumentModel:
+    """A text buffer and its blocks, with O(log n) offset-to-block lookup."""
+
+    def __init__(self, text: str, blocks: Optional[list[Block]] = None):
+        self.text = text
+        self.blocks = blocks or []
+        self._starts = [block.start for block in self.blocks]
+        # Per block: its ordinal among Docs paragraphs/tables, and the heading above it
+        self._ordinals: list[int] = []
+        self._headings: list[Optional[Block]] = []
+        counts: dict[str, int] = {}
+        heading = None
+        for block in self.blocks:
+            counts[block.type] = counts.get(block.type, 0) + 1
+            self._ordinals.append(counts[block.type])
+            self._headings.append(heading)
+            if block.type == "heading":
+                heading = block
+
+    @classmethod
+    def from_extracted(cls, extracted: dict) -> "DocumentModel":
+        """The model of an extractor's output (without blocks for older cached extractions)."""
+        return cls(extracted.get("full_text", ""), [Block(*b) for b in extracted.get("blocks", [])])
+
+    def to_json(self) -> list[list]:
+        """The blocks in their compact stored form."""
+        return [[b.type, b.id, b.start, b.end, b.slide] for b in self.blocks]
+
+    def block_at(self, offset: int) -> Optional[int]:
+        """Index of the block containing `offset`, or None between blocks."""
+        i = bisect_right(self._starts, offset) - 1
+        if i >= 0 and offset < self.blocks[i].end:
+            return i
+        return None
+
+    def headings(self) -> list[str]:
+        """Text of the Docs headings and slide titles, in order."""
+        return [self.text[b.start:b.end] for b in self.blocks if b.type in ("heading", "title")]
+
+    def location(self, offset: int) -> Optional[str]:
+        """Where `offset` is, as a reader would find it.
+
+        "Slide 4, table, row 3", "Paragraph 12 under \"Budget\"", or
+        "Table 2, row 5"; None between blocks.
+        """
+        i = self.block_at(offset)
+        if i is None:
+            return None
+        block = self.blocks[i]
+        line = self.text.count("\n", block.start, offset) + 1
+        multiline = "\n" in self.text[block.start:block.end]
+        label = _TYPE_LABELS.get(block.type, block.type)
+        if block.slide is not None:
+            where = f"Slide {block.slide}, {label}"
+        elif block.type == "heading":
+            return f"Heading \"{self._short(block)}\""
+        else:
+            where = f"{label.capitalize()} {self._ordinals[i]}"
+            heading = self._headings[i]
+            if heading is not None and block.type != "table":
+                where += f" under \"{self._short(heading)}\""
+        if multiline:
+            where += f", {'row' if block.type == 'table' else 'line'} {line}"
+        return where
+
+    def _short(self, block: Block, limit: int = 40) -> str:
+        text = self.text[block.start:block.end].split("\n", 1)[0].strip()
+        return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+class DocumentBuilder:
+    """Builds the text buffer and its blocks as an extractor walks a document."""
+
+    def __init__(self):
+        self._parts: list[str] = []
+        self._length = 0
+        self.blocks: list[Block] = []
+
+    def add(self, type: str, id: str, text: str, separator: str = "\n", slide: Optional[int] = None) -> None:
+        """Append a block, preceded by `separator` unless the buffer is empty."""
+        if self._length:
+            self.add_layout(separator)
+        start = self._length
+        self.add_layout(text)
+        self.blocks.append(Block(type, id, start, self._length, slide))
+
+    def add_layout(self, text: str) -> None:
+        """Append text that belongs to no block (separators, slide markers)."""
+        self._parts.append(text)
+        self._length += len(text)
+
+    def build(self) -> DocumentModel:
+        return DocumentModel("".join(self._parts), self.blocks)
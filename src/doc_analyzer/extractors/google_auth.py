@@ -0,0 +1,139 @@
+"""Shared Google OAuth credentials and API services.
+
+Loading token.json and building discovery services are among the slowest
+parts of a cold request, so both extractors share one cache per token
+file: credentials are loaded once and refreshed only when they are about
+to expire, and each API service is built once per process from the
+discovery documents bundled with google-api-python-client.
+
+Built services are shared between threads, but httplib2 connections are
+not thread-safe, so requests should be executed with `http=auth.http()`,
+which returns a per-thread authorized connection.
+
+Document reads go through `execute_measured`, which also reports how big
+the response was and how long it took to download and parse, so the
+effect of field masks on large files can be seen.
+"""
+
+import os
+import threading
+import time
+from functools import lru_cache
+
+import httplib2
+from google.oauth2.credentials import Credentials
+from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build, Resource
+from googleapiclient.http import HttpRequest
+
+
+# Unified scopes for Docs, Slides, and Drive (comments)
+SCOPES = [
+    "https://www.googleapis.com/auth/documents.readonly",
+    "https://www.googleapis.com/auth/presentations.readonly",
+    "https://www.googleapis.com/auth/drive",
+]
+
+
+class GoogleAuth:
+    """Thread-safe cache of one set of Google credentials and its services."""
+
+    def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.json"):
+        self.credentials_path = credentials_path
+        self.token_path = token_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._creds = None
+        self._services: dict[tuple[str, str], Resource] = {}
+
+    def credentials(self) -> Credentials:
+        """Return valid credentials, touching disk only to load or refresh."""
+        creds = self._creds
+        if creds and creds.valid:
+            return creds
+
+        with self._lock:
+            if self._creds and self._creds.valid:
+                return self._creds
+
+            # Check for existing token
+            if self._creds is None and os.path.exists(self.token_path):
+                self._creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
+
+            # Refresh or get new token
+            if not self._creds or not self._creds.valid:
+                if self._creds and self._creds.expired and self._creds.refresh_token:
+                    self._creds.refresh(Request())
+                else:
+                    if not os.path.exists(self.credentials_path):
+                        raise FileNotFoundError(
+                            f"Credentials file not found: {self.credentials_path}\n"
+                            "Download from Google Cloud Console → APIs & Services → Credentials"
+                        )
+                    flow = InstalledAppFlow.from_client_secrets_file(
+                        self.credentials_path, SCOPES
+                    )
+                    self._creds = flow.run_local_server(port=0)
+
+                # Save token for next run
+                with open(self.token_path, "w") as token:
+                    token.write(self._creds.to_json())
+
+            return self._creds
+
+    def service(self, name: str, version: str) -> Resource:
+        """Return the shared API service, building it on first use."""
+        key = (name, version)
+        service = self._services.get(key)
+        if service is not None:
+            return service
+
+        creds = self.credentials()
+        with self._lock:
+            if key not in self._services:
+                self._services[key] = build(
+                    name, version, credentials=creds, static_discovery=True, cache_discovery=False
+                )
+            return self._services[key]
+
+    def http(self) -> AuthorizedHttp:
+        """Return this thread's authorized HTTP connection for execute()."""
+        creds = self.credentials()
+        http = getattr(self._local, "http", None)
+        if http is None or http.credentials is not creds:
+            http = AuthorizedHttp(creds, http=httplib2.Http())
+            self._local.http = http
+        return http
+
+
+def execute_measured(request: HttpRequest, http) -> tuple[dict, dict]:
+    """Execute `request` and measure its response.
+
+    Returns:
+        (parsed response, {"payload_bytes", "fetch_seconds", "parse_seconds"});
+        fetch_seconds is the whole call, parse_seconds the JSON decoding in it
+    """
+    stats = {"payload_bytes": 0, "fetch_seconds": 0.0, "parse_seconds": 0.0}
+    postproc = request.postproc
+
+    def measured_postproc(resp, content):
+        stats["payload_bytes"] = len(content or b"")
+        started = time.perf_counter()
+        try:
+            return postproc(resp, content)
+        finally:
+            stats["parse_seconds"] = round(time.perf_counter() - started, 4)
+
+    request.postproc = measured_postproc
+    started = time.perf_counter()
+    result = request.execute(http=http)
+    stats["fetch_seconds"] = round(time.perf_counter() - started, 4)
+    return result, stats
+
+
+@lru_cache
+def get_google_auth(credentials_path: str = "credentials.json", token_path: str = "token.json") -> GoogleAuth:
+    """Get the process-wide GoogleAuth for a credentials/token file pair."""
+    return GoogleAuth(credentials_path, token_path)
@@ -1,22 +1,22 @@
 """Google Docs text extraction."""
 
-import os
 import re
 from typing import Optional
 
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .google_auth import execute_measured, get_google_auth
+from ..document import DocumentBuilder
 
-# Unified scopes for Docs, Slides, and Drive (comments)
-SCOPES = [
-    "https://www.googleapis.com/auth/documents.readonly",
-    "https://www.googleapis.com/auth/presentations.readonly",
-    "https://www.googleapis.com/auth/drive",
-]
+# The parts of the document the extractor reads: text runs, heading styles and
+# table cells. Styles, lists, inline objects and revisions are left out of the response.
+_TEXT_RUNS = "elements/textRun/content"
+DOCUMENT_FIELDS = (
+    "title,body/content("
+    "startIndex,"
+    f"paragraph({_TEXT_RUNS},paragraphStyle(namedStyleType,headingId)),"
+    f"table/tableRows/tableCells/content/paragraph/{_TEXT_RUNS})"
+)
 
 
 class GoogleDocsExtractor:
@@ -25,38 +25,21 @@ class GoogleDocsExtractor:
     def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.json"):
         self.credentials_path = credentials_path
         self.token_path = token_path
+        self.auth = None
         self.creds = None
         self.docs_service = None
         self.drive_service = None
 
     def authenticate(self) -> bool:
-        """Authenticate with Google APIs."""
-        # Check for existing token
-        if os.path.exists(self.token_path):
-            self.creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-
-        # Refresh or get new token
-        if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
-            else:
-                if not os.path.exists(self.credentials_path):
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_path}\n"
-                        "Download from Google Cloud Console → APIs & Services → Credentials"
-                    )
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, SCOPES
-                )
-                self.creds = flow.run_local_server(port=0)
-
-            # Save token for next run
-            with open(self.token_path, "w") as token:
-                token.write(self.creds.to_json())
-
-        # Build services
-        self.docs_service = build("docs", "v1", credentials=self.creds)
-        self.drive_service = build("drive", "v3", credentials=self.creds)
+        """Authenticate with Google APIs.
+
+        Credentials and services come from the process-wide cache, so this
+        is cheap after the first call.
+        """
+        self.auth = get_google_auth(self.credentials_path, self.token_path)
+        self.creds = self.auth.credentials()
+        self.docs_service = self.auth.service("docs", "v1")
+        self.drive_service = self.auth.service("drive", "v3")
         return True
 
     def extract_text(self, url: str) -> dict:
@@ -66,7 +49,8 @@ class GoogleDocsExtractor:
             url: Google Docs URL
 
         Returns:
-            dict with title, content sections, and full_text
+            dict with title, content sections, full_text and its blocks
+            (see DocumentModel), and the size and timing of the fetch
         """
         if not self.docs_service:
             self.authenticate()
@@ -74,23 +58,24 @@ class GoogleDocsExtractor:
         document_id = self._extract_id(url)
 
         try:
-            document = self.docs_service.documents().get(
-                documentId=document_id
-            ).execute()
+            document, fetch = execute_measured(
+                self.docs_service.documents().get(documentId=document_id, fields=DOCUMENT_FIELDS),
+                self.auth.http(),
+            )
 
             title = document.get("title", "Untitled")
             content = document.get("body", {}).get("content", [])
 
             sections = []
-            full_text = []
+            builder = DocumentBuilder()
 
             for element in content:
+                # Blocks without a heading ID are named by their index in the document
+                block_id = f"p{element.get('startIndex', 0)}"
                 if "paragraph" in element:
                     para = element["paragraph"]
                     text = self._extract_paragraph_text(para)
                     if text:
-                        full_text.append(text)
-
                         # Check if this is a heading
                         style = para.get("paragraphStyle", {})
                         named_style = style.get("namedStyleType", "NORMAL_TEXT")
@@ -100,18 +85,24 @@ class GoogleDocsExtractor:
                                 "type": named_style,
                                 "text": text,
                             })
+                            builder.add("heading", style.get("headingId") or block_id, text)
+                        else:
+                            builder.add("paragraph", block_id, text)
 
                 elif "table" in element:
                     table_text = self._extract_table_text(element["table"])
                     if table_text:
-                        full_text.append(table_text)
+                        builder.add("table", block_id, table_text)
 
+            document = builder.build()
             return {
                 "document_id": document_id,
                 "title": title,
                 "sections": sections,
-                "full_text": "\n".join(full_text),
-                "word_count": len("\n".join(full_text).split()),
+                "full_text": document.text,
+                "blocks": document.to_json(),
+                "word_count": len(document.text.split()),
+                "fetch": fetch,
             }
 
         except HttpError as e:
@@ -121,6 +112,35 @@ class GoogleDocsExtractor:
                 raise PermissionError(f"Access denied to document: {document_id}")
             raise
 
+    def get_revision(self, url: str) -> Optional[dict]:
+        """Get the document's current revision from Drive metadata.
+
+        This is much cheaper than fetching the document itself, so it is
+        used to skip re-extraction of unchanged files. Native Google files
+        usually have no headRevisionId, in which case modifiedTime (which
+        changes on every content edit) identifies the revision.
+
+        Returns:
+            dict with file_id and revision, or None if Drive metadata is unavailable
+        """
+        if not self.drive_service:
+            self.authenticate()
+
+        file_id = self._extract_id(url)
+
+        try:
+            metadata = self.drive_service.files().get(
+                fileId=file_id,
+                fields="headRevisionId,modifiedTime",
+            ).execute(http=self.auth.http())
+        except HttpError:
+            return None
+
+        revision = metadata.get("headRevisionId") or metadata.get("modifiedTime")
+        if not revision:
+            return None
+        return {"file_id": file_id, "revision": str(revision)}
+
     def add_comment(self, url: str, content: str) -> dict:
         """Add a comment to the document via Drive API.
 
@@ -136,7 +156,7 @@ class GoogleDocsExtractor:
                 fileId=file_id,
                 fields="id,content,createdTime",
                 body={"content": content}
-            ).execute()
+            ).execute(http=self.auth.http())
 
             return {
                 "success": True,
@@ -1,23 +1,30 @@
 """Google Slides text extraction."""
 
-import os
 import re
 from typing import Optional
 from pathlib import Path
 
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from .google_auth import execute_measured, get_google_auth
+from ..document import DocumentBuilder
 
-# Unified scopes for Docs, Slides, and Drive (comments)
-SCOPES = [
-    "https://www.googleapis.com/auth/documents.readonly",
-    "https://www.googleapis.com/auth/presentations.readonly",
-    "https://www.googleapis.com/auth/drive",
-]
+# The parts of the presentation the extractor reads: shape and table cell text
+# and placeholder types. Layouts, masters, transforms and styles are left out of the response.
+_TEXT_RUNS = "text/textElements/textRun/content"
+PRESENTATION_FIELDS = (
+    "title,slides(objectId,pageElements("
+    "objectId,"
+    f"shape(placeholder/type,{_TEXT_RUNS}),"
+    f"table/tableRows/tableCells/{_TEXT_RUNS}))"
+)
+
+# Block type of a shape by its placeholder type
+_PLACEHOLDER_TYPES = {
+    "TITLE": "title",
+    "CENTERED_TITLE": "title",
+    "SUBTITLE": "subtitle",
+}
 
 
 class GoogleSlidesExtractor:
@@ -26,38 +33,21 @@ class GoogleSlidesExtractor:
     def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.json"):
         self.credentials_path = credentials_path
         self.token_path = token_path
+        self.auth = None
         self.creds = None
         self.slides_service = None
         self.drive_service = None
 
     def authenticate(self) -> bool:
-        """Authenticate with Google APIs."""
-        # Check for existing token
-        if os.path.exists(self.token_path):
-            self.creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-
-        # Refresh or get new token
-        if not self.creds or not self.creds.valid:
-            if self.creds and self.creds.expired and self.creds.refresh_token:
-                self.creds.refresh(Request())
-            else:
-                if not os.path.exists(self.credentials_path):
-                    raise FileNotFoundError(
-                        f"Credentials file not found: {self.credentials_path}\n"
-                        "Download from Google Cloud Console → APIs & Services → Credentials"
-                    )
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    self.credentials_path, SCOPES
-                )
-                self.creds = flow.run_local_server(port=0)
-
-            # Save token for next run
-            with open(self.token_path, "w") as token:
-                token.write(self.creds.to_json())
-
-        # Build services
-        self.slides_service = build("slides", "v1", credentials=self.creds)
-        self.drive_service = build("drive", "v3", credentials=self.creds)
+        """Authenticate with Google APIs.
+
+        Credentials and services come from the process-wide cache, so this
+        is cheap after the first call.
+        """
+        self.auth = get_google_auth(self.credentials_path, self.token_path)
+        self.creds = self.auth.credentials()
+        self.slides_service = self.auth.service("slides", "v1")
+        self.drive_service = self.auth.service("drive", "v3")
         return True
 
     def extract_text(self, url: str) -> dict:
@@ -67,7 +57,8 @@ class GoogleSlidesExtractor:
             url: Google Slides URL
 
         Returns:
-            dict with title, slides (list of slide texts), and full_text
+            dict with title, slides (list of slide texts), full_text and its
+            blocks (see DocumentModel), and the size and timing of the fetch
         """
         if not self.slides_service:
             self.authenticate()
@@ -75,32 +66,40 @@ class GoogleSlidesExtractor:
         presentation_id = self._extract_id(url)
 
         try:
-            presentation = self.slides_service.presentations().get(
-                presentationId=presentation_id
-            ).execute()
+            presentation, fetch = execute_measured(
+                self.slides_service.presentations().get(
+                    presentationId=presentation_id, fields=PRESENTATION_FIELDS
+                ),
+                self.auth.http(),
+            )
 
             title = presentation.get("title", "Untitled")
             slides_text = []
+            builder = DocumentBuilder()
 
             for i, slide in enumerate(presentation.get("slides", []), 1):
-                slide_content = self._extract_slide_text(slide)
+                blocks = self._slide_blocks(slide)
                 slides_text.append({
                     "slide_number": i,
                     "slide_id": slide.get("objectId"),
-                    "text": slide_content,
+                    "text": "\n".join(text for _, _, text in blocks),
                 })
-
-            full_text = "\n\n".join([
-                f"--- Slide {s['slide_number']} ---\n{s['text']}"
-                for s in slides_text
-            ])
-
+                # Slides are separated by "--- Slide N ---" markers, which are not blocks
+                if i > 1:
+                    builder.add_layout("\n\n")
+                builder.add_layout(f"--- Slide {i} ---\n")
+                for j, (block_type, block_id, text) in enumerate(blocks):
+                    builder.add(block_type, block_id, text, separator="\n" if j else "", slide=i)
+
+            document = builder.build()
             return {
                 "presentation_id": presentation_id,
                 "title": title,
                 "slides": slides_text,
-                "full_text": full_text,
+                "full_text": document.text,
+                "blocks": document.to_json(),
                 "slide_count": len(slides_text),
+                "fetch": fetch,
             }
 
         except HttpError as e:
@@ -110,6 +109,35 @@ class GoogleSlidesExtractor:
                 raise PermissionError(f"Access denied to presentation: {presentation_id}")
             raise
 
+    def get_revision(self, url: str) -> Optional[dict]:
+        """Get the presentation's current revision from Drive metadata.
+
+        This is much cheaper than fetching the presentation itself, so it is
+        used to skip re-extraction of unchanged files. Native Google files
+        usually have no headRevisionId, in which case modifiedTime (which
+        changes on every content edit) identifies the revision.
+
+        Returns:
+            dict with file_id and revision, or None if Drive metadata is unavailable
+        """
+        if not self.drive_service:
+            self.authenticate()
+
+        file_id = self._extract_id(url)
+
+        try:
+            metadata = self.drive_service.files().get(
+                fileId=file_id,
+                fields="headRevisionId,modifiedTime",
+            ).execute(http=self.auth.http())
+        except HttpError:
+            return None
+
+        revision = metadata.get("headRevisionId") or metadata.get("modifiedTime")
+        if not revision:
+            return None
+        return {"file_id": file_id, "revision": str(revision)}
+
     def add_comment(self, url: str, content: str) -> dict:
         """Add a comment to the presentation via Drive API.
 
@@ -125,7 +153,7 @@ class GoogleSlidesExtractor:
                 fileId=file_id,
                 fields="id,content,createdTime",
                 body={"content": content}
-            ).execute()
+            ).execute(http=self.auth.http())
 
             return {
                 "success": True,
@@ -152,24 +180,39 @@ class GoogleSlidesExtractor:
 
     def _extract_slide_text(self, slide: dict) -> str:
         """Extract all text from a single slide."""
-        texts = []
+        return "\n".join(text for _, _, text in self._slide_blocks(slide))
+
+    def _slide_blocks(self, slide: dict) -> list[tuple[str, str, str]]:
+        """(type, objectId, text) of each page element on a slide that has text."""
+        blocks = []
 
         for element in slide.get("pageElements", []):
-            # Text boxes and shapes
+            element_id = element.get("objectId", "")
+            # Text boxes and shapes; title placeholders are the slide title
             if "shape" in element:
                 shape = element["shape"]
                 if "text" in shape:
-                    texts.append(self._extract_text_content(shape["text"]))
+                    text = self._extract_text_content(shape["text"])
+                    placeholder = shape.get("placeholder", {}).get("type", "")
+                    block_type = _PLACEHOLDER_TYPES.get(placeholder, "text")
+                    if text:
+                        blocks.append((block_type, element_id, text))
 
-            # Tables
+            # Tables, one line per row with cells separated by " | " (as for Docs tables)
             if "table" in element:
                 table = element["table"]
+                rows = []
                 for row in table.get("tableRows", []):
-                    for cell in row.get("tableCells", []):
-                        if "text" in cell:
-                            texts.append(self._extract_text_content(cell["text"]))
-
-        return "\n".join(filter(None, texts))
+                    cells = [
+                        " ".join(self._extract_text_content(cell["text"]).split()) if "text" in cell else ""
+                        for cell in row.get("tableCells", [])
+                    ]
+                    if any(cells):
+                        rows.append(" | ".join(cells))
+                if rows:
+                    blocks.append(("table", element_id, "\n".join(rows)))
+
+        return blocks
 
     def _extract_text_content(self, text_obj: dict) -> str:
         """Extract plain text from a text object."""
@@ -1,101 +1,207 @@
 """Fathom API client for accessing meeting transcripts."""
 
+import asyncio
+import time
+
 import httpx
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from ..config import get_settings
 from ..models import FathomMeeting, FathomTranscript
 
 
 class FathomClient:
-    """Client for Fathom API."""
+    """Client for Fathom API.
+
+    One client holds a keep-alive connection pool and is meant to be shared
+    (the web app creates one at startup); close it with `aclose()` or use it
+    as an async context manager. Requests are spaced out adaptively from the
+    RateLimit-Remaining/RateLimit-Reset response headers, and 429 responses
+    are retried after the advertised delay.
+    """
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Start spacing requests out when this few remain in the rate-limit window
+    LOW_REMAINING = 5
+    MAX_RETRIES = 3
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
         settings = get_settings()
         self.api_key = api_key or settings.fathom_api_key
         self.base_url = settings.fathom_api_base
         self.headers = {"X-Api-Key": self.api_key}
+        self._client = client
+        self._owns_client = client is None
+        # Rate-limit state from the latest response
+        self._remaining: Optional[int] = None
+        self._reset_at = 0.0
+        self._next_slot = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+                timeout=httpx.Timeout(30.0, connect=10.0),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the connection pool (if this client created it)."""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "FathomClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
 
     async def list_meetings(self, limit: int = 10) -> list[FathomMeeting]:
         """List recent meetings."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/meetings",
-                headers=self.headers,
-                params={"limit": limit},
-            )
-            response.raise_for_status()
-            data = response.json()
+        meetings, _ = await self.list_meetings_page(limit=limit)
+        return meetings
+
+    async def list_meetings_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+    ) -> tuple[list[FathomMeeting], Optional[str]]:
+        """Fetch one page of meetings; return them with the cursor of the next page (None on the last)."""
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        if created_after:
+            params["created_after"] = created_after.isoformat()
+        response = await self._get("/meetings", params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        meetings = []
+        for item in data.get("recordings", []):
+            meetings.append(FathomMeeting(
+                id=item["id"],
+                title=item.get("title", "Untitled"),
+                url=item.get("url", ""),
+                created_at=datetime.fromisoformat(item["created_at"].replace("Z", "+00:00")),
+                scheduled_start_time=self._parse_datetime(item.get("scheduled_start_time")),
+                scheduled_end_time=self._parse_datetime(item.get("scheduled_end_time")),
+                calendar_invitees_domains_type=item.get("calendar_invitees_domains_type"),
+            ))
+        return meetings, data.get("next_cursor") or None
+
+    async def iter_meeting_pages(
+        self,
+        created_after: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+    ) -> AsyncIterator[tuple[list[FathomMeeting], Optional[str]]]:
+        """Page through all meetings (optionally from `cursor`).
 
-            meetings = []
-            for item in data.get("recordings", []):
-                meetings.append(FathomMeeting(
-                    id=item["id"],
-                    title=item.get("title", "Untitled"),
-                    url=item.get("url", ""),
-                    created_at=datetime.fromisoformat(item["created_at"].replace("Z", "+00:00")),
-                    scheduled_start_time=self._parse_datetime(item.get("scheduled_start_time")),
-                    scheduled_end_time=self._parse_datetime(item.get("scheduled_end_time")),
-                    calendar_invitees_domains_type=item.get("calendar_invitees_domains_type"),
-                ))
-            return meetings
+        Yields each page with the cursor of the page after it, so callers
+        can checkpoint and resume.
+        """
+        while True:
+            meetings, cursor = await self.list_meetings_page(page_size, cursor, created_after)
+            yield meetings, cursor
+            if cursor is None:
+                return
 
     async def get_transcript(self, recording_id: str) -> FathomTranscript:
-        """Get transcript for a specific recording."""
-        async with httpx.AsyncClient() as client:
-            # Get meeting details
-            meeting_response = await client.get(
-                f"{self.base_url}/recordings/{recording_id}",
-                headers=self.headers,
-            )
-            meeting_response.raise_for_status()
-            meeting_data = meeting_response.json()
+        """Get transcript for a specific recording.
 
-            # Get transcript
-            transcript_response = await client.get(
-                f"{self.base_url}/recordings/{recording_id}/transcript",
-                headers=self.headers,
-            )
-            transcript_response.raise_for_status()
-            transcript_data = transcript_response.json()
+        Meeting details, transcript and summary are fetched concurrently.
+        """
+        meeting_response, transcript_response, summary_response = await asyncio.gather(
+            self._get(f"/recordings/{recording_id}"),
+            self._get(f"/recordings/{recording_id}/transcript"),
+            self._get(f"/recordings/{recording_id}/summary"),
+        )
+        meeting_response.raise_for_status()
+        meeting_data = meeting_response.json()
+        transcript_response.raise_for_status()
+        transcript_data = transcript_response.json()
+        summary_data = summary_response.json() if summary_response.status_code == 200 else {}
 
-            # Get summary
-            summary_response = await client.get(
-                f"{self.base_url}/recordings/{recording_id}/summary",
-                headers=self.headers,
-            )
-            summary_data = summary_response.json() if summary_response.status_code == 200 else {}
-
-            return FathomTranscript(
-                recording_id=recording_id,
-                title=meeting_data.get("title", "Untitled"),
-                url=meeting_data.get("url", ""),
-                share_url=meeting_data.get("share_url"),
-                created_at=datetime.fromisoformat(meeting_data["created_at"].replace("Z", "+00:00")),
-                transcript=transcript_data.get("transcript", []),
-                summary=summary_data.get("default_summary", {}).get("markdown_formatted"),
-                action_items=summary_data.get("action_items", []),
-            )
+        return FathomTranscript(
+            recording_id=recording_id,
+            title=meeting_data.get("title", "Untitled"),
+            url=meeting_data.get("url", ""),
+            share_url=meeting_data.get("share_url"),
+            created_at=datetime.fromisoformat(meeting_data["created_at"].replace("Z", "+00:00")),
+            transcript=transcript_data.get("transcript", []),
+            summary=summary_data.get("default_summary", {}).get("markdown_formatted"),
+            action_items=summary_data.get("action_items", []),
+        )
 
     async def test_connection(self) -> dict:
         """Test API connection and return account info."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/meetings",
-                headers=self.headers,
-                params={"limit": 1},
-            )
-            if response.status_code == 401:
-                return {"success": False, "error": "Invalid API key"}
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    "success": True,
-                    "meetings_available": len(data.get("recordings", [])) > 0,
-                    "rate_limit_remaining": response.headers.get("RateLimit-Remaining"),
-                }
-            return {"success": False, "error": f"HTTP {response.status_code}"}
+        response = await self._get("/meetings", params={"limit": 1})
+        if response.status_code == 401:
+            return {"success": False, "error": "Invalid API key"}
+        if response.status_code == 200:
+            data = response.json()
+            return {
+                "success": True,
+                "meetings_available": len(data.get("recordings", [])) > 0,
+                "rate_limit_remaining": response.headers.get("RateLimit-Remaining"),
+            }
+        return {"success": False, "error": f"HTTP {response.status_code}"}
+
+    async def _get(self, path: str, params: Optional[dict] = None) -> httpx.Response:
+        """GET an API path, throttled by the rate limit and retried on 429."""
+        for attempt in range(self.MAX_RETRIES + 1):
+            await self._throttle()
+            response = await self.client.get(f"{self.base_url}{path}", headers=self.headers, params=params)
+            self._update_rate_limit(response)
+            if response.status_code != 429 or attempt == self.MAX_RETRIES:
+                return response
+            await asyncio.sleep(self._retry_delay(response, attempt))
+        return response
+
+    async def _throttle(self) -> None:
+        """Wait for this request's slot when the rate-limit window is nearly used up.
+
+        With plenty of requests left nothing waits; below LOW_REMAINING the
+        remaining requests are spread evenly over the rest of the window,
+        and with none left requests wait for the window to reset.
+        """
+        now = time.monotonic()
+        window = self._reset_at - now
+        if self._remaining is None or window <= 0 or self._remaining > self.LOW_REMAINING:
+            return
+        if self._remaining <= 0:
+            slot = max(self._reset_at, self._next_slot)
+        else:
+            slot = max(now, self._next_slot)
+            self._remaining -= 1
+        self._next_slot = slot + max(self._reset_at - slot, 0.0) / (self._remaining + 1)
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _update_rate_limit(self, response: httpx.Response) -> None:
+        """Record the rate-limit headers of a response."""
+        remaining = response.headers.get("RateLimit-Remaining")
+        reset = response.headers.get("RateLimit-Reset")
+        try:
+            if remaining is not None:
+                self._remaining = int(remaining)
+            if reset is not None:
+                self._reset_at = time.monotonic() + float(reset)
+        except ValueError:
+            pass
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a 429 response."""
+        for header in ("Retry-After", "RateLimit-Reset"):
+            try:
+                return max(float(response.headers[header]), 0.0)
+            except (KeyError, ValueError):
+                continue
+        return float(2 ** attempt)
 
     def _parse_datetime(self, value: Optional[str]) -> Optional[datetime]:
         """Parse ISO datetime string."""
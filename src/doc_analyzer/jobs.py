@@ -0,0 +1,353 @@
+"""Durable background jobs backed by SQLite.
+
+Analyses are enqueued as jobs and run by a pool of async workers instead of
+inside the HTTP request. Jobs survive restarts: a job left "running" by a
+process that died is picked up again once its lease expires. A worker renews
+the lease while its handler runs, so long jobs are not run twice, and only
+the worker holding the lease can record the job's outcome. Failed jobs
+are retried with exponential backoff up to their attempt limit, and higher
+priority jobs are claimed first.
+
+Workers run in the web process (JOB_WORKERS) and/or in a separate
+`doc-analyzer worker` process sharing the same database file.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# Runs a job's payload and returns its JSON-serializable result
+JobHandler = Callable[[dict], Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    """A queued, running or finished background job."""
+    id: str
+    kind: str
+    payload: dict
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    result: Any = None
+    error: Optional[str] = None
+    dedupe_key: Optional[str] = None
+    locked_by: Optional[str] = None  # Worker holding the lease while running
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    duplicate: bool = False  # enqueue() returned an existing job with the same dedupe_key
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class JobStore:
+    """SQLite job table shared by the web process and workers."""
+
+    def __init__(self, path: str, lease_seconds: float = 900.0, retry_backoff_seconds: float = 30.0):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    dedupe_key TEXT UNIQUE,
+                    run_after REAL NOT NULL,
+                    locked_by TEXT,
+                    locked_until REAL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority DESC, created_at)"
+            )
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        priority: int = 0,
+        max_attempts: int = 3,
+        dedupe_key: Optional[str] = None,
+    ) -> Job:
+        """Add a job, or return the existing job with the same dedupe_key.
+
+        A returned existing job has `duplicate` set.
+        """
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, payload, status, priority, max_attempts, dedupe_key, "
+                "run_after, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (dedupe_key) DO NOTHING",
+                (job_id, kind, json.dumps(payload), QUEUED, priority, max_attempts, dedupe_key, now, now, now),
+            )
+            if dedupe_key is not None:
+                row = conn.execute("SELECT * FROM jobs WHERE dedupe_key = ?", (dedupe_key,)).fetchone()
+            else:
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        job = self._job(row)
+        job.duplicate = job.id != job_id
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job by id, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """Atomically take the highest priority ready job, or return None.
+
+        Running jobs whose lease expired (their worker died) are claimable
+        again.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = COALESCE(error, 'Worker stopped while running the job'), "
+                "locked_by = NULL, locked_until = NULL, updated_at = ? "
+                "WHERE status = ? AND locked_until < ? AND attempts >= max_attempts",
+                (FAILED, now, RUNNING, now),
+            )
+            row = conn.execute(
+                """UPDATE jobs
+                SET status = ?, attempts = attempts + 1, locked_by = ?, locked_until = ?, updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs
+                    WHERE (status = ? AND run_after <= ?) OR (status = ? AND locked_until < ?)
+                    ORDER BY priority DESC, created_at
+                    LIMIT 1
+                )
+                RETURNING *""",
+                (RUNNING, worker_id, now + self.lease_seconds, now, QUEUED, now, RUNNING, now),
+            ).fetchone()
+        return self._job(row) if row else None
+
+    def renew(self, job: Job) -> bool:
+        """Extend the lease of a running job; False if its worker no longer holds it."""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET locked_until = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND locked_by = ?",
+                (now + self.lease_seconds, now, job.id, RUNNING, job.locked_by),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job: Job, result: Any) -> bool:
+        """Mark a job as succeeded with its result.
+
+        Returns False (and records nothing) if the job's lease expired and
+        another worker has claimed it since.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, locked_by = NULL, "
+                "locked_until = NULL, updated_at = ? WHERE id = ? AND status = ? AND locked_by = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), job.id, RUNNING, job.locked_by),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Record a failed attempt; retry with backoff until attempts run out.
+
+        Returns False (and records nothing) if the job's lease expired and
+        another worker has claimed it since.
+        """
+        now = time.time()
+        if job.attempts < job.max_attempts:
+            status = QUEUED
+            run_after = now + self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+        else:
+            status, run_after = FAILED, now
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_after = ?, locked_by = NULL, "
+                "locked_until = NULL, updated_at = ? WHERE id = ? AND status = ? AND locked_by = ?",
+                (status, error, run_after, now, job.id, RUNNING, job.locked_by),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def _job(self, row: sqlite3.Row) -> Job:
+        return Job(
+            id=row["id"],
+            kind=row["kind"],
+            payload=json.loads(row["payload"]),
+            status=row["status"],
+            priority=row["priority"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            result=json.loads(row["result"]) if row["result"] is not None else None,
+            error=row["error"],
+            dedupe_key=row["dedupe_key"],
+            locked_by=row["locked_by"],
+            created_at=row["created_at"],
+            updated_at=row["updated_at"],
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation; this keeps the store thread-safe."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+
+class WorkerPool:
+    """Async workers that claim jobs from a JobStore and run their handlers."""
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_interval: float = 1.0,
+    ):
+        self.store = store
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._work(f"{prefix}:{n}")) for n in range(self.concurrency)
+        ]
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was enqueued."""
+        self._wakeup.set()
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running are retried after their lease."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_forever(self) -> None:
+        """Run the workers until cancelled (used by `doc-analyzer worker`)."""
+        self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    async def _work(self, worker_id: str) -> None:
+        # Only cancellation stops a worker; anything else (a locked or
+        # unreachable database, a failing store call) is logged and retried
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim, worker_id)
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._run(job)
+            except Exception:
+                logger.exception(f"Worker {worker_id} failed; retrying")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _run(self, job: Job) -> None:
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await self._record(job, self.store.fail, job, f"Unknown job kind: {job.kind}")
+            return
+        logger.info(f"Running job {job.id} ({job.kind}, attempt {job.attempts}/{job.max_attempts})")
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            result = await handler(job.payload)
+        except Exception as exc:
+            logger.exception(f"Job {job.id} failed")
+            outcome = (self.store.fail, job, str(exc) or type(exc).__name__)
+        else:
+            outcome = (self.store.complete, job, result)
+        finally:
+            heartbeat.cancel()
+        await self._record(job, *outcome)
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Renew the job's lease every third of the lease time while it runs."""
+        while True:
+            await asyncio.sleep(self.store.lease_seconds / 3)
+            if not await asyncio.to_thread(self.store.renew, job):
+                logger.warning(f"Job {job.id} lost its lease to another worker")
+                return
+
+    async def _record(self, job: Job, method, *args) -> None:
+        """Store a job's outcome, reporting it when the lease was lost meanwhile."""
+        if not await asyncio.to_thread(method, *args):
+            logger.warning(
+                f"Job {job.id} outcome discarded: {job.locked_by} no longer holds its lease"
+            )
+
+
+def get_job_store() -> JobStore:
+    """Create the job store configured in settings."""
+    settings = get_settings()
+    return JobStore(
+        path=settings.job_store_path,
+        lease_seconds=settings.job_lease_seconds,
+        retry_backoff_seconds=settings.job_retry_backoff_seconds,
+    )
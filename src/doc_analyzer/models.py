@@ -46,6 +46,7 @@ class Issue(BaseModel):
     location: Optional[str] = None  # Line number, slide number, timestamp
     context: Optional[str] = None   # Surrounding text
     suggestion: Optional[str] = None  # Recommended fix
+    block_id: Optional[str] = None  # Docs paragraph / Slides element ID (rule issues)
     affects_score: bool = True
 
 
@@ -54,6 +55,8 @@ class ScoreBreakdown(BaseModel):
     spelling_grammar: int = Field(ge=0, le=100, default=100)
     required_content: int = Field(ge=0, le=100, default=100)
     math_accuracy: int = Field(ge=0, le=100, default=100)
+    # Categories scored from an incomplete LLM analysis (a stage or some of its chunks failed)
+    incomplete: list[str] = Field(default_factory=list)
 
     @property
     def overall(self) -> int:
@@ -109,6 +112,25 @@ class AnalysisResult(BaseModel):
     # Raw content (for debugging)
     text_length: int = 0
 
+    # LLM stages served from the response cache (e.g. "spelling_grammar")
+    cache_hits: list[str] = Field(default_factory=list)
+
+    # Incremental mode: {"total": units in the document, "reanalyzed": units sent to the LLM}
+    units: Optional[dict[str, int]] = None
+
+    # LLM cost of this analysis: {"calls", "input_tokens", "output_tokens", "cache_read_tokens",
+    # "cache_write_tokens"} (cache_* are the parts of input_tokens read from / written to the
+    # provider's prompt cache), and wall time of the LLM stages
+    token_usage: dict[str, int] = Field(default_factory=dict)
+    llm_seconds: Optional[float] = None
+
+    # Google API read of the document: {"payload_bytes", "fetch_seconds", "parse_seconds"};
+    # empty when the extraction was reused from the revision cache
+    fetch: dict[str, float] = Field(default_factory=dict)
+
+    # LLM stages that failed outright or for some chunks, e.g. {"content": "2 of 5 chunks failed: ..."}
+    errors: dict[str, str] = Field(default_factory=dict)
+
     @property
     def issues_by_severity(self) -> dict[str, list[Issue]]:
         """Group issues by severity."""
@@ -1 +1,6 @@
 """Rulesets for document analysis."""
+
+from .loader import Ruleset, RulesetLoader, get_ruleset_loader
+from .sections import SectionMatcher, SectionReport
+
+__all__ = ["Ruleset", "RulesetLoader", "SectionMatcher", "SectionReport", "get_ruleset_loader"]
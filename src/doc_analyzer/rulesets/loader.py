@@ -0,0 +1,212 @@
+"""Loading and compiling the JSON rulesets.
+
+Each `<name>.json` in this directory may name a parent in `extends`; the
+chain is resolved once and merged (objects merge key by key, everything
+else is replaced by the child), then compiled into a frozen `Ruleset` with
+its regexes, section matcher (see sections.py) and check sets built up
+front. Compiled rulesets are cached and rebuilt only when the modification
+time of one of the files in their chain changes, so looking one up per
+request costs a couple of stat() calls, never JSON parsing or regex
+compilation.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from ..models import DocumentType
+from .sections import SectionMatcher
+
+logger = logging.getLogger(__name__)
+
+RULESETS_DIR = Path(__file__).parent
+DEFAULT_RULESET = "default"
+
+# Objects of word lists that are not keyword groups to match in text
+_NOT_KEYWORD_GROUPS = ("dictionary", "section_synonyms")
+
+
+def _keyword_pattern(words) -> re.Pattern:
+    """Case-insensitive whole-word match for any of `words`."""
+    alternatives = sorted((re.escape(w).replace(r"\ ", r"\s+") for w in words), key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True, eq=False)
+class Ruleset:
+    """A resolved, compiled ruleset. Immutable, so it is shared by all requests."""
+    name: str
+    description: str
+    version: str
+    chain: tuple[str, ...]                   # Ancestors first, ending with this ruleset
+    fingerprint: str                          # Hash of the resolved configuration
+    enabled_checks: frozenset[str]
+    disabled_checks: frozenset[str]
+    disabled_rules: frozenset[str]            # RuleChecker rule IDs turned off by the ruleset
+    allowed_terms: frozenset[str]             # Lowercased dictionary terms, never spelling errors
+    required_sections: tuple[str, ...]
+    required_keywords: tuple[str, ...]
+    section_matcher: SectionMatcher
+    keyword_patterns: Mapping[str, re.Pattern]                    # required keyword -> pattern
+    keyword_groups: Mapping[str, Mapping[str, re.Pattern]]        # e.g. concern_signals -> {budget: pattern}
+    scoring: Mapping[str, Any]
+    config: Mapping[str, Any]                 # The full resolved configuration (read-only)
+
+    def check_enabled(self, check: str) -> bool:
+        """Whether a check is on; checks the ruleset does not mention are on."""
+        return check not in self.disabled_checks
+
+    def is_allowed_term(self, text: str) -> bool:
+        """Whether `text` is in the ruleset dictionary (case-insensitive)."""
+        return text.strip().lower() in self.allowed_terms
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of parsed JSON (dicts become mappings, lists tuples)."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _merge(base: dict, override: dict) -> dict:
+    """Merge a child ruleset over its parent."""
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def compile_ruleset(name: str, chain: list[str], configs: list[dict]) -> Ruleset:
+    """Merge a ruleset's chain of configurations (ancestors first) and compile it."""
+    resolved: dict = {}
+    for config in configs:
+        resolved = _merge(resolved, {k: v for k, v in config.items() if k not in ("name", "extends")})
+    resolved["name"] = name
+
+    checks = resolved.get("checks", {})
+    required_keywords = tuple(resolved.get("required_keywords", []))
+    keyword_groups = {
+        key: MappingProxyType({group: _keyword_pattern(words) for group, words in value.items() if words})
+        for key, value in resolved.items()
+        if key not in _NOT_KEYWORD_GROUPS
+        and isinstance(value, dict) and value and all(isinstance(v, list) for v in value.values())
+        and all(isinstance(w, str) for v in value.values() for w in v)
+    }
+
+    return Ruleset(
+        name=name,
+        description=resolved.get("description", ""),
+        version=str(resolved.get("version", "")),
+        chain=tuple(chain),
+        fingerprint=hashlib.sha256(json.dumps(resolved, sort_keys=True).encode()).hexdigest()[:16],
+        enabled_checks=frozenset(check for check, on in checks.items() if on),
+        disabled_checks=frozenset(check for check, on in checks.items() if not on),
+        disabled_rules=frozenset(resolved.get("disabled_rules", [])),
+        allowed_terms=frozenset(t.lower() for t in resolved.get("dictionary", {}).get("allowed_terms", [])),
+        required_sections=tuple(resolved.get("required_sections", [])),
+        required_keywords=required_keywords,
+        section_matcher=SectionMatcher.compile(
+            resolved.get("required_sections", []), resolved.get("section_synonyms", {})
+        ),
+        keyword_patterns=MappingProxyType({kw: _keyword_pattern([kw]) for kw in required_keywords}),
+        keyword_groups=MappingProxyType(keyword_groups),
+        scoring=_freeze(resolved.get("scoring", {})),
+        config=_freeze(resolved),
+    )
+
+
+class RulesetLoader:
+    """Loads rulesets from a directory and caches them compiled.
+
+    Thread-safe. A file that fails to parse after an edit is logged and the
+    last good version of the ruleset keeps being served.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self.directory = Path(directory or RULESETS_DIR)
+        self._lock = threading.Lock()
+        # name -> (mtime_ns, parsed JSON)
+        self._files: dict[str, tuple[int, dict]] = {}
+        # name -> (mtime_ns of each file in the chain, compiled ruleset)
+        self._compiled: dict[str, tuple[tuple[int, ...], Ruleset]] = {}
+
+    def names(self) -> list[str]:
+        """Names of the rulesets in the directory."""
+        return sorted(path.stem for path in self.directory.glob("*.json"))
+
+    def load_all(self) -> dict[str, Ruleset]:
+        """Compile every ruleset (done at startup so errors surface early)."""
+        return {name: self.get(name) for name in self.names()}
+
+    def get(self, name: str) -> Ruleset:
+        """Return the compiled ruleset, recompiling it only if a file in its chain changed."""
+        with self._lock:
+            cached = self._compiled.get(name)
+            try:
+                chain = self._chain(name)
+            except ValueError:
+                if cached is None:
+                    raise
+                logger.warning(f"Ruleset {name!r} failed to reload; keeping the previous version", exc_info=True)
+                return cached[1]
+            stamp = tuple(self._files[n][0] for n in chain)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            ruleset = compile_ruleset(name, chain, [self._files[n][1] for n in chain])
+            self._compiled[name] = (stamp, ruleset)
+            return ruleset
+
+    def for_type(self, doc_type: DocumentType) -> Ruleset:
+        """The ruleset for a document type (the default ruleset if it has none)."""
+        name = doc_type.value
+        if not (self.directory / f"{name}.json").exists():
+            name = DEFAULT_RULESET
+        return self.get(name)
+
+    def _chain(self, name: str) -> list[str]:
+        """The ruleset and its ancestors, ancestors first."""
+        chain = []
+        current: Optional[str] = name
+        while current is not None:
+            if current in chain:
+                raise ValueError(f"Ruleset 'extends' cycle: {' -> '.join(chain + [current])}")
+            chain.append(current)
+            current = self._read(current).get("extends")
+        return list(reversed(chain))
+
+    def _read(self, name: str) -> dict:
+        """Parsed JSON of a ruleset file, re-read only when its mtime changes."""
+        path = self.directory / f"{name}.json"
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            raise ValueError(f"Unknown ruleset: {name}") from None
+        cached = self._files.get(name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path) as f:
+                config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid ruleset {path}: {e}") from e
+        self._files[name] = (mtime, config)
+        return config
+
+
+@lru_cache
+def get_ruleset_loader() -> RulesetLoader:
+    """Get the process-wide loader for the bundled rulesets."""
+    return RulesetLoader()
@@ -0,0 +1,142 @@
+"""Deterministic matching of a document's headings against required sections.
+
+Headings (Google Docs HEADING_* paragraphs, slide titles) are normalized
+and compared with each required section's name and synonyms. A section is
+found only when a whole heading is its name or a synonym (a close fuzzy
+match absorbs typos), and each heading is found for at most one section,
+the one it matches best. A section with no such heading is missing, unless
+there is weaker evidence for it (a heading that only contains its name, a
+near-miss, or a line of body text that starts with it); those are left
+undecided for the LLM to judge.
+"""
+
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from types import MappingProxyType
+from typing import ClassVar, Mapping, Optional
+
+# Leading numbering ("2.", "3.1", "IV") is dropped before comparing
+_ROMAN = re.compile(r"^[ivxl]+$")
+
+
+def normalize(text: str) -> tuple[str, ...]:
+    """Lowercase words of a heading or section name, without numbering or punctuation."""
+    text = text.lower().replace("&", " and ").replace("'", "").replace("’", "")
+    words = re.findall(r"[a-z0-9]+", text)
+    while len(words) > 1 and (words[0].isdigit() or _ROMAN.match(words[0])):
+        words.pop(0)
+    return tuple(words)
+
+
+def similarity(name: tuple[str, ...], heading: tuple[str, ...]) -> float:
+    """How well `name` matches the whole of `heading` (1.0 when they are equal).
+
+    Otherwise the fuzzy ratio of the two, so "Timline" still matches "timeline"
+    but "Scope of Budget Cuts" matches neither "scope" nor "budget".
+    """
+    if not name or not heading:
+        return 0.0
+    if name == heading:
+        return 1.0
+    return SequenceMatcher(None, " ".join(name), " ".join(heading)).ratio()
+
+
+def partial_similarity(name: tuple[str, ...], heading: tuple[str, ...]) -> float:
+    """How well `name` matches part of `heading` (1.0 when it appears in it as whole words).
+
+    Otherwise the best fuzzy ratio of `name` against each run of as many
+    words in the heading, so "Projected Timline" partly matches "timeline".
+    """
+    if not name or not heading:
+        return 0.0
+    size = len(name)
+    windows = [heading[i:i + size] for i in range(max(len(heading) - size, 0) + 1)]
+    if name in windows:
+        return 1.0
+    target = " ".join(name)
+    return max(SequenceMatcher(None, target, " ".join(window)).ratio() for window in windows)
+
+
+@dataclass
+class SectionReport:
+    """Required sections of one document, as decided by the section matcher."""
+    found: dict[str, str] = field(default_factory=dict)    # section -> heading that matched it
+    missing: list[str] = field(default_factory=list)        # no heading or text evidence
+    undecided: list[str] = field(default_factory=list)      # weak evidence, left to the LLM
+
+
+@dataclass(frozen=True, eq=False)
+class SectionMatcher:
+    """Finds a ruleset's required sections among a document's headings."""
+    names: Mapping[str, tuple[tuple[str, ...], ...]]    # section -> normalized name and synonyms
+    patterns: Mapping[str, re.Pattern]                   # section -> name or synonym starting a line
+
+    FOUND: ClassVar[float] = 0.85         # Whole-heading similarity at which a heading is the section
+    NEAR_MISS: ClassVar[float] = 0.7      # Partial similarity at which the section is left undecided
+
+    @classmethod
+    def compile(cls, sections, synonyms: Optional[Mapping] = None) -> "SectionMatcher":
+        names = {}
+        patterns = {}
+        for section in sections:
+            variants = [section, *((synonyms or {}).get(section, ()))]
+            names[section] = tuple(dict.fromkeys(n for n in map(normalize, variants) if n))
+            bodies = []
+            for variant in variants:
+                words = [re.escape(w) for w in re.split(r"\s+", variant.strip()) if w]
+                bodies.append(r"\s+".join(w if w not in ("and", r"\&") else r"(?:and|&)" for w in words))
+            patterns[section] = re.compile(
+                r"^[ \t#*\-\d.)]*(?:" + "|".join(bodies) + r")\b", re.IGNORECASE | re.MULTILINE
+            )
+        return cls(MappingProxyType(names), MappingProxyType(patterns))
+
+    @property
+    def sections(self) -> list[str]:
+        """The required sections, in ruleset order."""
+        return list(self.names)
+
+    def match(self, headings: list[str], text: str = "") -> SectionReport:
+        """Decide which required sections `headings` cover.
+
+        Whole-heading matches are assigned best first, so a heading counts
+        for one section at most. `text` is the document body, used only as
+        weaker evidence for sections that no heading matches.
+        """
+        normalized = [normalize(heading) for heading in headings]
+        candidates = []
+        for order, (section, names) in enumerate(self.names.items()):
+            for i, words in enumerate(normalized):
+                score = max((similarity(name, words) for name in names), default=0.0)
+                if score >= self.FOUND:
+                    candidates.append((-score, order, i, section))
+        report = SectionReport()
+        used = set()
+        for _, _, i, section in sorted(candidates):
+            if section not in report.found and i not in used:
+                report.found[section] = headings[i]
+                used.add(i)
+
+        for section, names in self.names.items():
+            if section in report.found:
+                continue
+            near = max(
+                (partial_similarity(name, words) for name in names for words in normalized), default=0.0
+            )
+            if near >= self.NEAR_MISS or self.patterns[section].search(text):
+                report.undecided.append(section)
+            else:
+                report.missing.append(section)
+        # Keep found sections in ruleset order
+        report.found = {section: report.found[section] for section in self.names if section in report.found}
+        return report
+
+    def resolve(self, name: str) -> Optional[str]:
+        """The required section a free-form section name (e.g. from the LLM) refers to."""
+        words = normalize(name)
+        best, best_section = 0.0, None
+        for section, names in self.names.items():
+            score = max((max(partial_similarity(n, words), partial_similarity(words, n)) for n in names), default=0.0)
+            if score > best:
+                best, best_section = score, section
+        return best_section if best >= self.FOUND else None